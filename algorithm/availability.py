@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import heapq
+from functools import reduce
+from operator import or_
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import Day, Duty, DutySchedule
+
+
+class DoctorAvailabilityTracker:
+    # Doctors are represented by bits of integer masks, indexed by their position on the doctors list.
+    # Duties have to be assigned and unassigned through the tracker, so that the occupancy stays in sync.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        duty_schedule: DutySchedule,
+        day_numbers: Iterable[int] | None = None,
+        maximum_duties: dict[Doctor, int] | None = None,
+    ) -> None:
+        self.doctors = doctors
+        self.duty_schedule = duty_schedule
+
+        # Only the given days are to be set, other days count as set whether they are filled or not.
+        # Doctors may be limited to fewer duties than they accept, so that the rest is left for other days.
+        self.day_numbers = None if day_numbers is None else frozenset(day_numbers)
+        maximum_duties = maximum_duties or {}
+        self._maximum_duties = [
+            maximum_duties.get(doctor, doctor.preferences.maximum_accepted_duties) for doctor in doctors
+        ]
+
+        self._indices = {doctor: index for index, doctor in enumerate(doctors)}
+        self._accepting_masks = self._get_accepting_masks()
+
+        # Includes empty days before and after the month, so that adjacent days can always be looked up.
+        self._occupancy_masks = dict.fromkeys(range(len(duty_schedule) + 2), 0)
+        self._duties_count = [0] * len(doctors)
+        self._unavailable_mask = 0
+
+        for duty in duty_schedule.cells():
+            if duty.is_set:
+                self._add_duty(duty.day.number, duty.doctor)
+
+        # Not filled days by the average number of available doctors per free position, built on first use.
+        # Entries are pushed again when availability of the day changes, outdated ones are skipped by version.
+        self._days_heap: list[tuple[float, int, int]] | None = None
+        self._days_versions = [0] * (len(duty_schedule) + 1)
+
+    def __getitem__(self, day_number: int) -> DoctorAvailabilityTrackerRow:
+        return DoctorAvailabilityTrackerRow(self, self.duty_schedule[day_number].day)
+
+    def __iter__(self) -> Iterator[DoctorAvailabilityTrackerRow]:
+        return (self[day_number] for day_number in range(1, len(self.duty_schedule) + 1))
+
+    def assign(self, duty: Duty, doctor: Doctor) -> None:
+        unavailable_mask = self._unavailable_mask
+
+        duty.update(doctor)
+        self._add_duty(duty.day.number, doctor)
+
+        self._update_days_heap(duty.day.number, unavailable_mask)
+
+    def unassign(self, duty: Duty) -> None:
+        unavailable_mask = self._unavailable_mask
+
+        self._remove_duty(duty.day.number, duty.doctor)
+        duty.update(None)
+
+        self._update_days_heap(duty.day.number, unavailable_mask)
+
+    def get_day_with_least_available_doctors_per_free_position(self) -> Day | None:
+        # Ties are resolved in favour of the earliest day.
+        if self._days_heap is None:
+            self._build_days_heap()
+
+        while self._days_heap:
+            _, day_number, version = self._days_heap[0]
+            if version == self._days_versions[day_number]:
+                return self.duty_schedule[day_number].day
+
+            heapq.heappop(self._days_heap)
+
+        return None
+
+    def get_available_mask(self, day_number: int, position: int) -> int:
+        duty = self.duty_schedule[day_number, position]
+        if duty.is_set:
+            return self.get_mask([duty.doctor])
+
+        unavailable_mask = (
+            self._occupancy_masks[day_number - 1]
+            | self._occupancy_masks[day_number]
+            | self._occupancy_masks[day_number + 1]
+            | self._unavailable_mask
+        )
+        return self._accepting_masks[day_number][position] & ~unavailable_mask
+
+    def get_accepting_mask(self, day_number: int, position: int) -> int:
+        # Doctors who accept the duty, whatever other duties are set
+        return self._accepting_masks[day_number][position]
+
+    def get_occupancy_mask(self, day_number: int) -> int:
+        # Doctors on duty on the day, on any position
+        return self._occupancy_masks[day_number]
+
+    def get_duties_count(self, doctor: Doctor) -> int:
+        return self._duties_count[self._indices[doctor]]
+
+    def get_hardness(self) -> float:
+        # From 0, when there are plenty of doctors for each free position, to 1, when days have no more available
+        # doctors than free positions. Requested and other duties set already count in, as they leave doctors
+        # unavailable on the days around them. Doctors accepting barely more duties than there are left to fill
+        # make the month hard too, but if they accept fewer, it can't be filled at all, however long it's searched.
+        days_tightness = []
+        free_positions_count = 0
+        for row in self:
+            if row.is_set:
+                continue
+
+            free_positions = self.duty_schedule[row.day.number].free_positions()
+            available_doctors_count = row.mask_for_positions(*free_positions).bit_count()
+            days_tightness.append(
+                min(1, len(free_positions) / available_doctors_count) if available_doctors_count else 1
+            )
+            free_positions_count += len(free_positions)
+
+        if not days_tightness:
+            return 0
+
+        hardness = sum(days_tightness) / len(days_tightness)
+        remaining_duties_count = sum(
+            max(0, maximum_duties - duties_count)
+            for maximum_duties, duties_count in zip(self._maximum_duties, self._duties_count, strict=True)
+        )
+        if remaining_duties_count >= free_positions_count:
+            hardness = max(hardness, (free_positions_count / remaining_duties_count) ** 4)
+
+        return hardness
+
+    def get_mask(self, doctors: Iterable[Doctor]) -> int:
+        return reduce(or_, (1 << self._indices[doctor] for doctor in doctors), 0)
+
+    def get_doctors(self, mask: int) -> list[Doctor]:
+        doctors = []
+        while mask:
+            lowest_bit = mask & -mask
+            doctors.append(self.doctors[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+
+        return doctors
+
+    def _add_duty(self, day_number: int, doctor: Doctor) -> None:
+        index = self._indices[doctor]
+        self._occupancy_masks[day_number] |= 1 << index
+
+        self._duties_count[index] += 1
+        if self._duties_count[index] >= self._maximum_duties[index]:
+            self._unavailable_mask |= 1 << index
+
+    def _remove_duty(self, day_number: int, doctor: Doctor) -> None:
+        index = self._indices[doctor]
+        self._occupancy_masks[day_number] &= ~(1 << index)
+
+        self._duties_count[index] -= 1
+        if self._duties_count[index] < self._maximum_duties[index]:
+            self._unavailable_mask &= ~(1 << index)
+
+    def _build_days_heap(self) -> None:
+        self._days_heap = []
+        for day_number in range(1, len(self.duty_schedule) + 1):
+            self._push_day(day_number)
+
+    def _update_days_heap(self, day_number: int, previous_unavailable_mask: int) -> None:
+        if self._days_heap is None:
+            return
+
+        # A doctor reaching or leaving their maximum number of duties changes availability on all days,
+        # otherwise only the day and the days next to it change.
+        if self._unavailable_mask != previous_unavailable_mask:
+            day_numbers = range(1, len(self.duty_schedule) + 1)
+        else:
+            day_numbers = range(max(1, day_number - 1), min(day_number + 1, len(self.duty_schedule)) + 1)
+
+        for other_day_number in day_numbers:
+            self._push_day(other_day_number)
+
+        # Outdated entries are dropped once they outnumber the days.
+        if len(self._days_heap) > 4 * len(self.duty_schedule):
+            self._build_days_heap()
+
+    def _push_day(self, day_number: int) -> None:
+        self._days_versions[day_number] += 1
+        if not self[day_number].is_set:
+            average = self[day_number].average_doctors_per_free_position
+            heapq.heappush(self._days_heap, (average, day_number, self._days_versions[day_number]))
+
+    def _get_accepting_masks(self) -> dict[int, dict[int, int]]:
+        result = {}
+
+        for duty_row in self.duty_schedule:
+            day = duty_row.day
+            doctors = [doctor for doctor in self.doctors if doctor.can_accept_duty_on_day(day)]
+            result[day.number] = {
+                position: self.get_mask(
+                    doctor for doctor in doctors if position in doctor.preferences.preferred_positions
+                )
+                for position in range(1, self.duty_schedule.positions + 1)
+            }
+
+        return result
+
+
+class DoctorAvailabilityTrackerRow:
+    def __init__(self, tracker: DoctorAvailabilityTracker, day: Day) -> None:
+        self.tracker = tracker
+        self.day = day
+
+        self.positions = range(1, tracker.duty_schedule.positions + 1)
+
+    def mask_for_positions(self, *positions: int) -> int:
+        return reduce(or_, (self.tracker.get_available_mask(self.day.number, position) for position in positions), 0)
+
+    def mask_for_all_positions(self) -> int:
+        return self.mask_for_positions(*self.positions)
+
+    def doctors_for_position(self, position: int) -> list[Doctor]:
+        return self.tracker.get_doctors(self.tracker.get_available_mask(self.day.number, position))
+
+    def doctors_for_positions(self, *positions: int) -> set[Doctor]:
+        return set(self.tracker.get_doctors(self.mask_for_positions(*positions)))
+
+    def doctors_for_all_positions(self) -> set[Doctor]:
+        return self.doctors_for_positions(*self.positions)
+
+    @property
+    def is_set(self) -> bool:
+        if self.tracker.day_numbers is not None and self.day.number not in self.tracker.day_numbers:
+            return True
+
+        return self.tracker.duty_schedule[self.day.number].is_filled
+
+    @property
+    def average_doctors_per_free_position(self) -> float:
+        doctors_counts = [
+            self.tracker.get_available_mask(self.day.number, position).bit_count()
+            for position in self.tracker.duty_schedule[self.day.number].free_positions()
+        ]
+        return sum(doctors_counts) / len(doctors_counts) if doctors_counts else 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__} ({self.day}): {[self.doctors_for_position(p) for p in self.positions]}'
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import heapq
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from algorithm.duty_setter import Algorithm, Node
+from algorithm.enums import StopReason
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import DutySchedule
+
+
+class BeamSearch(Algorithm):
+    # Expands the schedule day by day, keeping only a fixed number of the best partial schedules on each level.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        width: int = 10,
+        depth: int = 2,
+        time_limit_ms: int | None = None,
+    ) -> None:
+        super().__init__(doctors, schedule, depth, time_limit_ms=time_limit_ms)
+        self.width = width
+
+    def set_duties(self) -> None:
+        self._start_clock()
+        beam = [Node.get_empty()]
+
+        while True:
+            if not beam:
+                self.stop_reason = StopReason.EXHAUSTED
+                break
+
+            for node in beam:
+                if self._is_best_node(node):
+                    self.best_node = node
+
+            # All nodes in the beam have the same number of days set.
+            if self._are_all_duties_set(beam[0]):
+                self.stop_reason = StopReason.COMPLETED
+                break
+
+            if self._is_deadline_reached():
+                self.stop_reason = StopReason.DEADLINE
+                break
+
+            beam = self._get_next_beam(beam)
+
+        self._move_to_node(self.best_node or Node.get_empty())
+
+    def _get_next_beam(self, beam: list[Node]) -> list[Node]:
+        candidates = []
+        for node in beam:
+            self.steps += 1
+            # Nodes come in ascending order of strain, so worse ones than the best few of each parent are not needed.
+            nodes = self._drop_transpositions(self._generate_nodes(node))
+            candidates.extend(islice(nodes, self.width))
+
+        self.peak_frontier_size = max(self.peak_frontier_size, len(candidates))
+
+        return heapq.nsmallest(self.width, candidates, key=self._get_rank)
+
+    def _get_rank(self, node: Node) -> tuple[int, int]:
+        return -node.days_set, node.total_strain
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from itertools import groupby
+from typing import TYPE_CHECKING
+
+from algorithm.availability import DoctorAvailabilityTracker
+from algorithm.duty_setter import Algorithm
+from algorithm.workers import SearchOutcome, WorkerPool, run_algorithm
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import Duty, DutySchedule
+
+
+class BlockSearch(Algorithm):
+    # Sets only the days of a block, other days count as set. Doctors take at most the given numbers of duties,
+    # so that duties they accept are left for other blocks too.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        day_numbers: list[int],
+        maximum_duties: dict[Doctor, int],
+        seed: int | None = None,
+        time_limit_ms: int | None = None,
+    ) -> None:
+        self.day_numbers = day_numbers
+        self.maximum_duties = maximum_duties
+
+        super().__init__(doctors, schedule, seed=seed, time_limit_ms=time_limit_ms)
+
+    def _get_not_filled_rows_count(self) -> int:
+        return sum(1 for day_number in self.day_numbers if not self.schedule[day_number].is_filled)
+
+    def _get_availability(self) -> DoctorAvailabilityTracker:
+        if self.availability is None:
+            self.availability = DoctorAvailabilityTracker(
+                self.doctors, self.schedule, self.day_numbers, self.maximum_duties
+            )
+
+        return self.availability
+
+
+def get_blocks(schedule: DutySchedule) -> list[list[int]]:
+    # Weeks of the month with any days not filled yet
+    weeks = groupby(schedule, key=lambda row: row.day.week)
+    blocks = [[row.day.number for row in rows] for _, rows in weeks]
+
+    return [block for block in blocks if any(not schedule[day_number].is_filled for day_number in block)]
+
+
+def get_maximum_duties(doctors: list[Doctor], schedule: DutySchedule, day_numbers: list[int]) -> dict[Doctor, int]:
+    # Duties doctors still accept are shared by blocks in proportion to the days they have to set. Shares are rounded
+    # up, so that no block runs short, and doctors may end up with a few more duties than they accept in total.
+    days_to_set = schedule.not_filled_rows_count()
+    block_days_to_set = sum(1 for day_number in day_numbers if not schedule[day_number].is_filled)
+
+    result = {}
+    for doctor in doctors:
+        duties_count = sum(1 for _ in schedule.duties_for_doctor(doctor))
+        remaining_duties_count = max(0, doctor.preferences.maximum_accepted_duties - duties_count)
+        result[doctor] = duties_count + math.ceil(remaining_duties_count * block_days_to_set / days_to_set)
+
+    return result
+
+
+def run_block_search(
+    doctors: list[Doctor], schedule: DutySchedule, day_numbers: list[int], seed: int, deadline: float | None = None
+) -> SearchOutcome:
+    maximum_duties = get_maximum_duties(doctors, schedule, day_numbers)
+    return run_algorithm(BlockSearch, deadline, doctors, schedule, day_numbers, maximum_duties, seed=seed)
+
+
+class WeeklyDecomposition:
+    # Sets each week of the month in a separate process and stitches the weeks together. Weeks are set in two passes:
+    # every other week first, then the weeks between them, which take duties around their boundaries into account
+    # the same way as duties of adjacent months. Weeks of a pass are set independently, so doctors may get more
+    # duties than they accept. Such duties are cleared and set again by the repair, along with days left empty.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        workers: int = 4,
+        seed: int | None = None,
+        time_limit_ms: int | None = None,
+    ) -> None:
+        self.doctors = doctors
+        self.schedule = schedule
+        self.workers = workers
+        self.random = random.Random(seed)
+
+        self.time_limit_ms = time_limit_ms
+        self.stop_reason = None
+        self.peak_frontier_size = None  # The largest frontier of any of the searches
+        self.step_budget = None  # Steps of all the searches together
+        self.cleared_duties_count = None
+
+    def set_duties(self) -> None:
+        # Each pass of weeks gets a quarter of the time limit, the rest is left for the repair.
+        started_at = time.time()
+        time_limit_ms = self.time_limit_ms // 4 if self.time_limit_ms is not None else None
+
+        # Weeks of a pass are never next to each other.
+        blocks = get_blocks(self.schedule)
+        outcomes = []
+        for pass_blocks in [blocks[::2], blocks[1::2]]:
+            pass_outcomes = self._run_block_searches(pass_blocks, time_limit_ms)
+            for outcome in pass_outcomes:
+                outcome.apply(self.doctors, self.schedule)
+
+            outcomes.extend(pass_outcomes)
+
+        conflicting_duties = self._get_conflicting_duties()
+        for duty in conflicting_duties:
+            duty.update(None)
+
+        self.cleared_duties_count = len(conflicting_duties)
+
+        if self.time_limit_ms is not None:
+            time_limit_ms = max(0, self.time_limit_ms - int((time.time() - started_at) * 1000))
+
+        repair = Algorithm(self.doctors, self.schedule, seed=self.random.getrandbits(32), time_limit_ms=time_limit_ms)
+        repair.set_duties()
+
+        self.stop_reason = repair.stop_reason
+        self.peak_frontier_size = max(
+            [outcome.peak_frontier_size for outcome in outcomes] + [repair.peak_frontier_size]
+        )
+        self.step_budget = sum(outcome.step_budget for outcome in outcomes) + repair.step_budget
+
+    def _run_block_searches(self, blocks: list[list[int]], time_limit_ms: int | None) -> list[SearchOutcome]:
+        # Weeks which were not set by the deadline are left to the repair.
+        pool = WorkerPool(self.workers, time_limit_ms)
+        return pool.run(
+            run_block_search, [(self.doctors, self.schedule, block, self.random.getrandbits(32)) for block in blocks]
+        )
+
+    def _get_conflicting_duties(self) -> list[Duty]:
+        conflicting_duties = []
+
+        # Doctors on duty on the last day of a week and the first day of the next one. Weeks of the second pass
+        # avoid them, but they are checked anyway. Duties set by the user or requested by doctors were known
+        # to both weeks, so one of the duties is always set by the search.
+        for row in self.schedule:
+            if row.day.number == 1 or row.day.week == self.schedule[row.day.number - 1].day.week:
+                continue
+
+            previous_row = self.schedule[row.day.number - 1]
+            for duty in row.set_duties():
+                for previous_duty in previous_row.set_duties():
+                    if previous_duty.doctor == duty.doctor:
+                        conflicting_duties.append(duty if not duty.is_fixed else previous_duty)
+
+        # Doctors with more duties than they accept lose some of those set by the search.
+        for doctor in self.doctors:
+            duties = [
+                duty
+                for duty in self.schedule.duties_for_doctor(doctor)
+                if not duty.is_fixed and duty not in conflicting_duties
+            ]
+            excess_count = (
+                sum(1 for _ in self.schedule.duties_for_doctor(doctor))
+                - sum(1 for duty in conflicting_duties if duty.doctor == doctor)
+                - doctor.preferences.maximum_accepted_duties
+            )
+            if excess_count > 0:
+                conflicting_duties.extend(self.random.sample(duties, min(excess_count, len(duties))))
+
+        return conflicting_duties
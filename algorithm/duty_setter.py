@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import math
 import random
+import time
 from collections import defaultdict, deque
-from dataclasses import dataclass
-from functools import cached_property
-from typing import TYPE_CHECKING, Any, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
+from algorithm.availability import DoctorAvailabilityTracker
+from algorithm.enums import Engine, EvictionPolicy, FrontierPolicy, StopReason
 from algorithm.exceptions import CantSetDutiesError
+from algorithm.frontier import get_frontier
+from algorithm.local_search import HillClimbing, SimulatedAnnealing
+from algorithm.nogoods import Nogood, NogoodStore
 from algorithm.schedule import DutySchedule
 from algorithm.strain import DutyStrainEvaluator
-from algorithm.utils import DoctorAvailabilityHelper, unique_product
+from algorithm.symmetry import get_equivalence_classes, get_ranks, is_canonical
+from algorithm.transposition import TranspositionTable, ZobristHasher
+from algorithm.utils import get_matching, ordered_unique_combinations, unique_product
 from algorithm.validators import (
     BidailyDoctorAvailabilityValidator,
     DailyDoctorAvailabilityValidator,
@@ -19,17 +27,47 @@ from algorithm.validators import (
 )
 
 if TYPE_CHECKING:
+    from algorithm.decomposition import WeeklyDecomposition
     from algorithm.doctor import Doctor
-    from algorithm.schedule import Day, DoctorAvailabilitySchedule
+    from algorithm.lns import LargeNeighbourhoodSearch
+    from algorithm.portfolio import PortfolioSearch
+    from algorithm.schedule import Day, Duty
     from algorithm.validators import BaseDutySettingValidator
 
 
+@dataclass(frozen=True)
+class AlgorithmSettings:
+    engine: Engine = Engine.SEARCH
+    beam_width: int = 10
+    portfolio_workers: int = 4
+    decomposition_workers: int = 4
+    time_limit_ms: int | None = None
+    lns_iterations: int = 100
+    lns_window_days: int = 7
+    annealing_iterations: int = 5_000
+    annealing_initial_temperature: float = 50
+    annealing_final_temperature: float = 1
+    polish: bool = False
+    polish_iterations: int = 2_000
+    polish_time_limit_ms: int | None = None
+    frontier_max_size: int | None = None
+    frontier_eviction_policy: EvictionPolicy = EvictionPolicy.SHALLOWEST
+    frontier_policy: FrontierPolicy = FrontierPolicy.LIFO
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> AlgorithmSettings:
+        return cls(**{name: value for name, value in (data or {}).items() if value is not None})
+
+
 @dataclass(frozen=True)
 class Result:
     were_any_duties_set: bool
     were_all_duties_set: bool
     errors: list[str]
     duties: DutySchedule
+    stop_reason: StopReason | None
+    peak_frontier_size: int | None = None
+    step_budget: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
         result = vars(self).copy()
@@ -47,12 +85,19 @@ class DutySetter:
         BidailyDoctorAvailabilityValidator,
     ]
 
-    def __init__(self, year: int, month: int, doctors_per_duty: int) -> None:
+    def __init__(self, year: int, month: int, doctors_per_duty: int, settings: dict[str, Any] | None = None) -> None:
         self.duty_positions = doctors_per_duty
         self.schedule = DutySchedule(year, month, self.duty_positions)
+        self.settings = AlgorithmSettings.from_dict(settings)
 
         self.doctors = []
+        # Duties of a previous schedule, by day number and position
+        self.previous_duties: dict[tuple[int, int], Doctor] = {}
         self.errors = None
+        self.deadline = None
+        self.stop_reason = None
+        self.peak_frontier_size = None
+        self.step_budget = None
 
     def add_doctor(self, *doctors: Doctor) -> None:
         self.doctors.extend(doctors)
@@ -60,13 +105,28 @@ class DutySetter:
     def get_doctor(self, pk: int) -> Doctor | None:
         return next((doctor for doctor in self.doctors if doctor.pk == pk), None)
 
+    def add_previous_duty(self, day_number: int, position: int, doctor: Doctor) -> None:
+        self.previous_duties[day_number, position] = doctor
+
     def set_duties(self) -> None:
         can_be_set = self.check_if_duties_can_be_set()
         if not can_be_set:
             return
 
+        self._start_clock()
         self._assign_requested_duties()
-        self._assign_duties()
+        if self._assign_previous_duties():
+            self._assign_duties()
+
+            # Previous duties may leave no way to fill the days around the changes, then duties are set from scratch
+            # within the time left.
+            if not self.schedule.is_filled and not self._is_deadline_reached():
+                self._assign_duties_from_scratch()
+        else:
+            self._assign_duties()
+
+        if self.settings.polish:
+            self._polish_duties()
 
         # TODO: Finish
 
@@ -83,6 +143,7 @@ class DutySetter:
                 were_all_duties_set=False,
                 errors=self.errors,
                 duties=self.schedule,
+                stop_reason=None,
             )
 
         return Result(
@@ -90,6 +151,9 @@ class DutySetter:
             were_all_duties_set=self.schedule.is_filled,
             errors=self.errors,
             duties=self.schedule,
+            stop_reason=self.stop_reason,
+            peak_frontier_size=self.peak_frontier_size,
+            step_budget=self.step_budget,
         )
 
     def check_if_duties_can_be_set(self) -> bool:
@@ -110,9 +174,148 @@ class DutySetter:
         setter = RequestedDutiesSetter(self.doctors, self.schedule)
         setter.set_duties()
 
+    def _assign_previous_duties(self) -> bool:
+        setter = PreviousDutiesSetter(self.doctors, self.schedule, self.previous_duties)
+        setter.set_duties()
+
+        return bool(setter.kept_duties)
+
+    def _clear_duties(self) -> None:
+        for duty in self.schedule.cells():
+            if not duty.is_fixed:
+                duty.update(None)
+
     def _assign_duties(self) -> None:
-        algorithm = Algorithm(self.doctors, self.schedule)
+        algorithm = self._get_algorithm()
         algorithm.set_duties()
+        self.stop_reason = algorithm.stop_reason
+        # Engines improving a complete schedule don't keep a frontier or count steps of their own
+        self.peak_frontier_size = getattr(algorithm, 'peak_frontier_size', None)
+        self.step_budget = getattr(algorithm, 'step_budget', None)
+
+    def _assign_duties_from_scratch(self) -> None:
+        # Schedule set from scratch is kept only if it sets more duties or has lower strain than the one set with
+        # previous duties, which changes the previous schedule less.
+        previous_assignments = [(duty, duty.doctor) for duty in self.schedule.cells()]
+        previous_cost = self._get_cost()
+        previous_statistics = self.stop_reason, self.peak_frontier_size, self.step_budget
+
+        self._clear_duties()
+        self._assign_duties()
+
+        if self._get_cost() < previous_cost:
+            return
+
+        for duty, doctor in previous_assignments:
+            duty.update(doctor)
+        self.stop_reason, self.peak_frontier_size, self.step_budget = previous_statistics
+
+    def _get_cost(self) -> tuple[int, int]:
+        set_duties_count = sum(1 for duty in self.schedule.cells() if duty.is_set)
+        strain_evaluator = DutyStrainEvaluator(
+            self.schedule.year, self.schedule.month, self.schedule.positions, self.doctors
+        )
+        total_strain = sum(strain_evaluator.get_doctor_strain(doctor, self.schedule) for doctor in self.doctors)
+
+        return -set_duties_count, total_strain
+
+    def _start_clock(self) -> None:
+        # All the searches run for the request share the time limit.
+        if self.settings.time_limit_ms is not None:
+            self.deadline = time.monotonic() + self.settings.time_limit_ms / 1000
+
+    def _is_deadline_reached(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _get_time_limit_ms(self) -> int | None:
+        if self.deadline is None:
+            return self.settings.time_limit_ms
+
+        # Rounded up, so that searches don't stop short of the deadline.
+        return max(0, math.ceil((self.deadline - time.monotonic()) * 1000))
+
+    def _polish_duties(self) -> None:
+        # Polishing takes its own time limit, but doesn't exceed the time left of the shared one.
+        time_limits_ms = [self.settings.polish_time_limit_ms, self._get_time_limit_ms()]
+        time_limits_ms = [time_limit_ms for time_limit_ms in time_limits_ms if time_limit_ms is not None]
+
+        hill_climbing = HillClimbing(
+            self.doctors,
+            self.schedule,
+            max_iterations=self.settings.polish_iterations,
+            time_limit_ms=min(time_limits_ms, default=None),
+        )
+        hill_climbing.improve_duties()
+
+    def _get_algorithm(
+        self,
+    ) -> Algorithm | PortfolioSearch | LargeNeighbourhoodSearch | SimulatedAnnealing | WeeklyDecomposition:
+        # Avoid circular imports
+        from algorithm.beam_search import BeamSearch
+        from algorithm.decomposition import WeeklyDecomposition
+        from algorithm.exact import ExactSearch
+        from algorithm.lns import LargeNeighbourhoodSearch
+        from algorithm.portfolio import PortfolioSearch
+
+        time_limit_ms = self._get_time_limit_ms()
+
+        match self.settings.engine:
+            case Engine.SEARCH:
+                return Algorithm(
+                    self.doctors,
+                    self.schedule,
+                    frontier_policy=self.settings.frontier_policy,
+                    time_limit_ms=time_limit_ms,
+                    frontier_max_size=self.settings.frontier_max_size,
+                    eviction_policy=self.settings.frontier_eviction_policy,
+                )
+            case Engine.BEAM:
+                return BeamSearch(
+                    self.doctors,
+                    self.schedule,
+                    width=self.settings.beam_width,
+                    time_limit_ms=time_limit_ms,
+                )
+            case Engine.PORTFOLIO:
+                return PortfolioSearch(
+                    self.doctors,
+                    self.schedule,
+                    configs=PortfolioSearch.get_configs(
+                        self.settings.portfolio_workers,
+                        frontier_max_size=self.settings.frontier_max_size,
+                        eviction_policy=self.settings.frontier_eviction_policy,
+                    ),
+                    workers=self.settings.portfolio_workers,
+                    time_limit_ms=time_limit_ms,
+                )
+            case Engine.LNS:
+                return LargeNeighbourhoodSearch(
+                    self.doctors,
+                    self.schedule,
+                    iterations=self.settings.lns_iterations,
+                    window_days=self.settings.lns_window_days,
+                    time_limit_ms=time_limit_ms,
+                )
+            case Engine.ANNEALING:
+                return SimulatedAnnealing(
+                    self.doctors,
+                    self.schedule,
+                    max_iterations=self.settings.annealing_iterations,
+                    initial_temperature=self.settings.annealing_initial_temperature,
+                    final_temperature=self.settings.annealing_final_temperature,
+                    time_limit_ms=time_limit_ms,
+                )
+            case Engine.EXACT:
+                return ExactSearch(self.doctors, self.schedule, time_limit_ms=time_limit_ms)
+            case Engine.WEEKS:
+                return WeeklyDecomposition(
+                    self.doctors,
+                    self.schedule,
+                    workers=self.settings.decomposition_workers,
+                    time_limit_ms=time_limit_ms,
+                )
+            case _:
+                raise ValueError(f'Unsupported engine: {self.settings.engine}')
 
 
 class RequestedDutiesSetter:
@@ -145,12 +348,70 @@ class RequestedDutiesSetter:
         return result
 
 
-@dataclass(frozen=True)
+class PreviousDutiesSetter:
+    # Keeps duties of a previous schedule which are still valid, so that setting duties again changes it as little
+    # as possible. Days any of them can't be kept on are set again by the algorithm (with all their positions), along
+    # with the days next to them, so that the search has some room to set them.
+
+    def __init__(
+        self, doctors: list[Doctor], schedule: DutySchedule, previous_duties: dict[tuple[int, int], Doctor]
+    ) -> None:
+        self.doctors = doctors
+        self.schedule = schedule
+        self.previous_duties = previous_duties
+
+        self.kept_duties: list[Duty] = []
+
+    def set_duties(self) -> None:
+        if not self.previous_duties:
+            return
+
+        availability = DoctorAvailabilityTracker(self.doctors, self.schedule)
+        kept_duties = []
+        changed_days = set()
+
+        # Duties are checked in order of days, so that a doctor keeps their earliest duties if they accept fewer now.
+        for (day_number, position), doctor in sorted(self.previous_duties.items()):
+            duty = self.schedule[day_number, position]
+            if duty.is_set:
+                if duty.doctor != doctor:
+                    changed_days.add(day_number)
+            elif availability.get_available_mask(day_number, position) & availability.get_mask([doctor]):
+                availability.assign(duty, doctor)
+                kept_duties.append(duty)
+            else:
+                changed_days.add(day_number)
+
+        # Positions without a previous duty are new, so their days are set again too.
+        changed_days.update(row.day.number for row in self.schedule if not row.is_filled)
+
+        for duty in kept_duties:
+            if {duty.day.number - 1, duty.day.number, duty.day.number + 1} & changed_days:
+                availability.unassign(duty)
+            else:
+                self.kept_duties.append(duty)
+
+
+@dataclass(frozen=True, slots=True)
 class Node:
     day_number: int | None
     doctors: tuple[Doctor, ...] | None
     strain: int
     parent: Node | None
+    key: int = 0  # Hash of the partial schedule, the same for any order of reaching it
+
+    # Computed from the parent on creation, so that reading them doesn't go up the whole path.
+    total_strain: int = field(init=False, compare=False)
+    days_set: int = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.parent is None:
+            total_strain, days_set = self.strain, 0
+        else:
+            total_strain, days_set = self.strain + self.parent.total_strain, 1 + self.parent.days_set
+
+        object.__setattr__(self, 'total_strain', total_strain)
+        object.__setattr__(self, 'days_set', days_set)
 
     @classmethod
     def get_empty(cls) -> Node:
@@ -162,74 +423,189 @@ class Node:
     def get_doctors_with_positions(self) -> Iterator[Doctor, int]:
         return ((doctor, position) for position, doctor in enumerate(self.doctors, start=1))
 
-    @cached_property
-    def total_strain(self) -> int:
-        if self.parent is None:
-            return self.strain
 
-        return self.strain + self.parent.total_strain
+class Algorithm:
+    # Fixed number of steps, if set. Otherwise, steps are budgeted between these numbers per day to set,
+    # depending on how hard the month is estimated to be.
+    max_steps = None
+    min_steps_per_day = 4
+    max_steps_per_day = 60
 
-    @cached_property
-    def days_set(self) -> int:
-        if self.parent is None:
-            return 0
+    # Roughly the strain of the most demanding duty, so that depth is traded only for considerably lower strain.
+    duty_strain_estimate = 500
 
-        return 1 + self.parent.days_set
+    transposition_table_size = 100_000
 
+    nogood_store_size = 10_000
 
-class Algorithm:
-    max_steps = 1_000
-
-    def __init__(self, doctors: list[Doctor], schedule: DutySchedule, depth: int = 2) -> None:
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        depth: int = 2,
+        frontier_policy: FrontierPolicy = FrontierPolicy.LIFO,
+        seed: int | None = None,
+        time_limit_ms: int | None = None,
+        strain_upper_bound: int | None = None,
+        frontier_max_size: int | None = None,
+        eviction_policy: EvictionPolicy = EvictionPolicy.SHALLOWEST,
+    ) -> None:
         self.doctors = doctors
         self.schedule = schedule
-
-        self.frontier = deque()
+        self.random = random.Random(seed)
+
+        # With a maximum size, the worst nodes are evicted from the frontier once it's full.
+        self.frontier_policy = frontier_policy
+        self.frontier = get_frontier(
+            frontier_policy,
+            days_to_set=self._get_not_filled_rows_count(),
+            strain_per_day=schedule.positions * self.duty_strain_estimate,
+            max_size=frontier_max_size,
+            eviction_policy=eviction_policy,
+        )
+        self.peak_frontier_size = 0
 
         self.best_node = None
-        self.steps = 0
+        self.steps = 0  # Steps with the current depth
+        self.total_steps = 0
         self.depth = depth
 
+        # Steps for the whole search, shared equally by depths until all doctors are considered.
+        self.step_budget = None
+        self.steps_per_depth = None
+
+        # With a time limit, the search runs until the deadline instead of being limited by steps.
+        self.time_limit_ms = time_limit_ms
+        self.deadline = None
+        self.stop_reason = None
+
+        # Only schedules with lower total strain are looked for. Nodes which can't lead to one are pruned,
+        # using a lower bound of strain of the days still to set, kept up to date as nodes are applied and reverted.
+        self.strain_upper_bound = strain_upper_bound
+        self.day_strain_lower_bounds: dict[int, int] = {}
+        self.remaining_strain_lower_bound = 0
+        self.pruned_nodes = 0
+
+        # Nodes expanded with the current depth, to be expanded again with more doctors when depth increases.
+        # With a maximum size of the frontier, only as many of the latest ones are kept.
+        self.expanded_nodes: deque[Node] = deque(maxlen=frontier_max_size)
+
+        # Nodes applied to the schedule, from the root down, along with duties each of them has filled.
+        self.trail: list[tuple[Node, list[Duty]]] = []
+
         self.strain_evaluator = None
+        self.availability = None
+        self.hasher = None
+        self.equivalence_classes = None
+        self.transpositions = TranspositionTable(self.transposition_table_size)
+
+        # Sets of assignments made by the search, found to leave a day impossible to fill
+        self.nogoods = NogoodStore(self.nogood_store_size)
+
+        # Nodes, none of the descendants of which can be completed, by their ids
+        self.dead_nodes: dict[int, Node] = {}
 
     @property
     def combined_doctors_per_position(self) -> int:
         return self.depth * self.schedule.positions
 
     def set_duties(self) -> None:
+        self._start_clock()
+        self._initialize_step_budget()
         self._initialize_frontier()
 
         while True:
             self.steps += 1
-            if not self.frontier:
-                break
-
+            self.total_steps += 1
             node = self._remove_node_from_frontier()
+            if node is None:
+                self.stop_reason = StopReason.EXHAUSTED
+                break
 
             if self._is_best_node(node):
                 self.best_node = node
 
             if self._are_all_duties_set(node):
                 self.best_node = node
+                self.stop_reason = StopReason.COMPLETED
                 break
 
             self._expand(node)
 
-            if self.steps > 2 * len(self.schedule) and self.combined_doctors_per_position < len(self.doctors):
-                return Algorithm(self.doctors, self.schedule, self.depth + 1).set_duties()
-            elif self.steps > self.max_steps:
+            if self._is_deadline_reached():
+                self.stop_reason = StopReason.DEADLINE
+                break
+
+            if self._is_step_budget_exceeded():
+                self.stop_reason = StopReason.STEP_LIMIT
                 break
 
-        if self.best_node:
-            final_schedule = self._construct_schedule(self.best_node)
-            self.schedule.merge(final_schedule)
+            if self.steps > self.steps_per_depth and self.combined_doctors_per_position < len(self.doctors):
+                self._increase_depth()
+
+        self._move_to_node(self.best_node or Node.get_empty())
+
+    def _start_clock(self) -> None:
+        if self.time_limit_ms is not None:
+            self.deadline = time.monotonic() + self.time_limit_ms / 1000
+
+    def _is_deadline_reached(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _is_step_budget_exceeded(self) -> bool:
+        return self.time_limit_ms is None and self.total_steps > self.step_budget
+
+    def _initialize_step_budget(self) -> None:
+        days_to_set = self._get_not_filled_rows_count()
+
+        if self.max_steps is not None:
+            self.step_budget = self.max_steps
+        else:
+            hardness = self._get_availability().get_hardness()
+            steps_per_day = self.min_steps_per_day + (self.max_steps_per_day - self.min_steps_per_day) * hardness
+            self.step_budget = round(days_to_set * steps_per_day)
+
+        # Each depth gets at least enough steps to set all the days without going back.
+        depths_count = max(1, math.ceil(len(self.doctors) / self.schedule.positions) - self.depth + 1)
+        self.steps_per_depth = max(days_to_set + 1, self.step_budget // depths_count)
 
     def _initialize_frontier(self) -> None:
+        if self.strain_upper_bound is not None:
+            self._initialize_strain_lower_bounds()
+
         initial_node = Node.get_empty()
-        self.frontier.append(initial_node)
+        self.frontier.push([initial_node])
+        self.peak_frontier_size = max(self.peak_frontier_size, len(self.frontier))
+
+    def _initialize_strain_lower_bounds(self) -> None:
+        # Bounds of strain modifiers hold whatever duties are set later, so bounds evaluated before the search
+        # starts hold for all nodes. Each free position of a day takes one of the cheapest doctors available on it.
+        availability = self._get_availability()
+        evaluator = self._get_strain_evaluator()
+
+        self.day_strain_lower_bounds = {}
+        for row in availability:
+            if row.is_set:
+                continue
+
+            free_positions = self.schedule[row.day.number].free_positions()
+            doctors = availability.get_doctors(row.mask_for_positions(*free_positions))
+            strains = sorted(evaluator.get_strain_lower_bounds(row.day, self.schedule, doctors).values())
+            self.day_strain_lower_bounds[row.day.number] = sum(strains[: len(free_positions)])
+
+        self.remaining_strain_lower_bound = sum(self.day_strain_lower_bounds.values())
+
+    def _can_beat_strain_upper_bound(self, strain: int) -> bool:
+        return self.strain_upper_bound is None or strain < self.strain_upper_bound
 
-    def _remove_node_from_frontier(self) -> Node:
-        return self.frontier.pop()
+    def _remove_node_from_frontier(self) -> Node | None:
+        # Nodes in subtrees found to be dead are skipped.
+        while self.frontier:
+            node = self.frontier.pop()
+            if not self._is_in_dead_subtree(node):
+                return node
+
+        return None
 
     def _is_best_node(self, node: Node) -> bool:
         if node.is_empty():
@@ -247,76 +623,268 @@ class Algorithm:
         return False
 
     def _are_all_duties_set(self, node: Node) -> bool:
-        return node.days_set == self.schedule.not_filled_rows_count()
+        # Each node on the trail has filled a row of the schedule.
+        return node.days_set == self._get_not_filled_rows_count() + len(self.trail)
+
+    def _get_not_filled_rows_count(self) -> int:
+        return self.schedule.not_filled_rows_count()
+
+    def _expand(self, node: Node, known_width: int = 0) -> None:
+        nodes = list(self._drop_transpositions(self._get_nodes(node, known_width)))
+        self.frontier.push(nodes)
+        self.expanded_nodes.append(node)
+
+        self.peak_frontier_size = max(self.peak_frontier_size, len(self.frontier))
 
-    def _expand(self, node: Node) -> None:
-        if nodes := self._get_nodes(node):
-            first_node = nodes.pop(0)
-            self.frontier.append(first_node)
-            self.frontier.extendleft(nodes)
+    def _increase_depth(self) -> None:
+        # The search is widened in place: nodes already in the frontier and the best node are kept,
+        # and expanded nodes only receive children with doctors which did not fit in the previous depth.
+        # Expanding a node again takes a step, and nodes in dead subtrees are dropped.
+        known_width = self.combined_doctors_per_position
+        expanded_nodes = self.expanded_nodes
 
-    def _get_nodes(self, node: Node) -> list[Node]:
-        schedule = self._construct_schedule(node)
-        doctor_availability_schedule = DoctorAvailabilityHelper(self.doctors, schedule).get_availability_schedule()
+        self.depth += 1
+        self.steps = 0
+        self.expanded_nodes = deque(maxlen=expanded_nodes.maxlen)
+
+        for node in expanded_nodes:
+            if self._is_deadline_reached() or self._is_step_budget_exceeded():
+                break
 
-        day = self._get_day_with_least_available_doctors_per_free_position(doctor_availability_schedule)
-        available_doctors_per_position = doctor_availability_schedule[day.number]
+            if self._is_in_dead_subtree(node):
+                continue
+
+            self.total_steps += 1
+            self._expand(node, known_width)
+
+    def _get_nodes(self, node: Node, known_width: int = 0) -> list[Node]:
+        return list(self._generate_nodes(node, known_width))
+
+    def _generate_nodes(self, node: Node, known_width: int = 0) -> Iterator[Node]:
+        # Nodes come in ascending order of strain. They must be consumed before moving to another node.
+        schedule = self._move_to_node(node)
+        availability = self._get_availability()
+
+        nogood = self._get_holding_nogood(self.nogoods.get_matched())
+        if nogood is not None:
+            self._backjump(node, nogood.assignments)
+            return
+
+        day = self._get_day_with_least_available_doctors_per_free_position(availability)
+        conflicting_assignments = self._get_dead_end_conflict(day)
+        if conflicting_assignments is not None:
+            self._backjump(node, conflicting_assignments)
+            return
+
+        available_doctors_per_position = availability[day.number]
 
         available_doctors = available_doctors_per_position.doctors_for_all_positions()
         strain_per_doctor = self._get_strain_per_doctor(day, schedule, available_doctors)
 
-        for available_doctors_list in available_doctors_per_position:
-            available_doctors_list.sort(key=lambda doctor: strain_per_doctor[doctor])
+        # Interchangeable doctors ranked beyond the number of positions could never be taken,
+        # so they don't take up places of other doctors.
+        ranks = get_ranks(self._get_equivalence_classes(), availability)
+        positions = available_doctors_per_position.positions
+        doctors_per_position = [
+            sorted(
+                (
+                    doctor
+                    for doctor in available_doctors_per_position.doctors_for_position(position)
+                    if doctor not in ranks or ranks[doctor][1] < len(positions)
+                ),
+                key=strain_per_doctor.get,
+            )[: self.combined_doctors_per_position]
+            for position in positions
+        ]
 
-        doctors_combinations = unique_product(
-            *(
-                available_doctors[: self.combined_doctors_per_position]
-                for available_doctors in available_doctors_per_position
-            )
+        other_days_masks = [
+            availability[other_day_number].mask_for_all_positions()
+            for other_day_number in [day.number - 1, day.number + 1]
+            if 1 <= other_day_number <= len(self.schedule)
+        ]
+
+        # Combinations come in ascending order of strain. Strain doesn't depend on positions,
+        # so each set of doctors comes only once, with positions matched to their preferences.
+        doctors_combinations = ordered_unique_combinations(
+            *doctors_per_position,
+            key=strain_per_doctor.get,
+            is_valid=lambda combination: not (
+                ranks
+                and not is_canonical(combination, ranks)
+                or self._is_conflicting_with_other_days(combination, other_days_masks)
+                or self.nogoods
+                and self._get_holding_nogood(self.nogoods.get_matched_with(day.number, combination)) is not None
+            ),
+            random=self.random,  # Prevent patterns among combinations with equal strain
         )
 
-        if day.number > 1:
-            previous_day_doctors = doctor_availability_schedule[day.number - 1].doctors_for_all_positions()
-            doctors_combinations = self._drop_conflicting_combinations(doctors_combinations, previous_day_doctors)
+        if known_width:
+            known_doctors_per_position = [doctors[:known_width] for doctors in doctors_per_position]
+            doctors_combinations = self._drop_known_combinations(doctors_combinations, known_doctors_per_position)
+
+        hasher = self._get_hasher()
+        remaining_strain_lower_bound = self.remaining_strain_lower_bound - self.day_strain_lower_bounds.get(
+            day.number, 0
+        )
+        for doctors_combination in doctors_combinations:
+            strain = sum(strain_per_doctor[doctor] for doctor in doctors_combination)
 
-        if day.number < len(self.schedule):
-            next_day_doctors = doctor_availability_schedule[day.number + 1].doctors_for_all_positions()
-            doctors_combinations = self._drop_conflicting_combinations(doctors_combinations, next_day_doctors)
+            # Following combinations aren't cheaper, so none of them can beat the bound either.
+            if not self._can_beat_strain_upper_bound(node.total_strain + strain + remaining_strain_lower_bound):
+                self.pruned_nodes += 1
+                return
 
-        nodes = [
-            Node(
+            yield Node(
                 day_number=day.number,
                 doctors=doctors_combination,
-                strain=sum(strain_per_doctor[doctor] for doctor in doctors_combination),
+                strain=strain,
                 parent=node,
+                key=node.key ^ hasher.get_key(day.number, doctors_combination),
             )
-            for doctors_combination in doctors_combinations
-        ]
-        random.shuffle(nodes)  # Prevent patterns
-        nodes.sort(key=lambda node: node.strain)
 
-        return nodes
+    def _move_to_node(self, node: Node) -> DutySchedule:
+        # Only the part of the path which differs from the trail is undone and redone.
+        path = []
+        while not node.is_empty() and not self._is_on_trail(node):
+            path.append(node)
+            node = node.parent
+
+        while len(self.trail) > node.days_set:
+            self._revert_last_node()
+
+        for path_node in reversed(path):
+            self._apply_node(path_node)
 
-    def _construct_schedule(self, node: Node) -> DutySchedule:
-        schedule = self.schedule.copy()
+        return self.schedule
+
+    def _is_on_trail(self, node: Node) -> bool:
+        return node.days_set <= len(self.trail) and self.trail[node.days_set - 1][0] is node
+
+    def _apply_node(self, node: Node) -> None:
+        availability = self._get_availability()
+
+        filled_duties = []
+        for doctor, position in node.get_doctors_with_positions():
+            duty = self.schedule[node.day_number, position]
+            if not duty.is_set:
+                availability.assign(duty, doctor)
+                self.nogoods.assign(node.day_number, doctor)
+                filled_duties.append(duty)
+
+        self.trail.append((node, filled_duties))
+        self.remaining_strain_lower_bound -= self.day_strain_lower_bounds.get(node.day_number, 0)
+
+    def _revert_last_node(self) -> None:
+        availability = self._get_availability()
+
+        node, filled_duties = self.trail.pop()
+        for duty in filled_duties:
+            self.nogoods.unassign(duty.day.number, duty.doctor)
+            availability.unassign(duty)
+
+        self.remaining_strain_lower_bound += self.day_strain_lower_bounds.get(node.day_number, 0)
+
+    def _get_availability(self) -> DoctorAvailabilityTracker:
+        # Built lazily, so that it reflects the schedule at the time the search starts.
+        if self.availability is None:
+            self.availability = DoctorAvailabilityTracker(self.doctors, self.schedule)
+
+        return self.availability
+
+    def _get_hasher(self) -> ZobristHasher:
+        if self.hasher is None:
+            self.hasher = ZobristHasher(self.doctors, self.schedule, self.random)
+
+        return self.hasher
+
+    def _get_equivalence_classes(self) -> list[list[Doctor]]:
+        if self.equivalence_classes is None:
+            self.equivalence_classes = get_equivalence_classes(self.doctors)
+
+        return self.equivalence_classes
+
+    def _drop_transpositions(self, nodes: Iterable[Node]) -> Iterator[Node]:
+        # Partial schedules reached before in a different order are expanded again only if their strain is lower.
+        return (node for node in nodes if self.transpositions.add(node.key, node.total_strain))
+
+    def _get_holding_nogood(self, nogoods: Iterable[Nogood]) -> Nogood | None:
+        # Nogoods hold only while their day is not filled yet.
+        return next((nogood for nogood in nogoods if not self.schedule[nogood.day_number].is_filled), None)
+
+    def _get_dead_end_conflict(self, day: Day) -> set[tuple[int, Doctor]] | None:
+        # The day can't be filled if a free position has no available doctors, or there are fewer available doctors
+        # than free positions. Assignments responsible for it are returned, and stored as a nogood if they are
+        # all on adjacent days, so that other nodes with them are rejected. Doctors who have as many duties
+        # as they accept need all their duties, which hardly ever repeat together, so they aren't stored.
+        available_doctors_per_position = self._get_availability()[day.number]
+        free_positions = self.schedule[day.number].free_positions()
+
+        for positions in [*([position] for position in free_positions), free_positions]:
+            if available_doctors_per_position.mask_for_positions(*positions).bit_count() < len(positions):
+                assignments = self._get_conflicting_assignments(day, positions)
+                if all(abs(day_number - day.number) <= 1 for day_number, _ in assignments):
+                    self.nogoods.add(Nogood(day.number, frozenset(assignments)))
+
+                return assignments
+
+        return None
+
+    def _get_conflicting_assignments(self, day: Day, positions: Iterable[int]) -> set[tuple[int, Doctor]]:
+        # Assignments made by the search, which make doctors accepting the positions unavailable.
+        # Duties set before the search stay set, so doctors unavailable because of them don't need any.
+        availability = self._get_availability()
+        depths = {node.day_number: depth for depth, (node, _) in enumerate(self.trail)}
+
+        accepting_mask = 0
+        for position in positions:
+            accepting_mask |= availability.get_accepting_mask(day.number, position)
+        unavailable_mask = accepting_mask & ~availability[day.number].mask_for_positions(*positions)
+
+        assignments = set()
+        for doctor in availability.get_doctors(unavailable_mask):
+            adjacent_assignments = [
+                (day_number, doctor)
+                for day_number in [day.number - 1, day.number, day.number + 1]
+                if 1 <= day_number <= len(self.schedule) and self.schedule[day_number].has_duty(doctor)
+            ]
+            if adjacent_assignments:
+                # Any of the duties is enough, the earliest one lets the search jump back furthest.
+                if all(self.nogoods.is_assigned(*assignment) for assignment in adjacent_assignments):
+                    assignments.add(min(adjacent_assignments, key=lambda assignment: depths[assignment[0]]))
+                continue
+
+            # Otherwise the doctor has as many duties as they accept.
+            assignments.update(
+                (duty.day.number, doctor)
+                for duty in self.schedule.duties_for_doctor(doctor)
+                if self.nogoods.is_assigned(duty.day.number, doctor)
+            )
 
-        while node.parent:
-            for doctor, position in node.get_doctors_with_positions():
-                schedule[node.day_number, position].update(doctor)
+        return assignments
 
+    def _backjump(self, node: Node, assignments: Iterable[tuple[int, Doctor]]) -> None:
+        # All nodes below the most recent one which set any of the conflicting assignments share the conflict,
+        # so its whole subtree is skipped. Without such a node, no schedule can be completed from the root.
+        conflicting_days = {day_number for day_number, _ in assignments}
+        while node.parent is not None and node.day_number not in conflicting_days:
             node = node.parent
 
-        return schedule
+        self.dead_nodes[id(node)] = node
 
-    def _get_day_with_least_available_doctors_per_free_position(
-        self, availability_schedule: DoctorAvailabilitySchedule
-    ) -> Day:
-        unset_rows = (row for row in availability_schedule if not row.is_set)
-        row_with_least_doctors_per_free_position = min(
-            unset_rows,
-            key=lambda row: row.average_doctors_per_free_position,
-        )
-        return row_with_least_doctors_per_free_position.day
+    def _is_in_dead_subtree(self, node: Node) -> bool:
+        if not self.dead_nodes:
+            return False
+
+        while node is not None:
+            if id(node) in self.dead_nodes:
+                return True
+
+            node = node.parent
+
+        return False
+
+    def _get_day_with_least_available_doctors_per_free_position(self, availability: DoctorAvailabilityTracker) -> Day:
+        return availability.get_day_with_least_available_doctors_per_free_position()
 
     def _get_strain_per_doctor(
         self, day: Day, current_schedule: DutySchedule, available_doctors: list[Doctor]
@@ -332,16 +900,22 @@ class Algorithm:
 
         return self.strain_evaluator
 
-    def _drop_conflicting_combinations(
+    def _drop_known_combinations(
         self,
-        doctors_combinations: list[tuple[Doctor, ...]],
-        other_day_doctors: set[Doctor],
+        doctors_combinations: Iterable[tuple[Doctor, ...]],
+        known_doctors_per_position: list[list[Doctor]],
     ) -> Iterator[tuple[Doctor, ...]]:
-        def is_conflicting_with_other_day_availability(combination: tuple[Doctor, ...]) -> bool:
-            return len(other_day_doctors - set(combination)) < self.schedule.positions
-
-        return (
-            combination
-            for combination in doctors_combinations
-            if not is_conflicting_with_other_day_availability(combination)
+        # Sets of doctors which could be matched to positions with the known doctors were generated before.
+        def is_known(combination: tuple[Doctor, ...]) -> bool:
+            return get_matching(combination, known_doctors_per_position) is not None
+
+        return (combination for combination in doctors_combinations if not is_known(combination))
+
+    def _is_conflicting_with_other_days(self, doctors: tuple[Doctor, ...], other_days_masks: list[int]) -> bool:
+        # Other days must keep enough available doctors to fill all positions. Works for partial combinations too,
+        # as adding doctors can only make other days' availability smaller.
+        doctors_mask = self._get_availability().get_mask(doctors)
+        return any(
+            (other_day_mask & ~doctors_mask).bit_count() < self.schedule.positions
+            for other_day_mask in other_days_masks
         )
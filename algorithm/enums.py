@@ -1,4 +1,4 @@
-from enum import IntEnum
+from enum import IntEnum, StrEnum
 
 
 class Weekday(IntEnum):
@@ -34,3 +34,31 @@ class StrainModifier(IntEnum):
     THURSDAY_IS_ORDINARY = 10
     NEW_WEEKEND = 200
     DUTY_LEFT = -10
+
+
+class FrontierPolicy(StrEnum):
+    LIFO = 'lifo'
+    DAYS_SET = 'days_set'
+    STRAIN_ESTIMATE = 'strain_estimate'
+
+
+class EvictionPolicy(StrEnum):
+    SHALLOWEST = 'shallowest'
+    HIGHEST_STRAIN = 'highest_strain'
+
+
+class Engine(StrEnum):
+    SEARCH = 'search'
+    BEAM = 'beam'
+    PORTFOLIO = 'portfolio'
+    LNS = 'lns'
+    ANNEALING = 'annealing'
+    EXACT = 'exact'
+    WEEKS = 'weeks'
+
+
+class StopReason(StrEnum):
+    COMPLETED = 'completed'
+    EXHAUSTED = 'exhausted'
+    STEP_LIMIT = 'step_limit'
+    DEADLINE = 'deadline'
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING, Iterator
+
+from algorithm.duty_setter import Algorithm, Node
+from algorithm.enums import StopReason
+
+if TYPE_CHECKING:
+    from algorithm.availability import DoctorAvailabilityTrackerRow
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import Day, DutySchedule
+
+
+class ExactSearch(Algorithm):
+    # Branch and bound over the same tree as Algorithm: the most constrained day is set first, each with the strain
+    # it has at the time of setting. All doctors are considered for each position, and subtrees which can't lead
+    # to a complete schedule, or to a lower strain than the best complete schedule found, are pruned.
+    # If the search finishes, the schedule is optimal, or there is no complete schedule.
+    # Without a time limit, the search is capped by steps, and if it finds no complete schedule by then, the tree
+    # search sets the duties left.
+
+    max_steps = 1_000
+
+    strain_lower_bounds_cache_size = 100_000
+
+    def __init__(self, doctors: list[Doctor], schedule: DutySchedule, time_limit_ms: int | None = None) -> None:
+        super().__init__(doctors, schedule, time_limit_ms=time_limit_ms)
+
+        # Only days free when the search starts can be left to set.
+        self.day_numbers_to_set = [row.day.number for row in schedule if not row.is_filled]
+        self.days_to_set = len(self.day_numbers_to_set)
+
+        self._strain_lower_bounds: dict[tuple[int, Doctor, bool, tuple[bool, ...]], int] = {}
+        self._duties_count_strains: dict[tuple[Doctor, int], int] = {}
+
+    @property
+    def combined_doctors_per_position(self) -> int:
+        return len(self.doctors)
+
+    def set_duties(self) -> None:
+        if not self.days_to_set:
+            self.stop_reason = StopReason.COMPLETED
+            return
+
+        self._start_clock()
+        self._initialize_strain_lower_bounds()
+        self.step_budget = self.max_steps
+        stack = [Node.get_empty()]
+
+        while stack:
+            self.steps += 1
+            self.total_steps += 1
+            if self._is_deadline_reached():
+                self.stop_reason = StopReason.DEADLINE
+                break
+
+            if self._is_step_budget_exceeded():
+                self.stop_reason = StopReason.STEP_LIMIT
+                break
+
+            node = stack.pop()
+            if self._is_in_dead_subtree(node):
+                continue
+
+            self._move_to_node(node)
+
+            if self._is_best_node(node):
+                self.best_node = node
+
+            if node.days_set == self.days_to_set:
+                self.strain_upper_bound = self.best_node.total_strain
+                continue
+
+            if self._is_pruned(node):
+                self.pruned_nodes += 1
+                continue
+
+            # Nodes come in ascending order of strain, the cheapest one is explored first.
+            nodes = list(self._drop_transpositions(self._get_nodes(node)))
+            stack.extend(reversed(nodes))
+            self.peak_frontier_size = max(self.peak_frontier_size, len(stack))
+        else:
+            if self.best_node is not None and self.best_node.days_set == self.days_to_set:
+                self.stop_reason = StopReason.COMPLETED
+            else:
+                self.stop_reason = StopReason.EXHAUSTED
+
+        self._move_to_node(self.best_node or Node.get_empty())
+
+        if self.stop_reason == StopReason.STEP_LIMIT and not self._is_complete():
+            self._set_duties_with_tree_search()
+
+    def _is_complete(self) -> bool:
+        return self.best_node is not None and self.best_node.days_set == self.days_to_set
+
+    def _set_duties_with_tree_search(self) -> None:
+        # The best partial schedule is kept if the tree search sets fewer days.
+        best_node = self.best_node or Node.get_empty()
+        self._move_to_node(Node.get_empty())
+
+        algorithm = Algorithm(self.doctors, self.schedule)
+        algorithm.set_duties()
+        self.step_budget += algorithm.step_budget
+
+        if algorithm.best_node is None or algorithm.best_node.days_set < best_node.days_set:
+            algorithm._move_to_node(Node.get_empty())
+            self._move_to_node(best_node)
+
+    def _is_pruned(self, node: Node) -> bool:
+        if not self._can_fill_all_days():
+            return True
+
+        return not self._can_beat_strain_upper_bound(node.total_strain + self._get_remaining_strain_lower_bound())
+
+    def _can_fill_all_days(self) -> bool:
+        # Forward checking: each day still needs a distinct available doctor on each of its free positions,
+        # and doctors have to accept enough duties to fill all of them.
+        availability = self._get_availability()
+        free_positions_count = 0
+
+        for row in self._get_rows_to_set():
+            free_positions_masks = [
+                availability.get_available_mask(row.day.number, position)
+                for position in self.schedule[row.day.number].free_positions()
+            ]
+            if not all(free_positions_masks):
+                return False
+
+            available_doctors_mask = 0
+            for mask in free_positions_masks:
+                available_doctors_mask |= mask
+
+            if available_doctors_mask.bit_count() < len(free_positions_masks):
+                return False
+
+            free_positions_count += len(free_positions_masks)
+
+        remaining_duties_count = sum(
+            doctor.preferences.maximum_accepted_duties - availability.get_duties_count(doctor)
+            for doctor in self.doctors
+        )
+        return remaining_duties_count >= free_positions_count
+
+    def _get_rows_to_set(self) -> Iterator[DoctorAvailabilityTrackerRow]:
+        availability = self._get_availability()
+        rows = (availability[day_number] for day_number in self.day_numbers_to_set)
+        return (row for row in rows if not row.is_set)
+
+    def _get_remaining_strain_lower_bound(self) -> int:
+        # Each free position needs a distinct doctor, so the cheapest available doctors of each day are taken.
+        # Strain for the number of duties grows as doctors take duties, which is bounded in two ways:
+        # - with the current number of duties of each doctor, for the day they would take,
+        # - for all the free positions at once, with the cheapest following numbers of duties of all doctors.
+        # Strain for new weekends doesn't depend on the day either, so it's bounded for all the free positions too.
+        availability = self._get_availability()
+        evaluator = self._get_strain_evaluator()
+
+        lower_bound = 0
+        lower_bound_with_duties_count = 0
+        free_positions_count = 0
+        for row in self._get_rows_to_set():
+            free_positions = self.schedule[row.day.number].free_positions()
+            doctors = availability.get_doctors(row.mask_for_positions(*free_positions))
+            strain_lower_bounds = self._get_strain_lower_bounds(row.day, doctors)
+
+            strains = sorted(strain_lower_bounds[doctor] for doctor in doctors)
+            strains_with_duties_count = sorted(
+                strain_lower_bounds[doctor]
+                + self._get_duties_count_strain(doctor, availability.get_duties_count(doctor))
+                for doctor in doctors
+            )
+
+            lower_bound += sum(strains[: len(free_positions)])
+            lower_bound_with_duties_count += sum(strains_with_duties_count[: len(free_positions)])
+            free_positions_count += len(free_positions)
+
+        duties_count_strains = (
+            self._get_duties_count_strain(doctor, duties_count)
+            for doctor in self.doctors
+            for duties_count in range(availability.get_duties_count(doctor), doctor.preferences.maximum_accepted_duties)
+        )
+        lower_bound += sum(heapq.nsmallest(free_positions_count, duties_count_strains))
+
+        new_weekends_strain = evaluator.get_new_weekends_strain_lower_bound(self.schedule, self.doctors)
+        return max(lower_bound, lower_bound_with_duties_count) + new_weekends_strain
+
+    def _get_strain_lower_bounds(self, day: Day, doctors: list[Doctor]) -> dict[Doctor, int]:
+        # Bounds of a doctor depend only on their own duties up to a few days apart, and on whether the day
+        # two days before is filled, so they are reused while those don't change.
+        availability = self._get_availability()
+        occupancy_masks = [
+            availability.get_occupancy_mask(day_number)
+            for day_number in range(day.number - 4, day.number + 5)
+            if 1 <= day_number <= len(self.schedule)
+        ]
+        is_filled_two_days_before = day.number > 2 and self.schedule[day.number - 2].is_filled
+
+        keys = {}
+        for doctor in doctors:
+            doctor_mask = availability.get_mask([doctor])
+            neighbourhood = tuple(bool(mask & doctor_mask) for mask in occupancy_masks)
+            keys[doctor] = (day.number, doctor, is_filled_two_days_before, neighbourhood)
+
+        missing_doctors = [doctor for doctor, key in keys.items() if key not in self._strain_lower_bounds]
+        if missing_doctors:
+            if len(self._strain_lower_bounds) + len(missing_doctors) > self.strain_lower_bounds_cache_size:
+                self._strain_lower_bounds.clear()
+
+            evaluator = self._get_strain_evaluator()
+            strain_lower_bounds = evaluator.get_strain_lower_bounds(
+                day, self.schedule, missing_doctors, with_duties_count=False
+            )
+            for doctor, strain_lower_bound in strain_lower_bounds.items():
+                self._strain_lower_bounds[keys[doctor]] = strain_lower_bound
+
+        return {doctor: self._strain_lower_bounds[key] for doctor, key in keys.items()}
+
+    def _get_duties_count_strain(self, doctor: Doctor, duties_count: int) -> int:
+        key = (doctor, duties_count)
+        if key not in self._duties_count_strains:
+            self._duties_count_strains[key] = self._get_strain_evaluator().get_duties_count_strain(doctor, duties_count)
+
+        return self._duties_count_strains[key]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import count
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from algorithm.enums import EvictionPolicy, FrontierPolicy
+
+if TYPE_CHECKING:
+    from algorithm.duty_setter import Node
+
+
+class BaseNodeScorer(ABC):
+    # Nodes with lower scores are removed from the frontier first.
+
+    @abstractmethod
+    def __call__(self, node: Node) -> Any:
+        pass
+
+
+class DaysSetScorer(BaseNodeScorer):
+    def __call__(self, node: Node) -> tuple[int, int]:
+        return -node.days_set, node.total_strain
+
+
+class StrainEstimateScorer(BaseNodeScorer):
+    def __init__(self, days_to_set: int, strain_per_day: int) -> None:
+        self.days_to_set = days_to_set
+        self.strain_per_day = strain_per_day
+
+    def __call__(self, node: Node) -> tuple[int, int]:
+        remaining_strain_estimate = (self.days_to_set - node.days_set) * self.strain_per_day
+        return node.total_strain + remaining_strain_estimate, -node.days_set
+
+
+class BaseFrontier(ABC):
+    @abstractmethod
+    def push(self, nodes: list[Node]) -> None:
+        pass
+
+    @abstractmethod
+    def pop(self) -> Node:
+        pass
+
+    @abstractmethod
+    def remove(self, nodes: Iterable[Node]) -> None:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Node]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class LifoFrontier(BaseFrontier):
+    def __init__(self) -> None:
+        self._nodes = deque()
+
+    def push(self, nodes: list[Node]) -> None:
+        # Only the best node is explored right away, the others are kept as a fallback.
+        if nodes:
+            first_node, *other_nodes = nodes
+            self._nodes.append(first_node)
+            self._nodes.extendleft(other_nodes)
+
+    def pop(self) -> Node:
+        return self._nodes.pop()
+
+    def remove(self, nodes: Iterable[Node]) -> None:
+        node_ids = {id(node) for node in nodes}
+        self._nodes = deque(node for node in self._nodes if id(node) not in node_ids)
+
+    def __iter__(self) -> Iterator[Node]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+class PriorityFrontier(BaseFrontier):
+    def __init__(self, scorer: BaseNodeScorer) -> None:
+        self.scorer = scorer
+
+        self._heap = []
+        self._counter = count()  # Keeps insertion order among nodes with equal scores
+
+    def push(self, nodes: list[Node]) -> None:
+        for node in nodes:
+            heapq.heappush(self._heap, (self.scorer(node), next(self._counter), node))
+
+    def pop(self) -> Node:
+        *_, node = heapq.heappop(self._heap)
+        return node
+
+    def remove(self, nodes: Iterable[Node]) -> None:
+        node_ids = {id(node) for node in nodes}
+        self._heap = [item for item in self._heap if id(item[-1]) not in node_ids]
+        heapq.heapify(self._heap)
+
+    def __iter__(self) -> Iterator[Node]:
+        return (node for *_, node in sorted(self._heap))
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class BoundedFrontier(BaseFrontier):
+    # Keeps at most max_size nodes of another frontier, so that memory taken by nodes and their parents is bounded.
+    # Once there are more, nodes with the highest scores are evicted. Finding them goes through all nodes,
+    # so a share of max_size more is evicted at once, instead of a few nodes on every push.
+
+    eviction_share = 0.1
+
+    def __init__(self, frontier: BaseFrontier, max_size: int, scorer: BaseNodeScorer) -> None:
+        self.frontier = frontier
+        self.max_size = max_size
+        self.scorer = scorer
+
+        self.evicted_nodes = 0
+
+    def push(self, nodes: list[Node]) -> None:
+        self.frontier.push(nodes)
+
+        if len(self.frontier) > self.max_size:
+            eviction_margin = int(self.max_size * self.eviction_share)
+            evicted_count = min(len(self.frontier), len(self.frontier) - self.max_size + eviction_margin)
+            self.frontier.remove(heapq.nlargest(evicted_count, self.frontier, key=self.scorer))
+            self.evicted_nodes += evicted_count
+
+    def pop(self) -> Node:
+        return self.frontier.pop()
+
+    def remove(self, nodes: Iterable[Node]) -> None:
+        self.frontier.remove(nodes)
+
+    def __iter__(self) -> Iterator[Node]:
+        return iter(self.frontier)
+
+    def __len__(self) -> int:
+        return len(self.frontier)
+
+
+def get_frontier(
+    policy: FrontierPolicy,
+    days_to_set: int,
+    strain_per_day: int,
+    max_size: int | None = None,
+    eviction_policy: EvictionPolicy = EvictionPolicy.SHALLOWEST,
+) -> BaseFrontier:
+    match policy:
+        case FrontierPolicy.LIFO:
+            frontier = LifoFrontier()
+        case FrontierPolicy.DAYS_SET:
+            frontier = PriorityFrontier(DaysSetScorer())
+        case FrontierPolicy.STRAIN_ESTIMATE:
+            frontier = PriorityFrontier(StrainEstimateScorer(days_to_set, strain_per_day))
+        case _:
+            raise ValueError(f'Unsupported frontier policy: {policy}')
+
+    if max_size is None:
+        return frontier
+
+    return BoundedFrontier(frontier, max_size, get_eviction_scorer(eviction_policy, days_to_set, strain_per_day))
+
+
+def get_eviction_scorer(policy: EvictionPolicy, days_to_set: int, strain_per_day: int) -> BaseNodeScorer:
+    # The worst nodes have the highest scores: the fewest days set, or the highest estimated total strain.
+    match policy:
+        case EvictionPolicy.SHALLOWEST:
+            return DaysSetScorer()
+        case EvictionPolicy.HIGHEST_STRAIN:
+            return StrainEstimateScorer(days_to_set, strain_per_day)
+        case _:
+            raise ValueError(f'Unsupported eviction policy: {policy}')
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+from algorithm.duty_setter import Algorithm
+from algorithm.enums import StopReason, Weekday
+from algorithm.strain import DutyStrainEvaluator
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import Duty, DutySchedule
+
+
+class WindowRepair(Algorithm):
+    # Only a few days are set, so the search doesn't need as many steps as for the whole month.
+    max_steps = 200
+
+
+class LargeNeighbourhoodSearch:
+    # Improves a schedule by repeatedly clearing a window of days and setting its duties again with the tree search.
+    # A repaired window is kept only if more duties are set or the total strain is lower.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        iterations: int = 100,
+        window_days: int = 7,
+        seed: int | None = None,
+        time_limit_ms: int | None = None,
+    ) -> None:
+        self.doctors = doctors
+        self.schedule = schedule
+        self.random = random.Random(seed)
+
+        self.iterations = iterations
+        self.window_days = window_days
+
+        self.time_limit_ms = time_limit_ms
+        self.deadline = None
+        self.stop_reason = None
+
+        self.cost = None
+
+        self.strain_evaluator = None
+
+    def set_duties(self) -> None:
+        # The initial schedule is found within the first half of the time limit, the rest is spent on repairs.
+        self._start_clock()
+        time_limit_ms = self.time_limit_ms // 2 if self.time_limit_ms is not None else None
+
+        algorithm = Algorithm(self.doctors, self.schedule, seed=self._get_seed(), time_limit_ms=time_limit_ms)
+        algorithm.set_duties()
+
+        self.improve_duties()
+
+    def improve_duties(self) -> None:
+        self._start_clock()
+        self.cost = self.get_cost()
+
+        for _ in range(self.iterations):
+            if self._is_deadline_reached():
+                self.stop_reason = StopReason.DEADLINE
+                break
+
+            self._repair_window(self._get_window())
+        else:
+            self.stop_reason = StopReason.STEP_LIMIT
+
+        if self.schedule.is_filled:
+            self.stop_reason = StopReason.COMPLETED
+
+    def get_cost(self) -> tuple[int, int]:
+        set_duties_count = sum(1 for duty in self.schedule.cells() if duty.is_set)
+        strain_evaluator = self._get_strain_evaluator()
+        total_strain = sum(strain_evaluator.get_doctor_strain(doctor, self.schedule) for doctor in self.doctors)
+
+        return -set_duties_count, total_strain
+
+    def _start_clock(self) -> None:
+        if self.time_limit_ms is not None and self.deadline is None:
+            self.deadline = time.monotonic() + self.time_limit_ms / 1000
+
+    def _is_deadline_reached(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _get_strain_evaluator(self) -> DutyStrainEvaluator:
+        if self.strain_evaluator is None:
+            self.strain_evaluator = DutyStrainEvaluator(
+                self.schedule.year, self.schedule.month, self.schedule.positions, self.doctors
+            )
+
+        return self.strain_evaluator
+
+    def _get_seed(self) -> int:
+        return self.random.getrandbits(32)
+
+    def _get_window(self) -> list[int]:
+        # Empty rows are repaired first, along with the days around them, which may block them.
+        not_filled_days = [row.day.number for row in self.schedule if not row.is_filled]
+        if not_filled_days:
+            day_number = self.random.choice(not_filled_days)
+            first_day_number = max(1, day_number - self.window_days // 2)
+            return list(range(first_day_number, min(first_day_number + self.window_days, len(self.schedule) + 1)))
+
+        week = self.random.choice(sorted({row.day.week for row in self.schedule}))
+        window = [row.day.number for row in self.schedule if row.day.week == week]
+
+        # Weekends carry most of the strain, so they are worth repairing on their own.
+        weekend = [day_number for day_number in window if self.schedule[day_number].day.weekday in Weekday.weekend()]
+        if weekend and self.random.random() < 0.5:
+            return weekend
+
+        return window
+
+    def _repair_window(self, window: list[int]) -> bool:
+        previous_assignments = [(duty, duty.doctor) for duty in self.schedule.cells()]
+
+        for duty in self._get_window_duties(window):
+            duty.update(None)
+
+        repair = WindowRepair(self.doctors, self.schedule, seed=self._get_seed())
+        repair.set_duties()
+
+        cost = self.get_cost()
+        if cost < self.cost:
+            self.cost = cost
+            return True
+
+        for duty, doctor in previous_assignments:
+            duty.update(doctor)
+
+        return False
+
+    def _get_window_duties(self, window: list[int]) -> list[Duty]:
+        return [duty for day_number in window for duty in self.schedule[day_number] if not duty.is_fixed]
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import TYPE_CHECKING
+
+from algorithm.availability import DoctorAvailabilityTracker
+from algorithm.enums import StopReason
+from algorithm.strain import DutyStrainEvaluator
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import Duty, DutySchedule
+
+    # Duties with doctors to put on them
+    Move = list[tuple[Duty, Doctor]]
+
+
+class HillClimbing:
+    # Improves a filled schedule by moving duties to other doctors and swapping duties between doctors.
+    # Only moves which lower the total strain are accepted, or keep it and spread it more evenly (with the same total,
+    # the sum of squared doctors' strains is the lower, the closer strains are to their mean). Strain of a doctor
+    # depends only on their own duties, so each move is scored by re-evaluating only the doctors it concerns.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        max_iterations: int = 2_000,
+        time_limit_ms: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.doctors = doctors
+        self.schedule = schedule
+        self.random = random.Random(seed)
+
+        self.max_iterations = max_iterations
+        self.time_limit_ms = time_limit_ms
+        self.deadline = None
+        self.iterations = 0
+
+        self.strain_evaluator = None
+        self.availability = None
+
+        self.strains: dict[Doctor, int] = {}
+        self.strains_sum = 0
+        self.squared_strains_sum = 0
+
+    def improve_duties(self) -> None:
+        self._start_clock()
+        self._initialize()
+
+        improved = True
+        while improved:
+            improved = False
+
+            for move in self._get_moves():
+                if self._is_budget_exhausted():
+                    return
+
+                self.iterations += 1
+                if self._try_move(move):
+                    improved = True
+
+    def get_cost(self) -> tuple[int, int]:
+        return self.strains_sum, self.squared_strains_sum
+
+    def _initialize(self) -> None:
+        self.strain_evaluator = DutyStrainEvaluator(
+            self.schedule.year, self.schedule.month, self.schedule.positions, self.doctors
+        )
+        self.availability = DoctorAvailabilityTracker(self.doctors, self.schedule)
+        self._evaluate_strains()
+
+    def _start_clock(self) -> None:
+        if self.time_limit_ms is not None and self.deadline is None:
+            self.deadline = time.monotonic() + self.time_limit_ms / 1000
+
+    def _is_budget_exhausted(self) -> bool:
+        if self.iterations >= self.max_iterations:
+            return True
+
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _get_movable_duties(self) -> list[Duty]:
+        return [duty for duty in self.schedule.cells() if duty.is_set and not duty.is_fixed]
+
+    def _get_moves(self) -> list[Move]:
+        duties = self._get_movable_duties()
+
+        moves = [[(duty, doctor)] for duty in duties for doctor in self.doctors if doctor is not duty.doctor]
+        moves += [
+            [(duty, other_duty.doctor), (other_duty, duty.doctor)]
+            for index, duty in enumerate(duties)
+            for other_duty in duties[index + 1 :]
+            if duty.doctor is not other_duty.doctor
+        ]
+        self.random.shuffle(moves)
+
+        return moves
+
+    def _try_move(self, move: Move) -> bool:
+        previous_assignments = [(duty, duty.doctor) for duty, _ in move]
+
+        self._unassign(move)
+        if not self._assign(move):
+            self._assign(previous_assignments)
+            return False
+
+        cost = self.get_cost()
+        previous_strains = {doctor: self.strains[doctor] for _, doctor in previous_assignments + move}
+        for doctor in previous_strains:
+            self._update_strain(doctor, self.strain_evaluator.get_doctor_strain(doctor, self.schedule))
+
+        if self._is_accepted(self.get_cost(), cost):
+            return True
+
+        self._unassign(move)
+        self._assign(previous_assignments)
+        for doctor, strain in previous_strains.items():
+            self._update_strain(doctor, strain)
+
+        return False
+
+    def _is_accepted(self, cost: tuple[int, int], previous_cost: tuple[int, int]) -> bool:
+        return cost < previous_cost
+
+    def _unassign(self, assignments: Move) -> None:
+        for duty, _ in assignments:
+            self.availability.unassign(duty)
+
+    def _assign(self, assignments: Move) -> bool:
+        # Assignments are checked one by one, so that they can't conflict with each other.
+        # If any of them is not possible, all duties are left empty.
+        for index, (duty, doctor) in enumerate(assignments):
+            available_mask = self.availability.get_available_mask(duty.day.number, duty.position)
+            if not available_mask & self.availability.get_mask([doctor]):
+                self._unassign(assignments[:index])
+                return False
+
+            self.availability.assign(duty, doctor)
+
+        return True
+
+    def _evaluate_strains(self) -> None:
+        for doctor in self.doctors:
+            self._update_strain(doctor, self.strain_evaluator.get_doctor_strain(doctor, self.schedule))
+
+    def _update_strain(self, doctor: Doctor, strain: int) -> None:
+        previous_strain = self.strains.get(doctor, 0)
+        self.strains[doctor] = strain
+        self.strains_sum += strain - previous_strain
+        self.squared_strains_sum += strain**2 - previous_strain**2
+
+
+class SimulatedAnnealing(HillClimbing):
+    # Tries random moves, accepting worse ones with a probability which decreases as the temperature cools down,
+    # so that the search can leave local optima. Moves keeping the total strain are always accepted. The best schedule
+    # found is kept, so it's never worse than the initial one. Temperature is expressed in points of total strain.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        max_iterations: int = 5_000,
+        initial_temperature: float = 50,
+        final_temperature: float = 1,
+        time_limit_ms: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(doctors, schedule, max_iterations, time_limit_ms, seed)
+
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+
+        self.best_cost = None
+        self.best_assignments: Move = []
+
+        self.stop_reason = None
+
+    def set_duties(self) -> None:
+        # Avoid circular imports
+        from algorithm.duty_setter import Algorithm
+
+        # The initial schedule is found by the tree search within the first half of the time limit.
+        self._start_clock()
+        time_limit_ms = self.time_limit_ms // 2 if self.time_limit_ms is not None else None
+
+        algorithm = Algorithm(
+            self.doctors, self.schedule, seed=self.random.getrandbits(32), time_limit_ms=time_limit_ms
+        )
+        algorithm.set_duties()
+
+        self.improve_duties()
+        self.stop_reason = StopReason.COMPLETED if self.schedule.is_filled else algorithm.stop_reason
+
+    def improve_duties(self) -> None:
+        self._start_clock()
+        self._initialize()
+
+        duties = self._get_movable_duties()
+        self._save_best(duties)
+
+        # Only moves which keep all the duties set are tried, so movable duties don't change.
+        while duties and not self._is_budget_exhausted():
+            self.iterations += 1
+            if self._try_move(self._get_random_move(duties)) and self.get_cost() < self.best_cost:
+                self._save_best(duties)
+
+        self._restore_best()
+
+    def get_temperature(self) -> float:
+        # Geometric cooling from the initial to the final temperature over all iterations
+        progress = self.iterations / self.max_iterations
+        return self.initial_temperature * (self.final_temperature / self.initial_temperature) ** progress
+
+    def _get_random_move(self, duties: list[Duty]) -> Move:
+        duty = self.random.choice(duties)
+        if self.random.random() < 0.5:
+            return [(duty, self.random.choice(self.doctors))]
+
+        other_duty = self.random.choice(duties)
+        if other_duty.doctor is duty.doctor:
+            return [(duty, self.random.choice(self.doctors))]
+
+        return [(duty, other_duty.doctor), (other_duty, duty.doctor)]
+
+    def _is_accepted(self, cost: tuple[int, int], previous_cost: tuple[int, int]) -> bool:
+        delta = cost[0] - previous_cost[0]
+        if delta <= 0:
+            return True
+
+        return self.random.random() < math.exp(-delta / self.get_temperature())
+
+    def _save_best(self, duties: list[Duty]) -> None:
+        self.best_cost = self.get_cost()
+        self.best_assignments = [(duty, duty.doctor) for duty in duties]
+
+    def _restore_best(self) -> None:
+        self._unassign(self.best_assignments)
+        self._assign(self.best_assignments)
+        self._evaluate_strains()
@@ -31,6 +31,7 @@ def create_duty_setter(validated_data: dict[str, Any]) -> DutySetter:
     for duty_data in duties_data:
         day = duty_data.pop("day")
         position = duty_data.pop("position")
+        soft = duty_data.pop("soft")
 
         if duty_data["set_by_user"]:
             doctor = duty_data.pop("doctor")
@@ -39,6 +40,9 @@ def create_duty_setter(validated_data: dict[str, Any]) -> DutySetter:
         else:
             schedule[day, position].update(None, pk=duty_data["pk"])  # Preserve duty pk for response
 
+            if soft and (doctor := duty_setter.get_doctor(duty_data["doctor"])):
+                duty_setter.add_previous_duty(day, position, doctor)
+
     return duty_setter
 
 
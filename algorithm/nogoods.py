@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+
+    # Doctor on duty on a day
+    Assignment = tuple[int, Doctor]
+
+
+@dataclass(frozen=True)
+class Nogood:
+    # While all the assignments hold, the day can't be filled, whatever other duties are set.
+    day_number: int
+    assignments: frozenset[Assignment]
+
+
+class NogoodStore:
+    # Keeps recently learnt nogoods, evicting the oldest ones. Assignments are reported as they are set and unset,
+    # and each nogood counts how many of its assignments hold, so matching nogoods are found without scanning them.
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+
+        self._matched_counts: OrderedDict[Nogood, int] = OrderedDict()
+        self._nogoods_per_assignment: defaultdict[Assignment, set[Nogood]] = defaultdict(set)
+        self._matched_nogoods: set[Nogood] = set()
+        self._assignments: set[Assignment] = set()
+
+    def add(self, nogood: Nogood) -> bool:
+        if nogood in self._matched_counts:
+            return False
+
+        self._matched_counts[nogood] = sum(1 for assignment in nogood.assignments if assignment in self._assignments)
+        for assignment in nogood.assignments:
+            self._nogoods_per_assignment[assignment].add(nogood)
+
+        self._update_matched(nogood)
+
+        if len(self._matched_counts) > self.max_size:
+            self._remove(next(iter(self._matched_counts)))
+
+        return True
+
+    def assign(self, day_number: int, doctor: Doctor) -> None:
+        assignment = (day_number, doctor)
+        self._assignments.add(assignment)
+
+        for nogood in self._nogoods_per_assignment.get(assignment, ()):
+            self._matched_counts[nogood] += 1
+            self._update_matched(nogood)
+
+    def unassign(self, day_number: int, doctor: Doctor) -> None:
+        assignment = (day_number, doctor)
+        self._assignments.discard(assignment)
+
+        for nogood in self._nogoods_per_assignment.get(assignment, ()):
+            self._matched_counts[nogood] -= 1
+            self._update_matched(nogood)
+
+    def is_assigned(self, day_number: int, doctor: Doctor) -> bool:
+        return (day_number, doctor) in self._assignments
+
+    def get_matched(self) -> set[Nogood]:
+        # Nogoods all assignments of which hold
+        return self._matched_nogoods
+
+    def get_matched_with(self, day_number: int, doctors: Iterable[Doctor]) -> Iterator[Nogood]:
+        # Nogoods of other days which would hold after assigning the doctors on the day
+        new_matched_counts = defaultdict(int)
+        for doctor in doctors:
+            for nogood in self._nogoods_per_assignment.get((day_number, doctor), ()):
+                new_matched_counts[nogood] += 1
+
+        return (
+            nogood
+            for nogood, count in new_matched_counts.items()
+            if nogood.day_number != day_number and self._matched_counts[nogood] + count == len(nogood.assignments)
+        )
+
+    def _update_matched(self, nogood: Nogood) -> None:
+        if self._matched_counts[nogood] == len(nogood.assignments):
+            self._matched_nogoods.add(nogood)
+        else:
+            self._matched_nogoods.discard(nogood)
+
+    def _remove(self, nogood: Nogood) -> None:
+        del self._matched_counts[nogood]
+        self._matched_nogoods.discard(nogood)
+
+        for assignment in nogood.assignments:
+            nogoods = self._nogoods_per_assignment[assignment]
+            nogoods.discard(nogood)
+            if not nogoods:
+                del self._nogoods_per_assignment[assignment]
+
+    def __len__(self) -> int:
+        return len(self._matched_counts)
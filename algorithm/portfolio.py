@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from itertools import cycle
+from typing import TYPE_CHECKING
+
+from algorithm.duty_setter import Algorithm
+from algorithm.enums import EvictionPolicy, FrontierPolicy, StopReason
+from algorithm.workers import SearchOutcome, WorkerPool, run_algorithm
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import DutySchedule
+
+
+@dataclass(frozen=True)
+class SearchConfig:
+    seed: int
+    depth: int = 2
+    frontier_policy: FrontierPolicy = FrontierPolicy.LIFO
+    frontier_max_size: int | None = None
+    eviction_policy: EvictionPolicy = EvictionPolicy.SHALLOWEST
+
+
+def run_search(
+    doctors: list[Doctor], schedule: DutySchedule, config: SearchConfig, deadline: float | None = None
+) -> SearchOutcome:
+    return run_algorithm(
+        Algorithm,
+        deadline,
+        doctors,
+        schedule,
+        config.depth,
+        config.frontier_policy,
+        seed=config.seed,
+        frontier_max_size=config.frontier_max_size,
+        eviction_policy=config.eviction_policy,
+    )
+
+
+class PortfolioSearch:
+    # Runs independent searches in separate processes and keeps the best schedule found by any of them.
+
+    def __init__(
+        self,
+        doctors: list[Doctor],
+        schedule: DutySchedule,
+        configs: list[SearchConfig],
+        workers: int = 4,
+        time_limit_ms: int | None = None,
+    ) -> None:
+        self.doctors = doctors
+        self.schedule = schedule
+        self.configs = configs
+        self.workers = workers
+        self.time_limit_ms = time_limit_ms
+        self.stop_reason = None
+        self.peak_frontier_size = None  # The largest frontier of any of the searches
+        self.step_budget = None
+
+    @classmethod
+    def get_configs(
+        cls,
+        searches_count: int,
+        seed: int | None = None,
+        frontier_max_size: int | None = None,
+        eviction_policy: EvictionPolicy = EvictionPolicy.SHALLOWEST,
+    ) -> list[SearchConfig]:
+        # Each search gets its own seed and the frontier policies are taken in turns to diversify the portfolio.
+        seeds = random.Random(seed)
+        frontier_policies = cycle(FrontierPolicy)
+
+        return [
+            SearchConfig(
+                seed=seeds.getrandbits(32),
+                frontier_policy=next(frontier_policies),
+                frontier_max_size=frontier_max_size,
+                eviction_policy=eviction_policy,
+            )
+            for _ in range(searches_count)
+        ]
+
+    def set_duties(self) -> None:
+        outcomes = self._run_searches()
+        if not outcomes:
+            if self.time_limit_ms is not None:
+                # No search sent back its schedule by the deadline
+                self.stop_reason = StopReason.DEADLINE
+            return
+
+        best_outcome = min(outcomes, key=lambda outcome: outcome.rank)
+        best_outcome.apply(self.doctors, self.schedule)
+        self.stop_reason = best_outcome.stop_reason
+        self.peak_frontier_size = max(outcome.peak_frontier_size for outcome in outcomes)
+        self.step_budget = best_outcome.step_budget
+
+    def _run_searches(self) -> list[SearchOutcome]:
+        pool = WorkerPool(self.workers, self.time_limit_ms)
+        return pool.run(run_search, [(self.doctors, self.schedule, config) for config in self.configs])
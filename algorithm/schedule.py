@@ -168,6 +168,11 @@ class Duty(Cell):
     def is_set(self) -> bool:
         return self.doctor is not None
 
+    @property
+    def is_fixed(self) -> bool:
+        # Duties set by the user or requested by the doctor can't be reassigned by the algorithm.
+        return self.is_set and (self.set_by_user or self.day.number in self.doctor.preferences.requested_days)
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "pk": self.pk,
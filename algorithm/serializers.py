@@ -1,6 +1,7 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing_extensions import Self
 
+from algorithm.enums import Engine, EvictionPolicy, FrontierPolicy
 from algorithm.utils import get_max_number_of_duties_for_month, get_number_of_days_in_month, recursive_getattr
 
 
@@ -11,6 +12,17 @@ class DutySerializer(BaseModel):
     doctor: int | None
     strain_points: int
     set_by_user: bool
+    soft: bool = False  # Duty of a previous schedule, kept if it's still valid
+
+    @model_validator(mode='after')
+    def validate_soft(self) -> Self:
+        if self.soft and (self.doctor is None or self.set_by_user):
+            raise ValueError(
+                f'Invalid soft duty on day {self.day}, position {self.position}: '
+                f'it needs a doctor and can\'t be set by the user.'
+            )
+
+        return self
 
 
 class PreferencesSerializer(BaseModel):
@@ -38,12 +50,33 @@ class DoctorSerializer(BaseModel):
     next_month_duties: list[int]
 
 
+class SettingsSerializer(BaseModel):
+    # Settings which are not provided fall back to algorithm defaults.
+    engine: Engine | None = None
+    beam_width: int | None = Field(default=None, gt=0)
+    portfolio_workers: int | None = Field(default=None, gt=0)
+    decomposition_workers: int | None = Field(default=None, gt=0)
+    time_limit_ms: int | None = Field(default=None, gt=0)
+    lns_iterations: int | None = Field(default=None, gt=0)
+    lns_window_days: int | None = Field(default=None, gt=0)
+    annealing_iterations: int | None = Field(default=None, gt=0)
+    annealing_initial_temperature: float | None = Field(default=None, gt=0)
+    annealing_final_temperature: float | None = Field(default=None, gt=0)
+    polish: bool | None = None
+    polish_iterations: int | None = Field(default=None, gt=0)
+    polish_time_limit_ms: int | None = Field(default=None, gt=0)
+    frontier_max_size: int | None = Field(default=None, gt=0)
+    frontier_eviction_policy: EvictionPolicy | None = None
+    frontier_policy: FrontierPolicy | None = None
+
+
 class InputSerializer(BaseModel):
     year: int
     month: int
     doctors_per_duty: int
     doctors: list[DoctorSerializer]
     duties: list[DutySerializer]
+    settings: SettingsSerializer = Field(default_factory=SettingsSerializer)
 
     @field_validator('month', mode='after')
     @classmethod
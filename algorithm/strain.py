@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import heapq
 import math
 from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
 from datetime import date, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from algorithm.enums import StrainModifier, Weekday
 from algorithm.utils import get_number_of_days_in_month
@@ -39,8 +41,32 @@ class BaseStrainModifier(ABC):
     def get_modifier(self) -> int:
         return self.modifier
 
+    def get_lower_bound(self) -> int:
+        # The lowest value the modifier can have, whatever duties are set in addition to the current ones.
+        return min(0, self.modifier)
 
-class JoinFridayWithSundayModifier(BaseStrainModifier):
+
+class NonDecreasingModifierMixin:
+    # Setting more duties can't lower the value, so the current one is the lower bound.
+
+    def get_lower_bound(self) -> int:
+        return self.get()
+
+
+class SundayModifierMixin:
+    def get_lower_bound(self) -> int:
+        # Once Friday is filled, it's known whether the doctor is on duty on it.
+        if (
+            self.day.weekday == Weekday.SUNDAY
+            and self.day.number > 2
+            and self.duty_schedule[self.day.number - 2].is_filled
+        ):
+            return self.get()
+
+        return super().get_lower_bound()
+
+
+class JoinFridayWithSundayModifier(SundayModifierMixin, BaseStrainModifier):
     modifier = StrainModifier.JOIN_FRIDAY_WITH_SUNDAY
 
     def should_apply(self) -> bool:
@@ -50,8 +76,14 @@ class JoinFridayWithSundayModifier(BaseStrainModifier):
             and self.duty_schedule[self.day.number - 2].has_duty(self.doctor)
         )
 
+    def get_lower_bound(self) -> int:
+        if self.day.weekday == Weekday.SUNDAY and self.day.number > 2:
+            return super().get_lower_bound()
+
+        return 0
+
 
-class DontStealSundaysModifier(BaseStrainModifier):
+class DontStealSundaysModifier(SundayModifierMixin, BaseStrainModifier):
     modifier = StrainModifier.DONT_STEAL_SUNDAYS
 
     def should_apply(self) -> bool:
@@ -62,7 +94,7 @@ class DontStealSundaysModifier(BaseStrainModifier):
         )
 
 
-class AvoidSaturdayAfterThursdayModifier(BaseStrainModifier):
+class AvoidSaturdayAfterThursdayModifier(NonDecreasingModifierMixin, BaseStrainModifier):
     modifier = StrainModifier.AVOID_SATURDAY_AFTER_THURSDAY
 
     def should_apply(self) -> bool:
@@ -73,7 +105,7 @@ class AvoidSaturdayAfterThursdayModifier(BaseStrainModifier):
         )
 
 
-class IsThursdayOrdinaryModifier(BaseStrainModifier):
+class IsThursdayOrdinaryModifier(NonDecreasingModifierMixin, BaseStrainModifier):
     modifier = StrainModifier.THURSDAY_IS_ORDINARY
 
     def should_apply(self) -> bool:
@@ -123,8 +155,19 @@ class RemainingDutiesCountModifier(AveragesDependentMixin, BaseStrainModifier):
         return True
 
     def get_modifier(self) -> int:
-        max_duties_modifier = self._get_max_duties_modifier(self.doctor)
         duties_count = sum(1 for _ in self.duty_schedule.duties_for_doctor(self.doctor))
+        return self.get_modifier_for_duties_count(duties_count)
+
+    def get_lower_bound(self) -> int:
+        # The modifier grows with the number of duties, apart from the bonus for the first duty.
+        duties_count = sum(1 for _ in self.duty_schedule.duties_for_doctor(self.doctor))
+        if duties_count:
+            return self.get_modifier_for_duties_count(duties_count)
+
+        return min(self.get_modifier_for_duties_count(0), self.get_modifier_for_duties_count(1))
+
+    def get_modifier_for_duties_count(self, duties_count: int) -> int:
+        max_duties_modifier = self._get_max_duties_modifier(self.doctor)
         if duties_count:
             remaining_duties_count = self.doctor.preferences.maximum_accepted_duties - duties_count
             return (remaining_duties_count - max_duties_modifier) * self.modifier
@@ -153,6 +196,9 @@ class BaseDutyIntervalModifier(BaseStrainModifier, ABC):
     def get_modifier(self):
         pass
 
+    def get_lower_bound(self) -> int:
+        return self.get()
+
     def get_strain_for_duty_interval(self, days_interval: int) -> int:
         match days_interval:
             case 1:
@@ -245,6 +291,68 @@ class DutyStrainEvaluator:
     def get_strains(self, day: Day, schedule: DutySchedule, available_doctors: list[Doctor]) -> dict[Doctor, int]:
         return {doctor: self._get_strain(day, doctor, schedule) for doctor in available_doctors}
 
+    def get_doctor_strain(self, doctor: Doctor, schedule: DutySchedule) -> int:
+        # Each duty is evaluated as if it was set last, so that the result doesn't depend on the order of setting.
+        strain = 0
+        for duty in list(schedule.duties_for_doctor(doctor)):
+            duty.update(None)
+            strain += self._get_strain(duty.day, doctor, schedule)
+            duty.update(doctor)
+
+        return strain
+
+    def get_strain_lower_bounds(
+        self, day: Day, schedule: DutySchedule, available_doctors: Iterable[Doctor], with_duties_count: bool = True
+    ) -> dict[Doctor, int]:
+        # Strain of a duty can't be lower, whatever duties are set before it. Without the duties count modifier,
+        # the bound is to be completed with a bound of get_duties_count_strain.
+        modifier_classes = [
+            modifier_class
+            for modifier_class in self.strain_modifiers
+            if with_duties_count or modifier_class is not RemainingDutiesCountModifier
+        ]
+
+        return {
+            doctor: day.strain_points
+            + sum(
+                self._init_modifier(modifier_class, day, doctor, schedule).get_lower_bound()
+                for modifier_class in modifier_classes
+            )
+            for doctor in available_doctors
+        }
+
+    def get_new_weekends_strain_lower_bound(self, schedule: DutySchedule, doctors: list[Doctor]) -> int:
+        # The first duty of a doctor on a weekend is strained more for each weekend they already have duties on.
+        # A doctor can have at most two duties on a weekend, on Friday and Sunday, so at least half of the free
+        # positions not covered by doctors already on duty on the weekend are taken by doctors new to it.
+        weekend_duties_counts = defaultdict(int)
+        free_positions_counts = defaultdict(int)
+        for row in schedule:
+            if row.day.weekday in Weekday.weekend():
+                free_positions_counts[row.day.week] += len(row.free_positions())
+                for doctor in row.doctors:
+                    weekend_duties_counts[doctor, row.day.week] += 1
+
+        new_doctors_count = 0
+        for week, free_positions_count in free_positions_counts.items():
+            free_duties_count = sum(
+                2 - count for (_, other_week), count in weekend_duties_counts.items() if other_week == week
+            )
+            new_doctors_count += max(0, math.ceil((free_positions_count - free_duties_count) / 2))
+
+        weekends_on_duty_counts = Counter(doctor for doctor, _ in weekend_duties_counts)
+        strains = (
+            NewWeekendModifier.modifier * (weekends_on_duty_counts[doctor] + new_weekends_count)
+            for doctor in doctors
+            for new_weekends_count in range(1, len(free_positions_counts) + 1)
+        )
+
+        return sum(heapq.nsmallest(new_doctors_count, strains))
+
+    def get_duties_count_strain(self, doctor: Doctor, duties_count: int) -> int:
+        modifier = self._init_modifier(RemainingDutiesCountModifier, None, doctor, None)
+        return modifier.get_modifier_for_duties_count(duties_count)
+
     def _get_strain(self, day: Day, doctor: Doctor, schedule: DutySchedule) -> int:
         strain = day.strain_points
 
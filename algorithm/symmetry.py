@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from algorithm.availability import DoctorAvailabilityTracker
+    from algorithm.doctor import Doctor
+
+    # Index of the equivalence class of a doctor and their place among its doctors without duties
+    Rank = tuple[int, int]
+
+
+def get_equivalence_key(doctor: Doctor) -> tuple:
+    # Doctors with equal keys accept the same duties and get the same strain for them.
+    preferences = doctor.preferences
+    return (
+        frozenset(preferences.exceptions),
+        frozenset(preferences.requested_days),
+        frozenset(preferences.preferred_weekdays),
+        frozenset(preferences.preferred_positions),
+        preferences.maximum_accepted_duties,
+        frozenset(doctor.last_month_duties),
+        frozenset(doctor.next_month_duties),
+    )
+
+
+def get_equivalence_classes(doctors: Iterable[Doctor]) -> list[list[Doctor]]:
+    # Only classes of more than one doctor, each in the order of doctors.
+    classes = defaultdict(list)
+    for doctor in doctors:
+        classes[get_equivalence_key(doctor)].append(doctor)
+
+    return [class_doctors for class_doctors in classes.values() if len(class_doctors) > 1]
+
+
+def get_ranks(equivalence_classes: list[list[Doctor]], availability: DoctorAvailabilityTracker) -> dict[Doctor, Rank]:
+    # Equivalent doctors without any duties are interchangeable: swapping them in any schedule gives a schedule
+    # with the same strain. They are ranked, so that only the first of them are tried.
+    ranks = {}
+    for class_index, class_doctors in enumerate(equivalence_classes):
+        doctors_without_duties = [doctor for doctor in class_doctors if not availability.get_duties_count(doctor)]
+        if len(doctors_without_duties) > 1:
+            for rank, doctor in enumerate(doctors_without_duties):
+                ranks[doctor] = (class_index, rank)
+
+    return ranks
+
+
+def is_canonical(doctors: Iterable[Doctor], ranks: dict[Doctor, Rank]) -> bool:
+    # Interchangeable doctors have to be the first ones of their class, in order of their ranks.
+    # Works for partial combinations too, as long as they are extended with further doctors only.
+    used_counts = defaultdict(int)
+    for doctor in doctors:
+        if doctor in ranks:
+            class_index, rank = ranks[doctor]
+            if rank != used_counts[class_index]:
+                return False
+
+            used_counts[class_index] += 1
+
+    return True
@@ -0,0 +1,171 @@
+import random
+from unittest import TestCase
+
+from algorithm.availability import DoctorAvailabilityTracker
+from algorithm.tests.utils import InitDutySetterTestMixin
+from algorithm.utils import DoctorAvailabilityHelper
+
+
+class DoctorAvailabilityTrackerTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 6
+
+    def setUp(self):
+        super().setUp()
+
+        self.doctor_1.preferences.preferred_positions = [1]
+        self.doctor_2.preferences.exceptions = [3, 4, 5]
+        self.doctor_3.preferences.maximum_accepted_duties = 2
+
+        self.schedule[7, 2].update(self.doctor_4, set_by_user=True)
+
+        self.tracker = DoctorAvailabilityTracker(self.doctors, self.schedule)
+
+    def assert_matches_rebuilt_availability(self):
+        expected_schedule = DoctorAvailabilityHelper(self.doctors, self.schedule).get_availability_schedule()
+
+        for expected_row, row in zip(expected_schedule, self.tracker, strict=True):
+            self.assertEqual(expected_row.is_set, row.is_set)
+            self.assertEqual(expected_row.average_doctors_per_free_position, row.average_doctors_per_free_position)
+            self.assertSetEqual(expected_row.doctors_for_all_positions(), row.doctors_for_all_positions())
+
+            for expected_cell in expected_row:
+                self.assertListEqual(expected_cell, row.doctors_for_position(expected_cell.position))
+
+        expected_row = min(
+            (row for row in expected_schedule if not row.is_set),
+            key=lambda row: row.average_doctors_per_free_position,
+            default=None,
+        )
+        day = self.tracker.get_day_with_least_available_doctors_per_free_position()
+        self.assertEqual(expected_row and expected_row.day.number, day and day.number)
+
+    def test_initial_availability(self):
+        self.assert_matches_rebuilt_availability()
+
+    def test_assigning_duties(self):
+        self.tracker.assign(self.schedule[5, 1], self.doctor_1)
+
+        self.assertEqual(self.doctor_1, self.schedule[5, 1].doctor)
+        self.assertListEqual([self.doctor_1], self.tracker[5].doctors_for_position(1))
+        self.assertNotIn(self.doctor_1, self.tracker[5].doctors_for_position(2))
+        self.assertNotIn(self.doctor_1, self.tracker[4].doctors_for_all_positions())
+        self.assertNotIn(self.doctor_1, self.tracker[6].doctors_for_all_positions())
+        self.assert_matches_rebuilt_availability()
+
+    def test_get_duties_count(self):
+        self.assertEqual(1, self.tracker.get_duties_count(self.doctor_4))
+        self.assertEqual(0, self.tracker.get_duties_count(self.doctor_1))
+
+        self.tracker.assign(self.schedule[5, 1], self.doctor_1)
+        self.tracker.assign(self.schedule[9, 1], self.doctor_1)
+        self.assertEqual(2, self.tracker.get_duties_count(self.doctor_1))
+
+        self.tracker.unassign(self.schedule[5, 1])
+        self.assertEqual(1, self.tracker.get_duties_count(self.doctor_1))
+
+    def test_unassigning_duties(self):
+        self.tracker.assign(self.schedule[5, 1], self.doctor_1)
+        self.tracker.unassign(self.schedule[5, 1])
+
+        self.assertFalse(self.schedule[5, 1].is_set)
+        self.assertIn(self.doctor_1, self.tracker[5].doctors_for_position(1))
+        self.assertIn(self.doctor_1, self.tracker[4].doctors_for_all_positions())
+        self.assert_matches_rebuilt_availability()
+
+    def test_doctor_reaching_maximum_accepted_duties(self):
+        self.tracker.assign(self.schedule[10, 1], self.doctor_3)
+        self.assertIn(self.doctor_3, self.tracker[20].doctors_for_all_positions())
+
+        self.tracker.assign(self.schedule[15, 2], self.doctor_3)
+        self.assertNotIn(self.doctor_3, self.tracker[20].doctors_for_all_positions())
+        self.assert_matches_rebuilt_availability()
+
+        self.tracker.unassign(self.schedule[10, 1])
+        self.assertIn(self.doctor_3, self.tracker[20].doctors_for_all_positions())
+        self.assert_matches_rebuilt_availability()
+
+    def test_random_assignments_and_reversals(self):
+        assigned_duties = []
+
+        for _ in range(60):
+            if assigned_duties and random.random() < 0.3:
+                self.tracker.unassign(assigned_duties.pop())
+            else:
+                day_number = random.randint(1, len(self.schedule))
+                free_positions = [
+                    position
+                    for position in self.schedule[day_number].free_positions()
+                    if self.tracker[day_number].doctors_for_position(position)
+                ]
+                if not free_positions:
+                    continue
+
+                position = random.choice(free_positions)
+                doctor = random.choice(self.tracker[day_number].doctors_for_position(position))
+                duty = self.schedule[day_number, position]
+                self.tracker.assign(duty, doctor)
+                assigned_duties.append(duty)
+
+            self.assert_matches_rebuilt_availability()
+
+    def test_day_with_least_available_doctors_per_free_position(self):
+        # Exceptions of doctor 2 leave days 3 to 5 with the fewest doctors, the earliest one comes first
+        self.assertEqual(3, self.tracker.get_day_with_least_available_doctors_per_free_position().number)
+
+        self.tracker.assign(self.schedule[3, 1], self.doctor_1)
+        self.tracker.assign(self.schedule[3, 2], self.doctor_3)
+        self.assertEqual(4, self.tracker.get_day_with_least_available_doctors_per_free_position().number)
+        self.assert_matches_rebuilt_availability()
+
+        self.tracker.unassign(self.schedule[3, 2])
+        self.assertEqual(3, self.tracker.get_day_with_least_available_doctors_per_free_position().number)
+        self.assert_matches_rebuilt_availability()
+
+    def test_get_hardness(self):
+        hardness = self.tracker.get_hardness()
+        self.assertGreater(hardness, 0)
+        self.assertLess(hardness, 1)
+
+        for doctor in [self.doctor_5, self.doctor_6]:
+            doctor.preferences.exceptions = list(range(1, 32))
+        self.assertGreater(DoctorAvailabilityTracker(self.doctors, self.schedule).get_hardness(), hardness)
+
+        # Doctors accept as many duties as there are free positions left
+        for doctor in [self.doctor_1, self.doctor_2, self.doctor_4, self.doctor_5, self.doctor_6]:
+            doctor.preferences.exceptions = []
+            doctor.preferences.maximum_accepted_duties = 12
+        self.assertEqual(1, DoctorAvailabilityTracker(self.doctors, self.schedule).get_hardness())
+
+        # Fewer than that, so the month can't be filled whatever the effort
+        self.doctor_1.preferences.maximum_accepted_duties = 11
+        self.assertLess(DoctorAvailabilityTracker(self.doctors, self.schedule).get_hardness(), 1)
+
+        for duty in self.schedule.cells():
+            duty.update(self.doctor_1)
+        self.assertEqual(0, DoctorAvailabilityTracker(self.doctors, self.schedule).get_hardness())
+
+    def test_restricted_days_and_duties(self):
+        tracker = DoctorAvailabilityTracker(
+            self.doctors, self.schedule, day_numbers=[3, 4, 5], maximum_duties={self.doctor_1: 1}
+        )
+
+        self.assertTrue(tracker[6].is_set)
+        self.assertFalse(tracker[5].is_set)
+        self.assertIn(tracker.get_day_with_least_available_doctors_per_free_position().number, [3, 4, 5])
+
+        tracker.assign(self.schedule[10, 1], self.doctor_1)
+        self.assertNotIn(self.doctor_1, tracker[4].doctors_for_all_positions())
+
+        tracker.unassign(self.schedule[10, 1])
+        self.assertIn(self.doctor_1, tracker[4].doctors_for_all_positions())
+
+    def test_masks(self):
+        mask = self.tracker.get_mask([self.doctor_2, self.doctor_5])
+
+        self.assertEqual(0b10010, mask)
+        self.assertListEqual([self.doctor_2, self.doctor_5], self.tracker.get_doctors(mask))
+        self.assertEqual(0, self.tracker.get_mask([]))
+        self.assertListEqual([], self.tracker.get_doctors(0))
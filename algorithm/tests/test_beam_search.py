@@ -0,0 +1,105 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from algorithm.beam_search import BeamSearch
+from algorithm.duty_setter import Algorithm, Node
+from algorithm.enums import StopReason
+from algorithm.tests.utils import InitDutySetterTestMixin, ScheduleValidator
+
+
+class BeamSearchTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 8
+
+    def test_setting_duties(self):
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+        self.doctor_2.preferences.exceptions = list(range(5, 12))
+        self.doctor_3.preferences.preferred_positions = [2]
+
+        beam_search = BeamSearch(self.doctors, self.schedule, width=3)
+        beam_search.set_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(StopReason.COMPLETED, beam_search.stop_reason)
+        self.assertEqual(self.doctor_1, self.schedule[10, 1].doctor)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_expansions_are_limited_by_width(self):
+        beam_search = BeamSearch(self.doctors, self.schedule, width=3)
+
+        with patch.object(
+            BeamSearch, '_generate_nodes', autospec=True, side_effect=Algorithm._generate_nodes
+        ) as mock_generate_nodes:
+            beam_search.set_duties()
+
+        # The root and then at most 3 nodes on each of the remaining 30 levels
+        self.assertLessEqual(mock_generate_nodes.call_count, 1 + 30 * 3)
+        self.assertEqual(mock_generate_nodes.call_count, beam_search.steps)
+        self.assertTrue(self.schedule.is_filled)
+
+    def test_beam_keeps_best_nodes(self):
+        empty_node = Node.get_empty()
+        node_1 = Node(1, self.doctors[:2], 100, empty_node, key=1)
+        node_2 = Node(1, self.doctors[2:4], 200, empty_node, key=2)
+
+        nodes_1 = [Node(2, self.doctors[:2], strain, node_1, key=strain) for strain in [100, 300, 400]]
+        nodes_2 = [Node(2, self.doctors[:2], strain, node_2, key=strain + 1) for strain in [50, 150]]
+        beam_search = BeamSearch(self.doctors, self.schedule, width=2)
+
+        with patch.object(beam_search, '_generate_nodes', side_effect=[iter(nodes_1), iter(nodes_2)]):
+            beam = beam_search._get_next_beam([node_1, node_2])
+
+        self.assertListEqual([nodes_1[0], nodes_2[0]], beam)
+
+    def test_only_best_nodes_of_each_parent_are_generated(self):
+        beam_search = BeamSearch(self.doctors, self.schedule, width=2)
+        generated_nodes = []
+
+        def generate_nodes(node):
+            for strain in [100, 200, 300, 400]:
+                generated_nodes.append(Node(1, self.doctors[:2], strain, node, key=strain))
+                yield generated_nodes[-1]
+
+        with patch.object(beam_search, '_generate_nodes', side_effect=generate_nodes):
+            beam = beam_search._get_next_beam([Node.get_empty()])
+
+        self.assertListEqual(generated_nodes[:2], beam)
+        self.assertEqual(2, len(generated_nodes))
+
+    def test_best_partial_schedule_is_kept_on_dead_end(self):
+        empty_node = Node.get_empty()
+        node_1 = Node(1, [self.doctor_1, self.doctor_2], 100, empty_node, key=1)
+        node_2 = Node(2, [self.doctor_3, self.doctor_4], 100, node_1, key=2)
+
+        def generate_nodes(node):
+            if node is empty_node:
+                return iter([node_1])
+
+            if node is node_1:
+                return iter([node_2])
+
+            return iter([])
+
+        beam_search = BeamSearch(self.doctors, self.schedule, width=2)
+
+        with (
+            patch('algorithm.beam_search.Node.get_empty', return_value=empty_node),
+            patch.object(beam_search, '_generate_nodes', side_effect=generate_nodes),
+        ):
+            beam_search.set_duties()
+
+        self.assertIs(node_2, beam_search.best_node)
+        self.assertEqual(StopReason.EXHAUSTED, beam_search.stop_reason)
+        self.assertEqual(self.doctor_1, self.schedule[1, 1].doctor)
+        self.assertEqual(self.doctor_4, self.schedule[2, 2].doctor)
+        self.assertFalse(self.schedule[3, 1].is_set)
+
+    def test_setting_duties_until_deadline(self):
+        beam_search = BeamSearch(self.doctors, self.schedule, width=3, time_limit_ms=0)
+        beam_search.set_duties()
+
+        self.assertEqual(StopReason.DEADLINE, beam_search.stop_reason)
+        self.assertEqual(0, beam_search.steps)
+        self.assertFalse(self.schedule.is_filled)
@@ -0,0 +1,127 @@
+import time
+from unittest import TestCase
+from unittest.mock import call, patch
+
+from algorithm.decomposition import WeeklyDecomposition, get_blocks, get_maximum_duties, run_block_search
+from algorithm.enums import StopReason
+from algorithm.schedule import DutySchedule
+from algorithm.tests.utils import InitDutySetterTestMixin, ScheduleValidator
+
+
+class WeeklyDecompositionTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 8
+
+    def test_get_blocks(self):
+        blocks = get_blocks(self.schedule)
+
+        self.assertListEqual(list(range(1, 6)), blocks[0])
+        self.assertListEqual(list(range(6, 13)), blocks[1])
+        self.assertListEqual(list(range(27, 32)), blocks[-1])
+        self.assertEqual(5, len(blocks))
+
+        # Weeks already filled are left out
+        for day_number in range(1, 6):
+            for duty in self.schedule[day_number]:
+                duty.update(self.doctor_1, set_by_user=True)
+
+        self.assertListEqual(list(range(6, 13)), get_blocks(self.schedule)[0])
+
+    def test_get_maximum_duties(self):
+        self.doctor_1.preferences.maximum_accepted_duties = 10
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+
+        maximum_duties = get_maximum_duties(self.doctors, self.schedule, list(range(6, 13)))
+
+        # 9 remaining duties for 31 days, rounded up for 7 days of the week, and the duty set already
+        self.assertEqual(4, maximum_duties[self.doctor_1])
+        self.assertLess(maximum_duties[self.doctor_2], self.doctor_2.preferences.maximum_accepted_duties)
+
+    def test_run_block_search(self):
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+        block = list(range(6, 13))
+        maximum_duties = get_maximum_duties(self.doctors, self.schedule, block)
+
+        outcome = run_block_search(self.doctors, self.schedule, block, seed=1)
+
+        self.assertEqual(StopReason.COMPLETED, outcome.stop_reason)
+        self.assertEqual(13, len(outcome.assignments))
+        self.assertTrue(all(day_number in block for day_number, _, _ in outcome.assignments))
+        self.assertNotIn((10, 1, self.doctor_1.pk), outcome.assignments)
+        self.assertFalse(any(duty.is_set for duty in self.schedule.cells() if duty.day.number not in block))
+
+        for doctor in self.doctors:
+            duties_count = sum(1 for _, _, doctor_pk in outcome.assignments if doctor_pk == doctor.pk)
+            self.assertLessEqual(duties_count, maximum_duties[doctor])
+
+    def test_conflicting_duties(self):
+        decomposition = WeeklyDecomposition(self.doctors, self.schedule, seed=1)
+
+        # Sunday and Monday of different weeks
+        self.schedule[5, 1].update(self.doctor_1)
+        self.schedule[6, 2].update(self.doctor_1)
+        self.schedule[12, 1].update(self.doctor_2)
+        self.schedule[13, 1].update(self.doctor_2, set_by_user=True)
+        # Days within a week are never conflicting, as they were set by the same search
+        self.schedule[20, 1].update(self.doctor_3)
+        self.schedule[21, 1].update(self.doctor_4)
+
+        self.assertListEqual([self.schedule[6, 2], self.schedule[12, 1]], decomposition._get_conflicting_duties())
+
+        self.doctor_5.preferences.maximum_accepted_duties = 2
+        for day_number in [1, 3, 8, 10]:
+            self.schedule[day_number, 2].update(self.doctor_5, set_by_user=day_number == 1)
+
+        conflicting_duties = decomposition._get_conflicting_duties()
+        self.assertEqual(4, len(conflicting_duties))
+        self.assertTrue(all(not duty.is_fixed for duty in conflicting_duties))
+        self.assertEqual(2, sum(1 for duty in conflicting_duties if duty.doctor == self.doctor_5))
+
+    def test_excess_duties_are_cleared_only_if_set_by_search(self):
+        decomposition = WeeklyDecomposition(self.doctors, self.schedule, seed=1)
+
+        # More duties set by the user than accepted, above the only duty set by the search
+        self.doctor_1.preferences.maximum_accepted_duties = 1
+        for day_number in [1, 3, 5]:
+            self.schedule[day_number, 1].update(self.doctor_1, set_by_user=day_number != 5)
+
+        self.assertListEqual([self.schedule[5, 1]], decomposition._get_conflicting_duties())
+
+    def test_weeks_are_set_in_two_passes(self):
+        decomposition = WeeklyDecomposition(self.doctors, self.schedule, workers=2, seed=1)
+
+        with patch.object(decomposition, '_run_block_searches', wraps=decomposition._run_block_searches) as mock:
+            decomposition.set_duties()
+
+        blocks = get_blocks(DutySchedule(self.year, self.month, self.duty_positions))
+        self.assertListEqual(
+            [call(blocks[::2], None), call(blocks[1::2], None)],
+            mock.call_args_list,
+        )
+
+        # Weeks of the second pass took duties around their boundaries into account
+        self.assertEqual(0, decomposition.cleared_duties_count)
+
+    def test_setting_duties(self):
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+
+        decomposition = WeeklyDecomposition(self.doctors, self.schedule, workers=2, seed=1)
+        decomposition.set_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(StopReason.COMPLETED, decomposition.stop_reason)
+        self.assertEqual(self.doctor_1, self.schedule[10, 1].doctor)
+        self.assertGreater(decomposition.step_budget, 0)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_setting_duties_until_deadline(self):
+        decomposition = WeeklyDecomposition(self.doctors, self.schedule, workers=2, time_limit_ms=1)
+
+        started_at = time.monotonic()
+        decomposition.set_duties()
+
+        self.assertEqual(StopReason.DEADLINE, decomposition.stop_reason)
+        self.assertFalse(self.schedule.is_filled)
+        self.assertLess(time.monotonic() - started_at, 10)
@@ -1,12 +1,22 @@
 import random
+import sys
+import time
 from contextlib import suppress
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
-from algorithm.duty_setter import Algorithm, DutySetter, Node
+from algorithm.beam_search import BeamSearch
+from algorithm.decomposition import WeeklyDecomposition
+from algorithm.duty_setter import Algorithm, AlgorithmSettings, DutySetter, Node
+from algorithm.enums import Engine, EvictionPolicy, FrontierPolicy, StopReason
+from algorithm.exact import ExactSearch
+from algorithm.frontier import BoundedFrontier, StrainEstimateScorer
+from algorithm.lns import LargeNeighbourhoodSearch
+from algorithm.local_search import SimulatedAnnealing
+from algorithm.nogoods import Nogood
+from algorithm.portfolio import PortfolioSearch
 from algorithm.schedule import DutySchedule
 from algorithm.tests.utils import ExpectedError, InitDutySetterTestMixin, ScheduleValidator, doctor_factory
-from algorithm.utils import DoctorAvailabilityHelper
 
 
 class DutySetterTests(TestCase):
@@ -77,6 +87,30 @@ class DutySetterTests(TestCase):
             result.errors,
         )
         self.assertIsInstance(result.duties, DutySchedule)
+        self.assertIsNone(result.stop_reason)
+
+    def test_get_result_stop_reason(self):
+        setter = DutySetter(2025, 1, 1, settings={"time_limit_ms": 1000})
+        setter.add_doctor(*doctor_factory(10))
+        for doctor in setter.doctors:
+            doctor.init_preferences(
+                year=2025,
+                month=1,
+                exceptions=[],
+                requested_days=[],
+                preferred_weekdays=list(range(7)),
+                preferred_positions=[1],
+                maximum_accepted_duties=10,
+            )
+
+        setter.set_duties()
+        result = setter.get_result()
+
+        self.assertTrue(result.were_all_duties_set)
+        self.assertEqual(StopReason.COMPLETED, result.stop_reason)
+        self.assertEqual(StopReason.COMPLETED, result.to_dict()["stop_reason"])
+        self.assertGreater(result.peak_frontier_size, 0)
+        self.assertGreater(result.step_budget, 0)
 
     @patch('algorithm.duty_setter.RequestedDutiesSetter')
     def test_assign_requested_duties(self, mock_requested_duties_setter):
@@ -91,6 +125,113 @@ class DutySetterTests(TestCase):
             [call('doctors', 'schedule'), call().set_duties()],
         )
 
+    def test_settings(self):
+        setter = DutySetter(2025, 1, 3)
+        self.assertEqual(AlgorithmSettings(), setter.settings)
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.BEAM, "beam_width": None})
+        self.assertEqual(Engine.BEAM, setter.settings.engine)
+        self.assertEqual(AlgorithmSettings.beam_width, setter.settings.beam_width)
+
+    def test_algorithm_selection(self):
+        setter = DutySetter(2025, 1, 3)
+        algorithm = setter._get_algorithm()
+        self.assertIs(Algorithm, type(algorithm))
+
+        self.assertEqual(FrontierPolicy.LIFO, algorithm.frontier_policy)
+
+        settings = {"frontier_max_size": 100, "frontier_eviction_policy": EvictionPolicy.HIGHEST_STRAIN}
+        setter = DutySetter(2025, 1, 3, settings=settings)
+        algorithm = setter._get_algorithm()
+        self.assertIsInstance(algorithm.frontier, BoundedFrontier)
+        self.assertEqual(100, algorithm.frontier.max_size)
+        self.assertIsInstance(algorithm.frontier.scorer, StrainEstimateScorer)
+
+        setter = DutySetter(2025, 1, 3, settings={"frontier_policy": FrontierPolicy.DAYS_SET})
+        algorithm = setter._get_algorithm()
+        self.assertEqual(FrontierPolicy.DAYS_SET, algorithm.frontier_policy)
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.BEAM, "beam_width": 4})
+        algorithm = setter._get_algorithm()
+        self.assertIsInstance(algorithm, BeamSearch)
+        self.assertEqual(4, algorithm.width)
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.PORTFOLIO, "portfolio_workers": 3})
+        algorithm = setter._get_algorithm()
+        self.assertIsInstance(algorithm, PortfolioSearch)
+        self.assertEqual(3, algorithm.workers)
+        self.assertEqual(3, len(algorithm.configs))
+        self.assertIsNone(algorithm.time_limit_ms)
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.PORTFOLIO, "frontier_max_size": 100})
+        algorithm = setter._get_algorithm()
+        self.assertTrue(all(config.frontier_max_size == 100 for config in algorithm.configs))
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.LNS, "lns_window_days": 5})
+        algorithm = setter._get_algorithm()
+        self.assertIsInstance(algorithm, LargeNeighbourhoodSearch)
+        self.assertEqual(5, algorithm.window_days)
+        self.assertEqual(AlgorithmSettings.lns_iterations, algorithm.iterations)
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.ANNEALING, "annealing_initial_temperature": 20})
+        algorithm = setter._get_algorithm()
+        self.assertIsInstance(algorithm, SimulatedAnnealing)
+        self.assertEqual(20, algorithm.initial_temperature)
+        self.assertEqual(AlgorithmSettings.annealing_iterations, algorithm.max_iterations)
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.EXACT, "time_limit_ms": 1000})
+        algorithm = setter._get_algorithm()
+        self.assertIsInstance(algorithm, ExactSearch)
+        self.assertEqual(1000, algorithm.time_limit_ms)
+
+        setter = DutySetter(2025, 1, 3, settings={"engine": Engine.WEEKS, "decomposition_workers": 2})
+        algorithm = setter._get_algorithm()
+        self.assertIsInstance(algorithm, WeeklyDecomposition)
+        self.assertEqual(2, algorithm.workers)
+
+    @patch('algorithm.duty_setter.HillClimbing')
+    @patch.object(DutySetter, '_get_algorithm')
+    @patch.object(DutySetter, 'check_if_duties_can_be_set', return_value=True)
+    def test_polish(self, mock_check_if_duties_can_be_set, mock_get_algorithm, mock_hill_climbing):
+        setter = DutySetter(2025, 1, 3)
+        setter.set_duties()
+        mock_hill_climbing.assert_not_called()
+
+        setter = DutySetter(2025, 1, 3, settings={"polish": True, "polish_iterations": 50})
+        setter.set_duties()
+        self.assertListEqual(
+            [call(setter.doctors, setter.schedule, max_iterations=50, time_limit_ms=None), call().improve_duties()],
+            mock_hill_climbing.mock_calls,
+        )
+
+    @patch('algorithm.duty_setter.HillClimbing')
+    @patch.object(DutySetter, '_get_algorithm')
+    @patch.object(DutySetter, 'check_if_duties_can_be_set', return_value=True)
+    def test_polish_time_limit(self, mock_check_if_duties_can_be_set, mock_get_algorithm, mock_hill_climbing):
+        # Setting duties takes 250 ms
+        clock = Mock()
+
+        def set_duties():
+            clock.return_value += 0.25
+
+        mock_get_algorithm.return_value.set_duties.side_effect = set_duties
+
+        for settings, expected_time_limit_ms in [
+            ({"polish_time_limit_ms": 500}, 500),
+            ({"polish_time_limit_ms": 500, "time_limit_ms": 1000}, 500),
+            # Polishing doesn't exceed the time left of the shared time limit
+            ({"polish_time_limit_ms": 1000, "time_limit_ms": 1000}, 750),
+            ({"time_limit_ms": 1000}, 750),
+        ]:
+            with self.subTest(settings=settings):
+                clock.return_value = 0
+                setter = DutySetter(2025, 1, 3, settings={"polish": True, **settings})
+
+                with patch('algorithm.duty_setter.time.monotonic', clock):
+                    setter.set_duties()
+
+                self.assertEqual(expected_time_limit_ms, mock_hill_climbing.call_args.kwargs['time_limit_ms'])
+
 
 class RequestedDutiesSetterTests(InitDutySetterTestMixin, TestCase):
     year = 2025
@@ -135,6 +276,165 @@ class RequestedDutiesSetterTests(InitDutySetterTestMixin, TestCase):
         self.assertEqual(3, doctor_2_duties[0].position)
 
 
+class PreviousDutiesSetterTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 1
+    doctors_count = 4
+
+    def setUp(self):
+        super().setUp()
+
+        # Doctors take turns, each of them every four days
+        for day_number in range(1, 32):
+            self.duty_setter.add_previous_duty(day_number, 1, self.doctors[(day_number - 1) % 4])
+
+    def assert_kept_previous_duties(self, day_numbers):
+        for duty in self.schedule.cells():
+            if duty.is_fixed:
+                continue
+
+            if duty.day.number in day_numbers:
+                self.assertEqual(self.duty_setter.previous_duties[duty.day.number, 1], duty.doctor)
+            else:
+                self.assertIsNone(duty.doctor)
+
+    def test_valid_previous_duties_are_kept(self):
+        self.assertTrue(self.duty_setter._assign_previous_duties())
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assert_kept_previous_duties(range(1, 32))
+
+    def test_days_around_changes_are_set_again(self):
+        self.doctor_1.preferences.exceptions = [5]
+        self.schedule[9, 1].update(self.doctor_2, set_by_user=True)
+        self.doctor_3.preferences.maximum_accepted_duties = 3
+        del self.duty_setter.previous_duties[20, 1]
+
+        self.duty_setter._assign_previous_duties()
+
+        # Doctor 2 can't be on duty on day 10 after the duty set by the user,
+        # and doctor 3 keeps only the duties on days 3, 7 and 11
+        changed_days = {5, 9, 10, 15, 19, 20, 23, 27, 31}
+        self.assert_kept_previous_duties(
+            {
+                day_number
+                for day_number in range(1, 32)
+                if not {day_number - 1, day_number, day_number + 1} & changed_days
+            }
+        )
+        self.assertEqual(self.doctor_2, self.schedule[9, 1].doctor)
+
+    def test_setting_duties_again(self):
+        self.doctor_1.preferences.exceptions = [13]
+
+        self.duty_setter.set_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertNotEqual(self.doctor_1, self.schedule[13, 1].doctor)
+        for day_number in set(range(1, 32)) - {12, 13, 14}:
+            self.assertEqual(self.duty_setter.previous_duties[day_number, 1], self.schedule[day_number, 1].doctor)
+
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties()
+
+    @patch.object(DutySetter, '_assign_duties', autospec=True)
+    def test_duties_are_set_from_scratch_if_previous_duties_block_them(self, mock_assign_duties):
+        self.doctor_1.preferences.exceptions = [13]
+        self.schedule[20, 1].update(self.doctor_2, set_by_user=True)
+
+        # Only the search from scratch sets any duties
+        def assign_duties(duty_setter):
+            if mock_assign_duties.call_count == 2:
+                Algorithm(duty_setter.doctors, duty_setter.schedule, seed=1).set_duties()
+
+        mock_assign_duties.side_effect = assign_duties
+
+        self.duty_setter.set_duties()
+
+        self.assertEqual(2, mock_assign_duties.call_count)
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(self.doctor_2, self.schedule[20, 1].doctor)
+
+    @patch.object(DutySetter, '_assign_duties')
+    def test_previous_duties_are_restored_if_duties_set_from_scratch_are_not_better(self, mock_assign_duties):
+        self.doctor_1.preferences.exceptions = [13]
+        self.schedule[20, 1].update(self.doctor_2, set_by_user=True)
+
+        self.duty_setter.set_duties()
+
+        # Search from scratch set fewer duties than were kept from the previous schedule
+        self.assertEqual(2, mock_assign_duties.call_count)
+        self.assertEqual(self.doctor_2, self.schedule[20, 1].doctor)
+        self.assert_kept_previous_duties(set(range(1, 32)) - {12, 13, 14, 19, 20, 21})
+
+    @patch('algorithm.duty_setter.HillClimbing')
+    @patch.object(Algorithm, 'set_duties', autospec=True)
+    def test_duties_set_from_scratch_get_time_left(self, mock_set_duties, mock_hill_climbing):
+        self.duty_setter.settings = AlgorithmSettings(time_limit_ms=1000, polish=True)
+        self.doctor_1.preferences.exceptions = [13]
+
+        time_limits_ms = []
+        mock_set_duties.side_effect = lambda algorithm: time_limits_ms.append(algorithm.time_limit_ms)
+
+        self.duty_setter.set_duties()
+
+        # The search with previous duties didn't fill the schedule, so another one was run
+        self.assertEqual(2, len(time_limits_ms))
+        self.assertLessEqual(time_limits_ms[1], time_limits_ms[0])
+        self.assertLessEqual(time_limits_ms[0], 1000)
+
+        # Only the schedule which is kept is polished
+        mock_hill_climbing.return_value.improve_duties.assert_called_once()
+
+    @patch.object(Algorithm, 'set_duties', autospec=True)
+    def test_previous_duties_which_cant_be_kept_dont_exceed_time_limit(self, mock_set_duties):
+        self.duty_setter.settings = AlgorithmSettings(time_limit_ms=200)
+        self.doctor_1.preferences.exceptions = [13]
+
+        # The search with previous duties runs until the deadline without filling the schedule
+        clock = Mock(return_value=0)
+
+        def set_duties(algorithm):
+            clock.return_value += algorithm.time_limit_ms / 1000
+
+        mock_set_duties.side_effect = set_duties
+
+        with patch('algorithm.duty_setter.time.monotonic', clock):
+            self.duty_setter.set_duties()
+
+        self.assertEqual(0.2, clock.return_value)
+        mock_set_duties.assert_called_once()
+        self.assertFalse(self.schedule.is_filled)
+
+
+class PreviousDutiesOnMorePositionsSetterTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 6
+
+    def setUp(self):
+        super().setUp()
+
+        # Pairs of doctors take turns, each of them every three days
+        for day_number in range(1, 32):
+            for position in (1, 2):
+                doctor = self.doctors[(day_number - 1) % 3 * 2 + position - 1]
+                self.duty_setter.add_previous_duty(day_number, position, doctor)
+
+    def test_all_positions_on_changed_days_are_set_again(self):
+        # Doctor on position 2 on day 5
+        self.doctor_4.preferences.exceptions = [5]
+
+        self.duty_setter._assign_previous_duties()
+
+        for duty in self.schedule.cells():
+            if duty.day.number in {4, 5, 6}:
+                self.assertIsNone(duty.doctor)
+            else:
+                self.assertEqual(self.duty_setter.previous_duties[duty.day.number, duty.position], duty.doctor)
+
+
 class NodeTests(InitDutySetterTestMixin, TestCase):
     year = 2025
     month = 1
@@ -177,6 +477,20 @@ class NodeTests(InitDutySetterTestMixin, TestCase):
         self.assertEqual(1, node_2.days_set)
         self.assertEqual(2, node_3.days_set)
 
+    def test_long_paths(self):
+        node = Node.get_empty()
+        for _ in range(sys.getrecursionlimit() + 1):
+            node = Node(1, self.get_random_doctors(), 10, node)
+
+        self.assertEqual(sys.getrecursionlimit() + 1, node.days_set)
+        self.assertEqual(10 * node.days_set, node.total_strain)
+
+    def test_compact(self):
+        node = Node(1, self.get_random_doctors(), 100, Node.get_empty())
+
+        self.assertFalse(hasattr(node, '__dict__'))
+        self.assertEqual(Node(1, node.doctors, 100, Node.get_empty()), node)
+
 
 class AlgorithmTests(InitDutySetterTestMixin, TestCase):
     year = 2025
@@ -198,7 +512,7 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
         self.algorithm._initialize_frontier()
 
         self.assertEqual(1, len(self.algorithm.frontier))
-        self.assertTrue(self.algorithm.frontier[0].is_empty)
+        self.assertTrue(list(self.algorithm.frontier)[0].is_empty)
 
     def test_is_best_node(self):
         empty_node = Node.get_empty()
@@ -235,10 +549,10 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
     def test_node_expansion(self):
         empty_node = Node.get_empty()
 
-        node_1 = Node(1, self.get_random_doctors(), 100, empty_node)
-        node_2 = Node(1, self.get_random_doctors(), 100, empty_node)
-        node_3 = Node(1, self.get_random_doctors(), 100, empty_node)
-        node_4 = Node(1, self.get_random_doctors(), 100, empty_node)
+        node_1 = Node(1, self.get_random_doctors(), 100, empty_node, key=1)
+        node_2 = Node(1, self.get_random_doctors(), 100, empty_node, key=2)
+        node_3 = Node(1, self.get_random_doctors(), 100, empty_node, key=3)
+        node_4 = Node(1, self.get_random_doctors(), 100, empty_node, key=4)
         round_1 = [node_1, node_2, node_3, node_4]
 
         with patch('algorithm.duty_setter.Algorithm._get_nodes', return_value=round_1):
@@ -247,9 +561,9 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
         self.assertListEqual([node_4, node_3, node_2, node_1], list(self.algorithm.frontier))
         self.assertEqual(node_1, self.algorithm._remove_node_from_frontier())
 
-        node_5 = Node(3, self.get_random_doctors(), 100, node_1)
-        node_6 = Node(3, self.get_random_doctors(), 100, node_1)
-        node_7 = Node(3, self.get_random_doctors(), 100, node_1)
+        node_5 = Node(3, self.get_random_doctors(), 100, node_1, key=5)
+        node_6 = Node(3, self.get_random_doctors(), 100, node_1, key=6)
+        node_7 = Node(3, self.get_random_doctors(), 100, node_1, key=7)
         round_2 = [node_5, node_6, node_7]
 
         with patch('algorithm.duty_setter.Algorithm._get_nodes', return_value=round_2):
@@ -259,14 +573,42 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
         self.assertListEqual([node_7, node_6, node_4, node_3, node_2, node_5], list(self.algorithm.frontier))
         self.assertEqual(node_5, self.algorithm._remove_node_from_frontier())
 
-    def test_construct_schedule(self):
+    def test_node_keys(self):
+        node_0 = Node.get_empty()
+        node_1 = self.algorithm._get_nodes(node_0)[0]
+        node_2 = self.algorithm._get_nodes(node_1)[0]
+
+        hasher = self.algorithm._get_hasher()
+        node_1_duties_key = hasher.get_key(node_1.day_number, node_1.doctors)
+        node_2_duties_key = hasher.get_key(node_2.day_number, node_2.doctors)
+
+        self.assertEqual(0, node_0.key)
+        self.assertEqual(node_1_duties_key, node_1.key)
+        self.assertEqual(node_2_duties_key ^ node_1_duties_key, node_2.key)
+
+    def test_expanding_drops_transpositions(self):
+        empty_node = Node.get_empty()
+        node_1 = Node(1, self.get_random_doctors(), 100, empty_node, key=1)
+        node_2 = Node(2, self.get_random_doctors(), 100, empty_node, key=2)
+        node_3 = Node(2, self.get_random_doctors(), 300, node_1, key=3)  # Same duties as node_4, but higher strain
+        node_4 = Node(1, self.get_random_doctors(), 100, node_2, key=3)
+
+        with patch.object(self.algorithm, '_get_nodes', side_effect=[[node_1, node_2], [node_4], [node_3]]):
+            self.algorithm._expand(empty_node)
+            self.algorithm._expand(node_2)
+            self.algorithm._expand(node_1)
+
+        self.assertListEqual([node_2, node_1, node_4], list(self.algorithm.frontier))
+
+    def test_moving_to_node(self):
         node_0 = Node.get_empty()
         node_1 = Node(1, [self.doctor_3, self.doctor_1, self.doctor_2], 100, node_0)
         node_2 = Node(2, [self.doctor_7, self.doctor_4, self.doctor_5], 200, node_1)
         node_3 = Node(3, [self.doctor_6, self.doctor_2, self.doctor_1], 150, node_2)
 
-        schedule = self.algorithm._construct_schedule(node_3)
+        schedule = self.algorithm._move_to_node(node_3)
 
+        self.assertIs(self.schedule, schedule)
         self.assertEqual(self.doctor_3, schedule[1, 1].doctor)
         self.assertEqual(self.doctor_1, schedule[1, 2].doctor)
         self.assertEqual(self.doctor_2, schedule[1, 3].doctor)
@@ -281,36 +623,106 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
             for position in range(1, 4):
                 self.assertFalse(schedule[day, position].is_set)
 
+    def test_moving_to_node_updates_strain_lower_bound(self):
+        algorithm = Algorithm(self.doctors, self.schedule, strain_upper_bound=100_000)
+        algorithm._initialize_frontier()
+
+        day_strain_lower_bounds = algorithm.day_strain_lower_bounds
+        self.assertEqual(31, len(day_strain_lower_bounds))
+        self.assertEqual(sum(day_strain_lower_bounds.values()), algorithm.remaining_strain_lower_bound)
+
+        node_0 = Node.get_empty()
+        node_1 = Node(1, [self.doctor_3, self.doctor_1, self.doctor_2], 100, node_0)
+        node_2 = Node(2, [self.doctor_7, self.doctor_4, self.doctor_5], 200, node_1)
+        node_3 = Node(4, [self.doctor_6, self.doctor_2, self.doctor_1], 150, node_1)
+
+        algorithm._move_to_node(node_2)
+        expected_bound = sum(day_strain_lower_bounds.values()) - day_strain_lower_bounds[1] - day_strain_lower_bounds[2]
+        self.assertEqual(expected_bound, algorithm.remaining_strain_lower_bound)
+
+        algorithm._move_to_node(node_3)
+        expected_bound = sum(day_strain_lower_bounds.values()) - day_strain_lower_bounds[1] - day_strain_lower_bounds[4]
+        self.assertEqual(expected_bound, algorithm.remaining_strain_lower_bound)
+
+        algorithm._move_to_node(node_0)
+        self.assertEqual(sum(day_strain_lower_bounds.values()), algorithm.remaining_strain_lower_bound)
+
+    def test_moving_to_node_reverts_only_differing_suffix(self):
+        node_0 = Node.get_empty()
+        node_1 = Node(1, [self.doctor_3, self.doctor_1, self.doctor_2], 100, node_0)
+        node_2 = Node(2, [self.doctor_7, self.doctor_4, self.doctor_5], 200, node_1)
+        node_3 = Node(4, [self.doctor_6, self.doctor_2, self.doctor_1], 150, node_1)
+
+        self.algorithm._move_to_node(node_2)
+
+        with patch.object(self.algorithm, '_apply_node', wraps=self.algorithm._apply_node) as mock_apply_node:
+            self.algorithm._move_to_node(node_3)
+
+        mock_apply_node.assert_called_once_with(node_3)
+        self.assertEqual(self.doctor_1, self.schedule[1, 2].doctor)
+        self.assertFalse(any(duty.is_set for duty in self.schedule[2]))
+        self.assertEqual(self.doctor_6, self.schedule[4, 1].doctor)
+
+        self.algorithm._move_to_node(node_0)
+
+        self.assertFalse(any(duty.is_set for duty in self.schedule.cells()))
+        self.assertListEqual([], self.algorithm.trail)
+
+    def test_moving_to_node_keeps_set_duties(self):
+        self.schedule[2, 2].update(self.doctor_4, set_by_user=True)
+
+        node_0 = Node.get_empty()
+        node_1 = Node(2, [self.doctor_7, self.doctor_4, self.doctor_5], 200, node_0)
+
+        self.algorithm._move_to_node(node_1)
+        self.algorithm._move_to_node(node_0)
+
+        self.assertEqual(self.doctor_4, self.schedule[2, 2].doctor)
+        self.assertFalse(self.schedule[2, 1].is_set)
+        self.assertFalse(self.schedule[2, 3].is_set)
+
     def test_day_with_least_available_doctors(self):
-        availability_schedule = DoctorAvailabilityHelper(self.doctors, self.schedule).get_availability_schedule()
+        availability = self.algorithm._get_availability()
 
-        day = self.algorithm._get_day_with_least_available_doctors_per_free_position(availability_schedule)
+        day = self.algorithm._get_day_with_least_available_doctors_per_free_position(availability)
         self.assertEqual(1, day.number)
 
-        availability_schedule[11, 2].pop()
+        self.doctor_7.preferences.exceptions = [11]
+        self.algorithm.availability = None
+        availability = self.algorithm._get_availability()
 
-        day = self.algorithm._get_day_with_least_available_doctors_per_free_position(availability_schedule)
+        day = self.algorithm._get_day_with_least_available_doctors_per_free_position(availability)
         self.assertEqual(11, day.number)
 
-        self.schedule[11, 2].update(self.doctor_1)
-        availability_schedule = DoctorAvailabilityHelper(self.doctors, self.schedule).get_availability_schedule()
+        self.doctor_7.preferences.exceptions = []
+        self.algorithm.availability = None
+        availability = self.algorithm._get_availability()
+        availability.assign(self.schedule[11, 2], self.doctor_1)
 
-        day = self.algorithm._get_day_with_least_available_doctors_per_free_position(availability_schedule)
+        day = self.algorithm._get_day_with_least_available_doctors_per_free_position(availability)
         self.assertEqual(10, day.number)  # Doctor_1 not available on 10 and 12
 
-    def test_dropping_doctor_combinations_conflicting_with_other_day_availability(self):
-        combinations = [(self.doctor_1, self.doctor_2, self.doctor_3), (self.doctor_4, self.doctor_5, self.doctor_6)]
-        other_day_doctors = {self.doctor_2, self.doctor_5, self.doctor_6, self.doctor_7}
+    def test_conflicts_with_other_days_availability(self):
+        combination_1 = (self.doctor_1, self.doctor_2, self.doctor_3)
+        combination_2 = (self.doctor_4, self.doctor_5, self.doctor_6)
+        other_day_doctors = [self.doctor_2, self.doctor_5, self.doctor_6, self.doctor_7]
+        get_mask = self.algorithm._get_availability().get_mask
 
-        result = self.algorithm._drop_conflicting_combinations(combinations, other_day_doctors)
-
-        self.assertListEqual(combinations[:1], list(result))
-
-        other_day_doctors.add(self.doctor_1)
+        self.assertFalse(self.algorithm._is_conflicting_with_other_days(combination_1, [get_mask(other_day_doctors)]))
+        self.assertTrue(self.algorithm._is_conflicting_with_other_days(combination_2, [get_mask(other_day_doctors)]))
+        self.assertTrue(
+            self.algorithm._is_conflicting_with_other_days(combination_2[1:], [get_mask(other_day_doctors)])
+        )
+        self.assertFalse(
+            self.algorithm._is_conflicting_with_other_days(combination_2[:1], [get_mask(other_day_doctors)])
+        )
 
-        result = self.algorithm._drop_conflicting_combinations(combinations, other_day_doctors)
+        other_day_masks = [get_mask(other_day_doctors + [self.doctor_1]), get_mask(other_day_doctors)]
+        self.assertFalse(self.algorithm._is_conflicting_with_other_days(combination_1, other_day_masks))
+        self.assertTrue(self.algorithm._is_conflicting_with_other_days(combination_2, other_day_masks))
 
-        self.assertListEqual(combinations, list(result))
+        other_day_masks = [get_mask(other_day_doctors + [self.doctor_1])]
+        self.assertFalse(self.algorithm._is_conflicting_with_other_days(combination_2, other_day_masks))
 
     def test_get_nodes(self):
         self.schedule[10, 1].update(self.doctor_1)
@@ -375,6 +787,89 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
         self.assertEqual(self.doctor_2, nodes[0].doctors[1])
         self.assertEqual(self.doctor_3, nodes[0].doctors[2])
 
+    def test_get_nodes_learning_nogoods(self):
+        self.doctor_1.preferences.preferred_positions = [3]
+        self.doctor_2.preferences.preferred_positions = [3]
+        for doctor in self.doctors[2:]:
+            doctor.preferences.preferred_positions = [1, 2]
+
+        node_0 = Node.get_empty()
+        node_1 = Node(1, [self.doctor_3, self.doctor_4, self.doctor_1], 100, node_0)
+        node_2 = Node(3, [self.doctor_5, self.doctor_6, self.doctor_2], 100, node_1)
+        node_3 = Node(5, [self.doctor_3, self.doctor_4, self.doctor_1], 100, node_1)
+
+        # Nobody can take the third position on day 2 between duties of doctors 1 and 2
+        nodes = self.algorithm._get_nodes(node_2)
+
+        self.assertListEqual([], nodes)
+        expected_nogood = Nogood(2, frozenset({(1, self.doctor_1), (3, self.doctor_2)}))
+        self.assertSetEqual({expected_nogood}, self.algorithm.nogoods.get_matched())
+
+        # Other nodes with the same assignments are rejected before expanding them
+        self.algorithm._move_to_node(node_3)
+        self.assertSetEqual(set(), self.algorithm.nogoods.get_matched())
+        self.assertListEqual(
+            [expected_nogood], list(self.algorithm.nogoods.get_matched_with(3, [self.doctor_5, self.doctor_2]))
+        )
+
+        with patch.object(self.algorithm, '_get_strain_per_doctor') as mock_get_strain_per_doctor:
+            self.assertListEqual(
+                [], self.algorithm._get_nodes(Node(3, [self.doctor_6, self.doctor_7, self.doctor_2], 100, node_3))
+            )
+
+        mock_get_strain_per_doctor.assert_not_called()
+
+    def test_get_nodes_dead_end_without_nogood(self):
+        self.doctor_1.preferences.preferred_positions = [3]
+        self.doctor_1.preferences.maximum_accepted_duties = 1
+        self.doctor_2.preferences.preferred_positions = [3]
+        for doctor in self.doctors[2:]:
+            doctor.preferences.preferred_positions = [1, 2]
+
+        node_0 = Node.get_empty()
+        node_1 = Node(10, [self.doctor_3, self.doctor_4, self.doctor_1], 100, node_0)
+        node_2 = Node(3, [self.doctor_5, self.doctor_6, self.doctor_2], 100, node_1)
+
+        # Doctor 1 can't take more duties, which doesn't depend on any particular day
+        self.assertListEqual([], self.algorithm._get_nodes(node_2))
+        self.assertEqual(0, len(self.algorithm.nogoods))
+
+    def test_backjumping(self):
+        self.doctor_1.preferences.preferred_positions = [3]
+        self.doctor_2.preferences.preferred_positions = [3]
+        for doctor in self.doctors[2:]:
+            doctor.preferences.preferred_positions = [1, 2]
+
+        node_0 = Node.get_empty()
+        node_1 = Node(1, (self.doctor_3, self.doctor_4, self.doctor_1), 100, node_0)
+        node_2 = Node(3, (self.doctor_5, self.doctor_6, self.doctor_2), 100, node_1)
+        other_node_2 = Node(3, (self.doctor_5, self.doctor_6, self.doctor_1), 100, node_1)
+        node_3 = Node(20, (self.doctor_3, self.doctor_4, self.doctor_1), 100, node_2)
+        other_node_3 = Node(20, (self.doctor_4, self.doctor_3, self.doctor_2), 100, node_2)
+        self.algorithm.frontier.push([other_node_2, other_node_3])
+
+        # Day 2 is left without doctors for the third position by days 1 and 3, not by day 20
+        self.algorithm._expand(node_3)
+
+        self.assertDictEqual({id(node_2): node_2}, self.algorithm.dead_nodes)
+        self.assertIs(other_node_2, self.algorithm._remove_node_from_frontier())
+        self.assertIsNone(self.algorithm._remove_node_from_frontier())
+
+    def test_backjumping_to_root(self):
+        self.doctor_1.preferences.preferred_positions = [3]
+        for doctor in self.doctors[1:]:
+            doctor.preferences.preferred_positions = [1, 2]
+        self.schedule[5, 3].update(self.doctor_1, set_by_user=True)
+
+        self.algorithm.set_duties()
+
+        # Duties set by the user leave day 4 or 6 without doctors, whatever the search does
+        self.assertEqual(StopReason.EXHAUSTED, self.algorithm.stop_reason)
+        self.assertEqual(2, self.algorithm.steps)
+        dead_nodes = list(self.algorithm.dead_nodes.values())
+        self.assertEqual(1, len(dead_nodes))
+        self.assertTrue(dead_nodes[0].is_empty())
+
     def test_get_nodes_result_ordering(self):
         self.doctor_1.preferences.exceptions = [11]  # Saturday
         self.doctor_2.preferences.exceptions = [11]
@@ -387,9 +882,18 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
 
         self.schedule[9, 1].update(self.doctor_6)  # Thursday
 
+        # More doctors, not interchangeable with each other, so that some sets of them have equal strain
+        new_doctors = doctor_factory(3)
+        for doctor, exception in zip(new_doctors, [25, 26, 27]):
+            doctor.init_preferences(**self.get_init_preferences_kwargs())
+            doctor.preferences.exceptions = [exception]
+
+        self.doctors.extend(new_doctors)
+
         node_0 = Node.get_empty()
 
         nodes = self.algorithm._get_nodes(node_0)
+        self.assertEqual(11, nodes[0].day_number)
 
         strains = sorted({node.strain for node in nodes})
         self.assertGreater(len(strains), 1)
@@ -409,19 +913,125 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
             doctor.init_preferences(**self.get_init_preferences_kwargs())
 
         self.doctors.extend(new_doctors)
+        self.algorithm.equivalence_classes = []  # Doctors are told apart, so that all their combinations are counted
 
         node_0 = Node.get_empty()
 
         nodes = self.algorithm._get_nodes(node_0)
-        self.assertEqual(120, len(nodes))  # With 6 doctors per position, unique combinations count equals 6 * 5 * 4
+        self.assertEqual(20, len(nodes))  # With 6 doctors per position, sets of 3 of them count C(6, 3)
 
         self.algorithm.depth = 3
         nodes = self.algorithm._get_nodes(node_0)
-        self.assertEqual(504, len(nodes))  # 9 * 8 * 7
+        self.assertEqual(84, len(nodes))  # C(9, 3)
 
         self.algorithm.depth = 4
         nodes = self.algorithm._get_nodes(node_0)
-        self.assertEqual(1320, len(nodes))  # 12 * 11 * 10
+        self.assertEqual(220, len(nodes))  # C(12, 3)
+
+    def test_get_nodes_skip_known_combinations(self):
+        new_doctors = doctor_factory(5)
+        for doctor in new_doctors:
+            doctor.init_preferences(**self.get_init_preferences_kwargs())
+
+        self.doctors.extend(new_doctors)
+        self.algorithm.equivalence_classes = []  # Doctors are told apart, so that all their combinations are counted
+
+        node_0 = Node.get_empty()
+        known_nodes = self.algorithm._get_nodes(node_0)
+
+        self.algorithm.depth = 3
+        nodes = self.algorithm._get_nodes(node_0, known_width=6)
+        self.assertEqual(84 - 20, len(nodes))
+
+        known_combinations = {frozenset(node.doctors) for node in known_nodes}
+        for node in nodes:
+            self.assertNotIn(frozenset(node.doctors), known_combinations)
+
+    def test_get_nodes_interchangeable_doctors(self):
+        self.doctor_1.preferences.maximum_accepted_duties -= 1
+
+        node_0 = Node.get_empty()
+
+        # Other doctors are interchangeable, so only the first of them are tried
+        nodes = self.algorithm._get_nodes(node_0)
+        self.assertEqual(2, len(nodes))
+
+        interchangeable_doctors = [self.doctor_2, self.doctor_3, self.doctor_4]
+        for node in nodes:
+            doctors = [doctor for doctor in node.doctors if doctor != self.doctor_1]
+            self.assertCountEqual(interchangeable_doctors[: len(doctors)], doctors)
+
+    def test_increasing_depth(self):
+        empty_node = Node.get_empty()
+        node_1 = Node(1, self.get_random_doctors(), 100, empty_node, key=1)
+        node_2 = Node(1, self.get_random_doctors(), 200, empty_node, key=2)
+        node_3 = Node(2, self.get_random_doctors(), 100, node_1, key=3)
+        self.algorithm.step_budget = 100
+
+        with patch.object(self.algorithm, '_get_nodes', side_effect=[[node_1, node_2], [node_3], [], []]) as mock:
+            self.algorithm._expand(empty_node)
+            self.algorithm._expand(self.algorithm._remove_node_from_frontier())
+            self.algorithm.best_node = node_1
+            self.algorithm.steps = 100
+
+            self.algorithm._increase_depth()
+
+        self.assertEqual(3, self.algorithm.depth)
+        self.assertEqual(0, self.algorithm.steps)
+        self.assertIs(node_1, self.algorithm.best_node)
+        self.assertListEqual([empty_node, node_1], list(self.algorithm.expanded_nodes))
+        self.assertListEqual([node_2, node_3], list(self.algorithm.frontier))
+        self.assertEqual(2, self.algorithm.total_steps)
+
+        # Known nodes are expanded again, skipping combinations of doctors from the previous depth
+        self.assertEqual(call(empty_node, 6), mock.call_args_list[2])
+        self.assertEqual(call(node_1, 6), mock.call_args_list[3])
+
+    def test_increasing_depth_skips_dead_subtrees(self):
+        empty_node = Node.get_empty()
+        node_1 = Node(1, self.get_random_doctors(), 100, empty_node, key=1)
+        node_2 = Node(2, self.get_random_doctors(), 100, node_1, key=2)
+        self.algorithm.step_budget = 100
+        self.algorithm.expanded_nodes.extend([empty_node, node_1, node_2])
+        self.algorithm.dead_nodes[id(node_1)] = node_1
+
+        with patch.object(self.algorithm, '_get_nodes', return_value=[]) as mock:
+            self.algorithm._increase_depth()
+
+        self.assertListEqual([call(empty_node, 6)], mock.call_args_list)
+        self.assertListEqual([empty_node], list(self.algorithm.expanded_nodes))
+
+    def test_increasing_depth_stops_at_step_limit(self):
+        nodes = [Node.get_empty() for _ in range(5)]
+        self.algorithm.step_budget = 2
+        self.algorithm.expanded_nodes.extend(nodes)
+
+        with patch.object(self.algorithm, '_get_nodes', return_value=[]):
+            self.algorithm._increase_depth()
+
+        self.assertEqual(3, self.algorithm.total_steps)
+        self.assertListEqual(nodes[:3], list(self.algorithm.expanded_nodes))
+
+    def test_increasing_depth_stops_at_deadline(self):
+        algorithm = Algorithm(self.doctors, self.schedule, time_limit_ms=1)
+        algorithm.expanded_nodes.extend(Node.get_empty() for _ in range(5))
+        algorithm._start_clock()
+        time.sleep(0.002)
+
+        with patch.object(algorithm, '_get_nodes', return_value=[]) as mock:
+            algorithm._increase_depth()
+
+        mock.assert_not_called()
+
+    def test_expanded_nodes_are_bounded_by_frontier_max_size(self):
+        algorithm = Algorithm(self.doctors, self.schedule, frontier_max_size=2)
+        nodes = [Node.get_empty() for _ in range(3)]
+
+        with patch.object(algorithm, '_get_nodes', return_value=[]):
+            for node in nodes:
+                algorithm._expand(node)
+
+        self.assertListEqual(nodes[1:], list(algorithm.expanded_nodes))
 
     def test_setting_duties(self):
         new_doctors = doctor_factory(7)
@@ -457,3 +1067,124 @@ class AlgorithmTests(InitDutySetterTestMixin, TestCase):
 
         empty_duties = [duty for duty in self.schedule.cells() if not duty.is_set]
         self.assertEqual(0, len(empty_duties))
+
+    def test_setting_duties_with_priority_frontier(self):
+        new_doctors = doctor_factory(7)
+        for doctor in new_doctors:
+            doctor.init_preferences(**self.get_init_preferences_kwargs())
+
+        self.doctors.extend(new_doctors)
+
+        for frontier_policy in [FrontierPolicy.DAYS_SET, FrontierPolicy.STRAIN_ESTIMATE]:
+            with self.subTest(frontier_policy=frontier_policy):
+                schedule = DutySchedule(self.year, self.month, self.duty_positions)
+                algorithm = Algorithm(self.doctors, schedule, frontier_policy=frontier_policy)
+
+                algorithm.set_duties()
+
+                self.assertTrue(schedule.is_filled)
+                ScheduleValidator(self.doctors, schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_stop_reasons(self):
+        algorithm = Algorithm(self.doctors, self.schedule)
+        with patch.object(algorithm, '_get_nodes', return_value=[]):
+            algorithm.set_duties()
+
+        self.assertEqual(StopReason.EXHAUSTED, algorithm.stop_reason)
+
+        algorithm = Algorithm(self.doctors, self.schedule)
+        with patch.object(Algorithm, 'max_steps', 1), patch.object(Algorithm, '_increase_depth'):
+            algorithm.set_duties()
+
+        self.assertEqual(StopReason.STEP_LIMIT, algorithm.stop_reason)
+        self.assertEqual(2, algorithm.steps)
+
+    def test_pruning_by_strain_upper_bound(self):
+        algorithm = Algorithm(self.doctors, self.schedule, seed=1)
+        algorithm.set_duties()
+        total_strain = algorithm.best_node.total_strain
+
+        self.schedule = DutySchedule(self.year, self.month, self.duty_positions)
+        algorithm = Algorithm(self.doctors, self.schedule, seed=1, strain_upper_bound=total_strain + 1)
+        algorithm.set_duties()
+
+        self.assertEqual(StopReason.COMPLETED, algorithm.stop_reason)
+        self.assertLessEqual(algorithm.best_node.total_strain, total_strain)
+
+        # The bound of strain of all the days can't be beaten, so all nodes are pruned at the root
+        self.schedule = DutySchedule(self.year, self.month, self.duty_positions)
+        algorithm = Algorithm(self.doctors, self.schedule, strain_upper_bound=0)
+        algorithm._initialize_frontier()
+
+        algorithm = Algorithm(self.doctors, self.schedule, strain_upper_bound=algorithm.remaining_strain_lower_bound)
+        algorithm.set_duties()
+
+        self.assertEqual(StopReason.EXHAUSTED, algorithm.stop_reason)
+        self.assertEqual(1, algorithm.pruned_nodes)
+        self.assertIsNone(algorithm.best_node)
+        self.assertFalse(any(duty.is_set for duty in self.schedule.cells()))
+
+    def test_bounded_frontier(self):
+        algorithm = Algorithm(self.doctors, self.schedule, seed=1)
+        algorithm.set_duties()
+        self.assertGreater(algorithm.peak_frontier_size, 20)
+
+        for duty in self.schedule.cells():
+            duty.update(None)
+
+        algorithm = Algorithm(self.doctors, self.schedule, seed=1, frontier_max_size=20)
+        algorithm.set_duties()
+
+        self.assertEqual(StopReason.COMPLETED, algorithm.stop_reason)
+        self.assertLessEqual(algorithm.peak_frontier_size, 20)
+        self.assertGreater(algorithm.frontier.evicted_nodes, 0)
+
+    def test_step_budget(self):
+        algorithm = Algorithm(self.doctors, self.schedule)
+        algorithm._initialize_step_budget()
+        step_budget = algorithm.step_budget
+
+        self.assertGreaterEqual(step_budget, 31 * Algorithm.min_steps_per_day)
+        self.assertLessEqual(step_budget, 31 * Algorithm.max_steps_per_day)
+        # Depths from 2 to all 7 doctors on 3 positions, each of which can set all the days
+        self.assertEqual(max(32, step_budget // 2), algorithm.steps_per_depth)
+
+        # Doctors unavailable on many days make the month harder
+        for doctor in self.doctors[:4]:
+            doctor.preferences.exceptions = list(range(1, 32, 2))
+
+        algorithm = Algorithm(self.doctors, self.schedule)
+        algorithm._initialize_step_budget()
+        self.assertGreater(algorithm.step_budget, step_budget)
+
+        # Days already set don't need steps
+        for day_number in range(1, 32, 2):
+            for duty in self.schedule[day_number]:
+                duty.update(self.doctor_4, set_by_user=True)
+
+        algorithm = Algorithm(self.doctors, self.schedule)
+        algorithm._initialize_step_budget()
+        self.assertLess(algorithm.step_budget, 15 * Algorithm.max_steps_per_day)
+
+        with patch.object(Algorithm, 'max_steps', 10):
+            algorithm._initialize_step_budget()
+
+        self.assertEqual(10, algorithm.step_budget)
+        self.assertEqual(16, algorithm.steps_per_depth)
+
+    def test_setting_duties_until_deadline(self):
+        algorithm = Algorithm(self.doctors, self.schedule, time_limit_ms=0)
+        algorithm.set_duties()
+
+        self.assertEqual(StopReason.DEADLINE, algorithm.stop_reason)
+        self.assertEqual(1, algorithm.steps)
+        self.assertFalse(self.schedule[1].is_filled)
+
+    def test_time_limit_replaces_step_limit(self):
+        algorithm = Algorithm(self.doctors, self.schedule, time_limit_ms=60_000)
+
+        with patch.object(Algorithm, 'max_steps', 1), patch.object(Algorithm, '_increase_depth'):
+            algorithm.set_duties()
+
+        self.assertEqual(StopReason.COMPLETED, algorithm.stop_reason)
+        self.assertTrue(self.schedule.is_filled)
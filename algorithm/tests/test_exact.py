@@ -0,0 +1,180 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from algorithm.duty_setter import Algorithm
+from algorithm.enums import StopReason
+from algorithm.exact import ExactSearch
+from algorithm.schedule import DutySchedule
+from algorithm.tests.utils import InitDutySetterTestMixin, ScheduleValidator
+
+
+class ExactSearchTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 1
+    doctors_count = 6
+
+    def setUp(self):
+        super().setUp()
+
+        self.doctor_1.preferences.exceptions = [3, 4, 5]
+        self.doctor_2.preferences.exceptions = [11, 12]
+        self.doctor_3.preferences.preferred_weekdays = [0, 1, 2, 3, 4]
+
+        Algorithm(self.doctors, self.schedule, seed=1).set_duties()
+
+        self.window = list(range(13, 20))
+        for day_number in self.window:
+            self.schedule[day_number, 1].update(None)
+
+    def test_setting_duties(self):
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(StopReason.COMPLETED, exact_search.stop_reason)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_strain_is_not_higher_than_found_by_tree_search(self):
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        for seed in range(5):
+            for day_number in self.window:
+                self.schedule[day_number, 1].update(None)
+
+            algorithm = Algorithm(self.doctors, self.schedule, seed=seed)
+            algorithm.set_duties()
+
+            self.assertLessEqual(exact_search.best_node.total_strain, algorithm.best_node.total_strain)
+
+    def test_lower_bound_does_not_exceed_optimal_strain(self):
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        lower_bound = exact_search._get_remaining_strain_lower_bound()
+
+        exact_search.set_duties()
+
+        self.assertLessEqual(lower_bound, exact_search.best_node.total_strain)
+        self.assertGreater(exact_search.pruned_nodes, 0)
+
+    def test_infeasible_schedule_is_exhausted(self):
+        for doctor in self.doctors:
+            doctor.preferences.exceptions = [15]
+
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        # Forward checking finds the day nobody can take without setting the days before it
+        self.assertEqual(StopReason.EXHAUSTED, exact_search.stop_reason)
+        self.assertEqual(1, exact_search.steps)
+        self.assertFalse(self.schedule[15, 1].is_set)
+
+    def test_not_enough_accepted_duties(self):
+        for doctor in self.doctors:
+            doctor.preferences.maximum_accepted_duties = len(list(self.schedule.duties_for_doctor(doctor))) + 1
+
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        self.assertEqual(StopReason.EXHAUSTED, exact_search.stop_reason)
+        self.assertEqual(1, exact_search.steps)
+
+    def test_deadline(self):
+        exact_search = ExactSearch(self.doctors, self.schedule, time_limit_ms=1)
+
+        with patch.object(exact_search, '_is_deadline_reached', side_effect=[False] * 5 + [True]):
+            exact_search.set_duties()
+
+        self.assertEqual(StopReason.DEADLINE, exact_search.stop_reason)
+        self.assertEqual(6, exact_search.steps)
+
+    @patch.object(ExactSearch, 'max_steps', 20)
+    def test_step_limit(self):
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        # A complete schedule was found within the step limit, so it is kept
+        self.assertEqual(StopReason.STEP_LIMIT, exact_search.stop_reason)
+        self.assertEqual(21, exact_search.steps)
+        self.assertEqual(20, exact_search.step_budget)
+        self.assertTrue(self.schedule.is_filled)
+
+    @patch.object(ExactSearch, 'max_steps', 0)
+    def test_tree_search_sets_duties_left_after_step_limit(self):
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        self.assertEqual(StopReason.STEP_LIMIT, exact_search.stop_reason)
+        self.assertTrue(self.schedule.is_filled)
+        self.assertGreater(exact_search.step_budget, 0)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    @patch.object(ExactSearch, 'max_steps', 0)
+    def test_step_limit_is_ignored_with_time_limit(self):
+        exact_search = ExactSearch(self.doctors, self.schedule, time_limit_ms=0)
+        exact_search.set_duties()
+
+        self.assertEqual(StopReason.DEADLINE, exact_search.stop_reason)
+        self.assertFalse(self.schedule.is_filled)
+
+    def test_nothing_to_set(self):
+        Algorithm(self.doctors, self.schedule, seed=1).set_duties()
+
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        self.assertEqual(StopReason.COMPLETED, exact_search.stop_reason)
+        self.assertTrue(self.schedule.is_filled)
+
+
+class ExactSearchFullMonthTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 1
+    doctors_count = 6
+
+    def set_up_doctors(self, doctors_count):
+        self.doctors_count = doctors_count
+        self.setUp()
+
+        # Each day, two doctors in turns are available
+        for index, doctor in enumerate(self.doctors):
+            doctor.preferences.exceptions = [
+                day_number
+                for day_number in range(1, 32)
+                if day_number % doctors_count not in [index, (index + 1) % doctors_count]
+            ]
+
+    def test_full_month_is_proven_within_step_limit(self):
+        for doctors_count in [6, 8, 12]:
+            with self.subTest(doctors_count=doctors_count):
+                self.set_up_doctors(doctors_count)
+
+                exact_search = ExactSearch(self.doctors, self.schedule)
+                exact_search.set_duties()
+
+                self.assertLessEqual(exact_search.steps, ExactSearch.max_steps)
+                self.assertEqual(StopReason.COMPLETED, exact_search.stop_reason)
+                self.assertTrue(self.schedule.is_filled)
+                ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+                strain = exact_search.best_node.total_strain
+                for seed in range(3):
+                    self.schedule = DutySchedule(self.year, self.month, self.duty_positions)
+                    algorithm = Algorithm(self.doctors, self.schedule, seed=seed)
+                    algorithm.set_duties()
+
+                    self.assertLessEqual(strain, algorithm.best_node.total_strain)
+
+    @patch.object(ExactSearch, 'max_steps', 100)
+    def test_full_month_without_proof_is_set_within_step_limit(self):
+        self.set_up_doctors(6)
+        for doctor in self.doctors:
+            doctor.preferences.exceptions = []
+
+        exact_search = ExactSearch(self.doctors, self.schedule)
+        exact_search.set_duties()
+
+        self.assertEqual(StopReason.STEP_LIMIT, exact_search.stop_reason)
+        self.assertEqual(101, exact_search.steps)
+        self.assertTrue(self.schedule.is_filled)
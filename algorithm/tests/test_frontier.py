@@ -0,0 +1,160 @@
+from unittest import TestCase
+
+from algorithm.duty_setter import Node
+from algorithm.enums import EvictionPolicy, FrontierPolicy
+from algorithm.frontier import (
+    BoundedFrontier,
+    DaysSetScorer,
+    LifoFrontier,
+    PriorityFrontier,
+    StrainEstimateScorer,
+    get_frontier,
+)
+from algorithm.tests.utils import doctor_factory
+
+
+class FrontierTestMixin:
+    def setUp(self):
+        self.doctors = doctor_factory(2)
+
+        self.empty_node = Node.get_empty()
+        self.node_1 = Node(1, self.doctors, 300, self.empty_node)
+        self.node_2 = Node(2, self.doctors, 100, self.empty_node)
+        self.node_3 = Node(3, self.doctors, 200, self.node_1)
+        self.node_4 = Node(3, self.doctors, 100, self.node_2)
+
+
+class LifoFrontierTests(FrontierTestMixin, TestCase):
+    def test_best_node_is_popped_first_and_others_last(self):
+        frontier = LifoFrontier()
+
+        frontier.push([self.node_1, self.node_2])
+        self.assertEqual(2, len(frontier))
+        self.assertEqual(self.node_1, frontier.pop())
+
+        frontier.push([self.node_3, self.node_4])
+        self.assertListEqual([self.node_4, self.node_2, self.node_3], list(frontier))
+        self.assertEqual(self.node_3, frontier.pop())
+        self.assertEqual(self.node_2, frontier.pop())
+
+    def test_pushing_no_nodes(self):
+        frontier = LifoFrontier()
+
+        frontier.push([])
+
+        self.assertEqual(0, len(frontier))
+
+    def test_removing_nodes(self):
+        frontier = LifoFrontier()
+        frontier.push([self.node_1, self.node_2, self.node_3])
+
+        frontier.remove([self.node_2, self.node_4])
+
+        self.assertListEqual([self.node_3, self.node_1], list(frontier))
+
+
+class PriorityFrontierTests(FrontierTestMixin, TestCase):
+    def test_days_set_scoring(self):
+        frontier = PriorityFrontier(DaysSetScorer())
+
+        frontier.push([self.node_1, self.node_2, self.node_3, self.node_4])
+
+        self.assertListEqual([self.node_4, self.node_3, self.node_2, self.node_1], list(frontier))
+        self.assertListEqual([self.node_4, self.node_3, self.node_2, self.node_1], [frontier.pop() for _ in range(4)])
+        self.assertEqual(0, len(frontier))
+
+    def test_strain_estimate_scoring(self):
+        scorer = StrainEstimateScorer(days_to_set=10, strain_per_day=150)
+
+        self.assertEqual((1500, 0), scorer(self.empty_node))
+        self.assertEqual((1650, -1), scorer(self.node_1))
+        self.assertEqual((1700, -2), scorer(self.node_3))
+
+        frontier = PriorityFrontier(scorer)
+        frontier.push([self.node_1, self.node_2, self.node_3, self.node_4])
+
+        # Going deeper is not worth the strain added by node_1
+        self.assertListEqual([self.node_4, self.node_2, self.node_1, self.node_3], [frontier.pop() for _ in range(4)])
+
+    def test_removing_nodes(self):
+        frontier = PriorityFrontier(DaysSetScorer())
+        frontier.push([self.node_1, self.node_2, self.node_3, self.node_4])
+
+        frontier.remove([self.node_4, self.node_2])
+
+        self.assertListEqual([self.node_3, self.node_1], [frontier.pop() for _ in range(2)])
+
+    def test_equal_scores_keep_insertion_order(self):
+        frontier = PriorityFrontier(DaysSetScorer())
+        node = Node(1, self.doctors, 300, self.empty_node)
+
+        frontier.push([self.node_1, node])
+
+        self.assertIs(self.node_1, frontier.pop())
+        self.assertIs(node, frontier.pop())
+
+
+class BoundedFrontierTests(FrontierTestMixin, TestCase):
+    def test_shallowest_nodes_are_evicted(self):
+        frontier = BoundedFrontier(LifoFrontier(), max_size=2, scorer=DaysSetScorer())
+
+        frontier.push([self.node_1, self.node_2])
+        self.assertEqual(0, frontier.evicted_nodes)
+
+        frontier.push([self.node_3, self.node_4])
+
+        self.assertEqual(2, frontier.evicted_nodes)
+        self.assertListEqual([self.node_4, self.node_3], list(frontier))
+        self.assertEqual(self.node_3, frontier.pop())
+
+    def test_nodes_with_highest_strain_are_evicted(self):
+        scorer = StrainEstimateScorer(days_to_set=10, strain_per_day=150)
+        frontier = BoundedFrontier(PriorityFrontier(DaysSetScorer()), max_size=2, scorer=scorer)
+
+        frontier.push([self.node_1, self.node_2, self.node_3, self.node_4])
+
+        self.assertListEqual([self.node_4, self.node_2], [frontier.pop() for _ in range(2)])
+
+    def test_more_nodes_are_evicted_at_once(self):
+        frontier = BoundedFrontier(LifoFrontier(), max_size=10, scorer=DaysSetScorer())
+
+        frontier.push([Node(1, self.doctors, strain, self.empty_node) for strain in range(11)])
+
+        # A tenth of the maximum size is evicted on top of the excess
+        self.assertEqual(9, len(frontier))
+        self.assertEqual(2, frontier.evicted_nodes)
+        self.assertSetEqual(set(range(9)), {node.strain for node in frontier})
+
+
+class GetFrontierTests(TestCase):
+    def test_policies(self):
+        self.assertIsInstance(get_frontier(FrontierPolicy.LIFO, 31, 100), LifoFrontier)
+
+        frontier = get_frontier(FrontierPolicy.DAYS_SET, 31, 100)
+        self.assertIsInstance(frontier, PriorityFrontier)
+        self.assertIsInstance(frontier.scorer, DaysSetScorer)
+
+        frontier = get_frontier(FrontierPolicy.STRAIN_ESTIMATE, 31, 100)
+        self.assertIsInstance(frontier, PriorityFrontier)
+        self.assertIsInstance(frontier.scorer, StrainEstimateScorer)
+        self.assertEqual(31, frontier.scorer.days_to_set)
+        self.assertEqual(100, frontier.scorer.strain_per_day)
+
+        with self.assertRaises(ValueError):
+            get_frontier('unknown', 31, 100)
+
+    def test_bounded_frontier(self):
+        frontier = get_frontier(FrontierPolicy.LIFO, 31, 100, max_size=50)
+        self.assertIsInstance(frontier, BoundedFrontier)
+        self.assertIsInstance(frontier.frontier, LifoFrontier)
+        self.assertEqual(50, frontier.max_size)
+        self.assertIsInstance(frontier.scorer, DaysSetScorer)
+
+        frontier = get_frontier(
+            FrontierPolicy.DAYS_SET, 31, 100, max_size=50, eviction_policy=EvictionPolicy.HIGHEST_STRAIN
+        )
+        self.assertIsInstance(frontier.frontier, PriorityFrontier)
+        self.assertIsInstance(frontier.scorer, StrainEstimateScorer)
+
+        with self.assertRaises(ValueError):
+            get_frontier(FrontierPolicy.LIFO, 31, 100, max_size=50, eviction_policy='unknown')
@@ -0,0 +1,102 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from algorithm.duty_setter import Algorithm
+from algorithm.enums import StopReason, Weekday
+from algorithm.lns import LargeNeighbourhoodSearch
+from algorithm.tests.utils import InitDutySetterTestMixin, ScheduleValidator
+
+
+class LargeNeighbourhoodSearchTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 8
+
+    def setUp(self):
+        super().setUp()
+
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+
+    def test_cost_does_not_increase(self):
+        Algorithm(self.doctors, self.schedule, seed=1).set_duties()
+        lns = LargeNeighbourhoodSearch(self.doctors, self.schedule, iterations=10, seed=1)
+        cost = lns.get_cost()
+
+        lns.improve_duties()
+
+        self.assertLessEqual(lns.get_cost(), cost)
+        self.assertEqual(lns.get_cost(), lns.cost)
+        self.assertEqual(StopReason.COMPLETED, lns.stop_reason)
+        self.assertEqual(self.doctor_1, self.schedule[10, 1].doctor)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_not_filled_rows_are_filled(self):
+        with patch.object(Algorithm, 'max_steps', 5), patch.object(Algorithm, '_increase_depth'):
+            algorithm = Algorithm(self.doctors, self.schedule, seed=1)
+            algorithm.set_duties()
+
+        self.assertEqual(StopReason.STEP_LIMIT, algorithm.stop_reason)
+        self.assertFalse(self.schedule.is_filled)
+
+        lns = LargeNeighbourhoodSearch(self.doctors, self.schedule, iterations=20, seed=1)
+        lns.improve_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(StopReason.COMPLETED, lns.stop_reason)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_windows(self):
+        lns = LargeNeighbourhoodSearch(self.doctors, self.schedule, window_days=5, seed=1)
+
+        for duty in self.schedule.cells():
+            if not duty.is_set and duty.day.number != 2:
+                duty.update(self.doctor_4)
+
+        # Not filled rows are repaired first
+        self.assertListEqual([1, 2, 3, 4, 5], lns._get_window())
+
+        self.schedule[2, 1].update(self.doctor_2)
+        self.schedule[2, 2].update(self.doctor_3)
+
+        # Otherwise, a week or a weekend is repaired
+        windows = {tuple(lns._get_window()) for _ in range(50)}
+        self.assertIn((6, 7, 8, 9, 10, 11, 12), windows)
+        self.assertIn((10, 11, 12), windows)
+
+        for window in windows:
+            week = [row.day.number for row in self.schedule if row.day.week == self.schedule[window[0]].day.week]
+            weekend = [day_number for day_number in week if self.schedule[day_number].day.weekday in Weekday.weekend()]
+            self.assertIn(list(window), [week, weekend])
+
+    def test_worse_repair_is_reverted(self):
+        Algorithm(self.doctors, self.schedule, seed=1).set_duties()
+        lns = LargeNeighbourhoodSearch(self.doctors, self.schedule, seed=1)
+        lns.cost = lns.get_cost()
+        assignments = [(duty, duty.doctor) for duty in self.schedule.cells()]
+
+        with patch('algorithm.lns.WindowRepair.set_duties'):
+            self.assertFalse(lns._repair_window([3, 4, 5]))
+
+        self.assertListEqual(assignments, [(duty, duty.doctor) for duty in self.schedule.cells()])
+
+    def test_fixed_duties_are_kept(self):
+        lns = LargeNeighbourhoodSearch(self.doctors, self.schedule, seed=1)
+        self.schedule[10, 2].update(self.doctor_2)
+
+        self.assertListEqual([self.schedule[10, 2]], lns._get_window_duties([10]))
+
+    def test_set_duties(self):
+        lns = LargeNeighbourhoodSearch(self.doctors, self.schedule, iterations=5, seed=1)
+        lns.set_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(StopReason.COMPLETED, lns.stop_reason)
+
+    def test_deadline(self):
+        lns = LargeNeighbourhoodSearch(self.doctors, self.schedule, time_limit_ms=1, seed=1)
+
+        with patch('algorithm.lns.time.monotonic', side_effect=[0, 1]):
+            lns.improve_duties()
+
+        self.assertEqual(StopReason.DEADLINE, lns.stop_reason)
@@ -0,0 +1,189 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from algorithm.duty_setter import Algorithm
+from algorithm.enums import StopReason
+from algorithm.local_search import HillClimbing, SimulatedAnnealing
+from algorithm.tests.utils import InitDutySetterTestMixin, ScheduleValidator
+
+
+class HillClimbingTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 8
+
+    def setUp(self):
+        super().setUp()
+
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+        Algorithm(self.doctors, self.schedule, seed=1).set_duties()
+
+    def get_cost(self) -> tuple[int, int]:
+        hill_climbing = HillClimbing(self.doctors, self.schedule, max_iterations=0)
+        hill_climbing.improve_duties()
+        return hill_climbing.get_cost()
+
+    def test_cost_does_not_increase(self):
+        cost = self.get_cost()
+
+        hill_climbing = HillClimbing(self.doctors, self.schedule, seed=1)
+        hill_climbing.improve_duties()
+
+        self.assertLessEqual(hill_climbing.get_cost(), cost)
+        # Incrementally updated cost matches the one evaluated from scratch
+        self.assertEqual(self.get_cost(), hill_climbing.get_cost())
+
+    def test_total_strain_does_not_increase(self):
+        total_strain, _ = self.get_cost()
+
+        HillClimbing(self.doctors, self.schedule, seed=1).improve_duties()
+
+        self.assertLessEqual(self.get_cost()[0], total_strain)
+
+    def test_moves_acceptance(self):
+        hill_climbing = HillClimbing(self.doctors, self.schedule)
+
+        self.assertTrue(hill_climbing._is_accepted((-10, 1000), (0, 100)))
+        # Strain spread more evenly with the same total
+        self.assertTrue(hill_climbing._is_accepted((0, 90), (0, 100)))
+        self.assertFalse(hill_climbing._is_accepted((0, 100), (0, 100)))
+        # Strain spread more evenly with a higher total
+        self.assertFalse(hill_climbing._is_accepted((10, 10), (0, 100)))
+
+    def test_schedule_stays_valid(self):
+        HillClimbing(self.doctors, self.schedule, seed=1).improve_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(self.doctor_1, self.schedule[10, 1].doctor)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_fixed_duties_are_not_moved(self):
+        hill_climbing = HillClimbing(self.doctors, self.schedule, seed=1)
+        hill_climbing.availability = object()
+
+        moves = hill_climbing._get_moves()
+
+        self.assertTrue(moves)
+        self.assertFalse(any(duty is self.schedule[10, 1] for move in moves for duty, _ in move))
+
+    def test_iterations_budget(self):
+        hill_climbing = HillClimbing(self.doctors, self.schedule, max_iterations=5, seed=1)
+        hill_climbing.improve_duties()
+
+        self.assertEqual(5, hill_climbing.iterations)
+
+    def test_time_limit(self):
+        hill_climbing = HillClimbing(self.doctors, self.schedule, time_limit_ms=1, seed=1)
+
+        with patch('algorithm.local_search.time.monotonic', side_effect=[0, 1]):
+            hill_climbing.improve_duties()
+
+        self.assertEqual(0, hill_climbing.iterations)
+
+    def test_infeasible_move_is_reverted(self):
+        hill_climbing = HillClimbing(self.doctors, self.schedule, max_iterations=0)
+        hill_climbing.improve_duties()
+        cost = hill_climbing.get_cost()
+
+        duty, next_duty = self.schedule[5, 1], self.schedule[6, 1]
+        doctor = duty.doctor
+        # Doctor can't be on duty on two consecutive days
+        self.assertFalse(hill_climbing._try_move([(next_duty, doctor)]))
+
+        self.assertEqual(doctor, duty.doctor)
+        self.assertIsNot(doctor, next_duty.doctor)
+        self.assertTrue(next_duty.is_set)
+        self.assertEqual(cost, hill_climbing.get_cost())
+
+
+class SimulatedAnnealingTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 8
+
+    def setUp(self):
+        super().setUp()
+
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+
+    def test_best_schedule_is_kept(self):
+        Algorithm(self.doctors, self.schedule, seed=1).set_duties()
+        hill_climbing = HillClimbing(self.doctors, self.schedule, max_iterations=0)
+        hill_climbing.improve_duties()
+
+        annealing = SimulatedAnnealing(self.doctors, self.schedule, max_iterations=500, seed=1)
+        annealing.improve_duties()
+
+        self.assertEqual(500, annealing.iterations)
+        self.assertLessEqual(annealing.get_cost(), hill_climbing.get_cost())
+        self.assertEqual(annealing.best_cost, annealing.get_cost())
+        self.assertListEqual(
+            annealing.best_assignments, [(duty, duty.doctor) for duty, _ in annealing.best_assignments]
+        )
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(self.doctor_1, self.schedule[10, 1].doctor)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_total_strain_is_not_worse_than_initial(self):
+        Algorithm(self.doctors, self.schedule, seed=1).set_duties()
+        hill_climbing = HillClimbing(self.doctors, self.schedule, max_iterations=0)
+        hill_climbing.improve_duties()
+        total_strain, _ = hill_climbing.get_cost()
+
+        # Hot enough to accept most of the worse moves
+        SimulatedAnnealing(
+            self.doctors, self.schedule, max_iterations=500, initial_temperature=1000, final_temperature=1000, seed=1
+        ).improve_duties()
+
+        hill_climbing = HillClimbing(self.doctors, self.schedule, max_iterations=0)
+        hill_climbing.improve_duties()
+        self.assertLessEqual(hill_climbing.get_cost()[0], total_strain)
+
+    def test_temperature(self):
+        annealing = SimulatedAnnealing(
+            self.doctors, self.schedule, max_iterations=100, initial_temperature=100, final_temperature=1
+        )
+
+        self.assertAlmostEqual(100, annealing.get_temperature())
+
+        annealing.iterations = 50
+        self.assertAlmostEqual(10, annealing.get_temperature())
+
+        annealing.iterations = 100
+        self.assertAlmostEqual(1, annealing.get_temperature())
+
+    def test_worse_moves_acceptance(self):
+        annealing = SimulatedAnnealing(self.doctors, self.schedule, seed=1)
+        cost = (1000, 8 * 1000**2)
+
+        self.assertTrue(annealing._is_accepted((999, 9 * 1000**2), cost))
+        self.assertTrue(annealing._is_accepted((1000, 9 * 1000**2), cost))
+
+        # Total strain higher by 100 points
+        worse_cost = (1100, 8 * 1000**2)
+
+        annealing.initial_temperature = annealing.final_temperature = 1
+        self.assertFalse(any(annealing._is_accepted(worse_cost, cost) for _ in range(100)))
+
+        annealing.initial_temperature = annealing.final_temperature = 100
+        accepted = sum(annealing._is_accepted(worse_cost, cost) for _ in range(1000))
+        self.assertAlmostEqual(368, accepted, delta=50)  # e^-1
+
+    def test_set_duties(self):
+        annealing = SimulatedAnnealing(self.doctors, self.schedule, max_iterations=100, seed=1)
+        annealing.set_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(StopReason.COMPLETED, annealing.stop_reason)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_time_limit_is_shared_with_initial_search(self):
+        annealing = SimulatedAnnealing(self.doctors, self.schedule, time_limit_ms=1, seed=1)
+
+        with patch('algorithm.local_search.time.monotonic', return_value=0), patch.object(Algorithm, 'set_duties'):
+            annealing.set_duties()
+
+        self.assertEqual(0.001, annealing.deadline)
@@ -56,6 +56,18 @@ class SetDutiesFunctionTests(TestCase):
             for name, value in preferences_data.items():
                 self.assertEqual(getattr(preferences, name), value)
 
+    def test_soft_duties_are_kept_as_previous_duties(self):
+        input_data = input_factory(doctors_per_duty=2)
+        doctor_pk = input_data["doctors"][0]["pk"]
+        input_data["duties"][2].update(doctor=doctor_pk, soft=True)
+
+        duty_setter = create_duty_setter(validate_data(input_data))
+
+        day, position = input_data["duties"][2]["day"], input_data["duties"][2]["position"]
+        self.assertIsNone(duty_setter.schedule[day, position].doctor)
+        self.assertEqual(input_data["duties"][2]["pk"], duty_setter.schedule[day, position].pk)
+        self.assertDictEqual({(day, position): duty_setter.get_doctor(doctor_pk)}, duty_setter.previous_duties)
+
 
 class ValidateDutiesCanBeSetFunctionTests(TestCase):
     @patch('algorithm.main.InputSerializer.model_validate', side_effect=ExpectedError)
@@ -67,7 +79,7 @@ class ValidateDutiesCanBeSetFunctionTests(TestCase):
 
     @patch('algorithm.main.DutySetter._assign_requested_duties')
     @patch('algorithm.main.DutySetter._assign_duties')
-    @patch('algorithm.main.DutySetter.get_result', new=Mock(return_value=Result(False, False, [], None)))
+    @patch('algorithm.main.DutySetter.get_result', new=Mock(return_value=Result(False, False, [], None, None)))
     def test_duty_setting_is_not_ran(self, mock_assign_duties, mock_assign_requested_duties):
         input_data = input_factory()
 
@@ -76,7 +88,9 @@ class ValidateDutiesCanBeSetFunctionTests(TestCase):
         mock_assign_requested_duties.assert_not_called()
         mock_assign_duties.assert_not_called()
 
-    @patch('algorithm.main.DutySetter.get_result', new=Mock(return_value=Result(False, False, ['Error #1'], None)))
+    @patch(
+        'algorithm.main.DutySetter.get_result', new=Mock(return_value=Result(False, False, ['Error #1'], None, None))
+    )
     def test_validation_result(self):
         input_data = input_factory()
 
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from algorithm.nogoods import Nogood, NogoodStore
+from algorithm.tests.utils import doctor_factory
+
+
+class NogoodStoreTests(TestCase):
+    def setUp(self):
+        self.doctor_1, self.doctor_2, self.doctor_3 = doctor_factory(3)
+        self.nogood = Nogood(2, frozenset({(1, self.doctor_1), (3, self.doctor_2)}))
+
+    def test_adding_nogoods(self):
+        store = NogoodStore(max_size=10)
+
+        self.assertTrue(store.add(self.nogood))
+        self.assertFalse(store.add(Nogood(2, frozenset({(3, self.doctor_2), (1, self.doctor_1)}))))
+        self.assertTrue(store.add(Nogood(4, frozenset({(3, self.doctor_2)}))))
+        self.assertEqual(2, len(store))
+
+    def test_matching_nogoods(self):
+        store = NogoodStore(max_size=10)
+        store.add(self.nogood)
+
+        store.assign(1, self.doctor_1)
+        store.assign(3, self.doctor_3)
+        self.assertSetEqual(set(), store.get_matched())
+
+        store.unassign(3, self.doctor_3)
+        store.assign(3, self.doctor_2)
+        self.assertSetEqual({self.nogood}, store.get_matched())
+        self.assertTrue(store.is_assigned(3, self.doctor_2))
+
+        store.unassign(1, self.doctor_1)
+        self.assertSetEqual(set(), store.get_matched())
+
+    def test_nogoods_added_with_assignments_holding(self):
+        store = NogoodStore(max_size=10)
+        store.assign(1, self.doctor_1)
+        store.assign(3, self.doctor_2)
+
+        store.add(self.nogood)
+
+        self.assertSetEqual({self.nogood}, store.get_matched())
+
+    def test_matched_with_new_assignments(self):
+        store = NogoodStore(max_size=10)
+        store.add(self.nogood)
+        store.assign(1, self.doctor_1)
+
+        self.assertListEqual([self.nogood], list(store.get_matched_with(3, [self.doctor_3, self.doctor_2])))
+        self.assertListEqual([], list(store.get_matched_with(3, [self.doctor_3])))
+        self.assertListEqual([], list(store.get_matched_with(4, [self.doctor_2])))
+
+        # Assignments on the day of the nogood fill it instead
+        nogood = Nogood(3, frozenset({(1, self.doctor_1), (3, self.doctor_2)}))
+        store.add(nogood)
+        self.assertNotIn(nogood, store.get_matched_with(3, [self.doctor_2]))
+
+    def test_oldest_nogood_is_evicted(self):
+        store = NogoodStore(max_size=2)
+        nogoods = [Nogood(day_number, frozenset({(1, self.doctor_1)})) for day_number in [3, 4, 5]]
+
+        for nogood in nogoods:
+            store.add(nogood)
+        store.assign(1, self.doctor_1)
+
+        self.assertEqual(2, len(store))
+        self.assertSetEqual(set(nogoods[1:]), store.get_matched())
+        self.assertTrue(store.add(nogoods[0]))
@@ -0,0 +1,118 @@
+import multiprocessing
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from algorithm.enums import FrontierPolicy, StopReason
+from algorithm.portfolio import PortfolioSearch, SearchConfig, run_search
+from algorithm.schedule import DutySchedule
+from algorithm.tests.utils import InitDutySetterTestMixin, ScheduleValidator
+from algorithm.workers import SearchOutcome
+
+
+class PortfolioSearchTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 8
+
+    def test_get_configs(self):
+        configs = PortfolioSearch.get_configs(4, seed=1)
+
+        self.assertEqual(4, len(configs))
+        self.assertEqual(4, len({config.seed for config in configs}))
+        self.assertListEqual(
+            [FrontierPolicy.LIFO, FrontierPolicy.DAYS_SET, FrontierPolicy.STRAIN_ESTIMATE, FrontierPolicy.LIFO],
+            [config.frontier_policy for config in configs],
+        )
+        self.assertListEqual(configs, PortfolioSearch.get_configs(4, seed=1))
+
+    def test_run_search(self):
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+
+        outcome = run_search(self.doctors, self.schedule, SearchConfig(seed=1))
+
+        self.assertEqual(31, outcome.days_set)
+        self.assertEqual(61, len(outcome.assignments))
+        self.assertNotIn((10, 1, self.doctor_1.pk), outcome.assignments)
+
+    def test_run_search_is_reproducible(self):
+        other_schedule = DutySchedule(self.year, self.month, self.duty_positions)
+
+        outcome = run_search(self.doctors, self.schedule, SearchConfig(seed=1))
+        other_outcome = run_search(self.doctors, other_schedule, SearchConfig(seed=1))
+
+        self.assertEqual(outcome, other_outcome)
+
+    def test_best_outcome_is_applied(self):
+        outcomes = [
+            SearchOutcome(
+                days_set=1,
+                total_strain=100,
+                assignments=[(1, 1, self.doctor_1.pk)],
+                stop_reason=StopReason.DEADLINE,
+                peak_frontier_size=30,
+                step_budget=500,
+            ),
+            SearchOutcome(
+                days_set=2,
+                total_strain=300,
+                assignments=[(1, 1, self.doctor_2.pk)],
+                stop_reason=StopReason.DEADLINE,
+                peak_frontier_size=50,
+                step_budget=500,
+            ),
+            SearchOutcome(
+                days_set=2,
+                total_strain=200,
+                assignments=[(1, 1, self.doctor_3.pk)],
+                stop_reason=StopReason.COMPLETED,
+                peak_frontier_size=40,
+                step_budget=800,
+            ),
+        ]
+        portfolio = PortfolioSearch(self.doctors, self.schedule, configs=[])
+
+        with patch.object(portfolio, '_run_searches', return_value=outcomes):
+            portfolio.set_duties()
+
+        self.assertEqual(self.doctor_3, self.schedule[1, 1].doctor)
+        self.assertEqual(StopReason.COMPLETED, portfolio.stop_reason)
+        self.assertEqual(50, portfolio.peak_frontier_size)
+        self.assertEqual(800, portfolio.step_budget)
+
+    def test_setting_duties(self):
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+
+        portfolio = PortfolioSearch(self.doctors, self.schedule, configs=PortfolioSearch.get_configs(2), workers=2)
+        portfolio.set_duties()
+
+        self.assertTrue(self.schedule.is_filled)
+        self.assertEqual(StopReason.COMPLETED, portfolio.stop_reason)
+        self.assertEqual(self.doctor_1, self.schedule[10, 1].doctor)
+        ScheduleValidator(self.doctors, self.schedule).assert_no_invalid_duties(check_requested_duties=False)
+
+    def test_run_search_with_deadline(self):
+        outcome = run_search(self.doctors, self.schedule, SearchConfig(seed=1), deadline=time.time())
+
+        # Only the empty node was expanded
+        self.assertEqual(StopReason.DEADLINE, outcome.stop_reason)
+        self.assertEqual(0, outcome.days_set)
+        self.assertListEqual([], outcome.assignments)
+
+    def test_no_schedule_is_applied_when_no_search_returns_by_deadline(self):
+        portfolio = PortfolioSearch(
+            self.doctors, self.schedule, configs=PortfolioSearch.get_configs(2), workers=2, time_limit_ms=1
+        )
+        portfolio.set_duties()
+
+        self.assertEqual(StopReason.DEADLINE, portfolio.stop_reason)
+        self.assertFalse(any(duty.is_set for duty in self.schedule.cells()))
+
+    def test_no_workers_are_left_after_setting_duties(self):
+        portfolio = PortfolioSearch(
+            self.doctors, self.schedule, configs=PortfolioSearch.get_configs(2), workers=2, time_limit_ms=100
+        )
+        portfolio.set_duties()
+
+        self.assertListEqual([], multiprocessing.active_children())
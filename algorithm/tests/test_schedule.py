@@ -114,3 +114,28 @@ class DutyTests(TestCase):
         self.assertEqual(doctor, duty.doctor)
         self.assertEqual(20, duty.strain_points)
         self.assertTrue(duty.set_by_user)
+
+    def test_is_fixed(self):
+        day = Day(1, 1, 2025)
+        duty = Duty(day, 1)
+        doctor = doctor_factory()
+        doctor.init_preferences(
+            year=2025,
+            month=1,
+            exceptions=[],
+            requested_days=[],
+            preferred_weekdays=list(range(7)),
+            preferred_positions=[1],
+            maximum_accepted_duties=10,
+        )
+        self.assertFalse(duty.is_fixed)
+
+        duty.update(doctor)
+        self.assertFalse(duty.is_fixed)
+
+        duty.update(doctor, set_by_user=True)
+        self.assertTrue(duty.is_fixed)
+
+        duty.update(doctor, set_by_user=False)
+        doctor.preferences.requested_days = [1]
+        self.assertTrue(duty.is_fixed)
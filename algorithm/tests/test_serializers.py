@@ -1,5 +1,6 @@
 from unittest import TestCase
 
+from algorithm.enums import Engine, FrontierPolicy
 from algorithm.serializers import InputSerializer
 from algorithm.tests.utils import input_factory
 from algorithm.utils import get_max_number_of_duties_for_month
@@ -53,6 +54,23 @@ class SerializersTests(TestCase):
         with self.assertRaises(ValueError):
             InputSerializer.model_validate(self.data)
 
+    def test_soft_duties_validation(self):
+        del self.data["duties"][1]["soft"]
+        self.assertFalse(InputSerializer.model_validate(self.data).duties[1].soft)
+
+        self.data["duties"][1]["soft"] = True
+
+        with self.assertRaises(ValueError):
+            InputSerializer.model_validate(self.data)
+
+        self.data["duties"][1]["doctor"] = self.data["doctors"][0]["pk"]
+        self.assertTrue(InputSerializer.model_validate(self.data).duties[1].soft)
+
+        self.data["duties"][0]["soft"] = True
+
+        with self.assertRaises(ValueError):
+            InputSerializer.model_validate(self.data)
+
     def test_requested_days_validation(self):
         self.data["doctors"][0]["preferences"]["requested_days"] = [32]
 
@@ -119,3 +137,63 @@ class SerializersTests(TestCase):
 
         with self.assertRaises(ValueError):
             InputSerializer.model_validate(self.data)
+
+    def test_settings_validation(self):
+        self.data["settings"] = {"engine": "beam", "beam_width": 5}
+
+        serializer = InputSerializer.model_validate(self.data)
+        self.assertEqual(Engine.BEAM, serializer.settings.engine)
+        self.assertEqual(5, serializer.settings.beam_width)
+
+        self.data["settings"]["beam_width"] = 0
+
+        with self.assertRaises(ValueError):
+            InputSerializer.model_validate(self.data)
+
+        for setting in [
+            "portfolio_workers",
+            "decomposition_workers",
+            "time_limit_ms",
+            "lns_iterations",
+            "lns_window_days",
+            "annealing_iterations",
+            "annealing_initial_temperature",
+            "polish_iterations",
+            "polish_time_limit_ms",
+            "frontier_max_size",
+        ]:
+            self.data["settings"] = {setting: 0}
+
+            with self.assertRaises(ValueError):
+                InputSerializer.model_validate(self.data)
+
+        self.data["settings"] = {"engine": "unknown"}
+
+        with self.assertRaises(ValueError):
+            InputSerializer.model_validate(self.data)
+
+        self.data["settings"] = {"frontier_eviction_policy": "unknown"}
+
+        with self.assertRaises(ValueError):
+            InputSerializer.model_validate(self.data)
+
+        self.data["settings"] = {"frontier_policy": "strain_estimate"}
+        self.assertEqual(
+            FrontierPolicy.STRAIN_ESTIMATE, InputSerializer.model_validate(self.data).settings.frontier_policy
+        )
+
+        self.data["settings"] = {"frontier_policy": "unknown"}
+
+        with self.assertRaises(ValueError):
+            InputSerializer.model_validate(self.data)
+
+    def test_settings_are_optional(self):
+        del self.data["settings"]
+
+        serializer = InputSerializer.model_validate(self.data)
+
+        self.assertIsNone(serializer.settings.engine)
+        self.assertIsNone(serializer.settings.beam_width)
+        self.assertIsNone(serializer.settings.portfolio_workers)
+        self.assertIsNone(serializer.settings.time_limit_ms)
+        self.assertIsNone(serializer.settings.polish)
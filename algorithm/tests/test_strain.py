@@ -91,6 +91,67 @@ class DutyStrainEvaluatorTests(InitDutySetterTestMixin, TestCase):
 
         self.assertEqual(14, len(mock_strain_modifier.mock_calls))
 
+    def test_get_doctor_strain(self):
+        evaluator = DutyStrainEvaluator(self.year, self.month, self.schedule.positions, self.doctors)
+        for day_number in [3, 5, 12]:
+            self.schedule[day_number, 1].update(self.doctor_1)
+
+        strain = evaluator.get_doctor_strain(self.doctor_1, self.schedule)
+
+        # Each duty is evaluated with all the other duties set
+        expected_strain = 0
+        for day_number in [3, 5, 12]:
+            duty = self.schedule[day_number, 1]
+            duty.update(None)
+            expected_strain += evaluator.get_strains(duty.day, self.schedule, [self.doctor_1])[self.doctor_1]
+            duty.update(self.doctor_1)
+
+        self.assertEqual(expected_strain, strain)
+        self.assertEqual(3, len(list(self.schedule.duties_for_doctor(self.doctor_1))))
+        self.assertEqual(0, evaluator.get_doctor_strain(self.doctor_2, self.schedule))
+
+    def test_get_strain_lower_bounds(self):
+        evaluator = DutyStrainEvaluator(self.year, self.month, self.schedule.positions, self.doctors)
+        sunday = self.schedule[12].day
+        lower_bounds = evaluator.get_strain_lower_bounds(sunday, self.schedule, self.doctors)
+
+        for day_number, doctors in [(10, self.doctors[:3]), (9, self.doctors[3:6]), (14, self.doctors[:3])]:
+            for position, doctor in enumerate(doctors, 1):
+                self.schedule[day_number, position].update(doctor)
+
+        strains = evaluator.get_strains(sunday, self.schedule, self.doctors)
+        for doctor in self.doctors:
+            self.assertLessEqual(lower_bounds[doctor], strains[doctor])
+
+        # Once Friday is filled, doctors on duty on it are known to join it with Sunday
+        lower_bounds = evaluator.get_strain_lower_bounds(sunday, self.schedule, self.doctors)
+        for doctor in self.doctors[:3]:
+            self.assertEqual(strains[doctor], lower_bounds[doctor])
+
+        # New weekends are bounded for all the doctors at once
+        for doctor in self.doctors[3:]:
+            self.assertEqual(strains[doctor] - StrainModifier.NEW_WEEKEND, lower_bounds[doctor])
+
+    def test_get_new_weekends_strain_lower_bound(self):
+        evaluator = DutyStrainEvaluator(self.year, self.month, self.schedule.positions, self.doctors)
+
+        # 9 free positions on each of 4 weekends and 3 on the last Friday need at least 5, 5, 5, 5 and 2 doctors,
+        # 7 doctors can take them on their first, second, third and fourth weekend.
+        self.assertEqual(
+            (7 + 2 * 7 + 3 * 7 + 4 * 1) * StrainModifier.NEW_WEEKEND,
+            evaluator.get_new_weekends_strain_lower_bound(self.schedule, self.doctors),
+        )
+
+        for row in self.schedule:
+            for position, duty in enumerate(row, 1):
+                duty.update(self.doctors[(row.day.number * len(row) + position) % len(self.doctors)])
+
+        for duty in self.schedule[12]:
+            duty.update(None)
+
+        # Doctors on duty on Friday or Saturday can take Sunday too
+        self.assertEqual(0, evaluator.get_new_weekends_strain_lower_bound(self.schedule, self.doctors))
+
 
 class ModifierTestMixin(PreferencesKwargsTestMixin):
     year = 2025
@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from algorithm.availability import DoctorAvailabilityTracker
+from algorithm.symmetry import get_equivalence_classes, get_ranks, is_canonical
+from algorithm.tests.utils import InitDutySetterTestMixin
+
+
+class SymmetryTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 6
+
+    def setUp(self):
+        super().setUp()
+
+        self.doctor_1.preferences.exceptions = [3, 4]
+        self.doctor_2.preferences.exceptions = [4, 3]
+        self.doctor_3.last_month_duties = [30]
+        self.doctor_4.preferences.maximum_accepted_duties = 2
+
+    def test_get_equivalence_classes(self):
+        self.assertListEqual(
+            [[self.doctor_1, self.doctor_2], [self.doctor_5, self.doctor_6]], get_equivalence_classes(self.doctors)
+        )
+
+    def test_get_ranks(self):
+        equivalence_classes = get_equivalence_classes(self.doctors)
+        self.schedule[10, 1].update(self.doctor_5)
+
+        ranks = get_ranks(equivalence_classes, DoctorAvailabilityTracker(self.doctors, self.schedule))
+
+        # Doctor 6 is the only one of their class without duties, so there's nobody to swap them with
+        self.assertDictEqual({self.doctor_1: (0, 0), self.doctor_2: (0, 1)}, ranks)
+
+    def test_is_canonical(self):
+        ranks = {self.doctor_1: (0, 0), self.doctor_2: (0, 1), self.doctor_5: (1, 0), self.doctor_6: (1, 1)}
+
+        self.assertTrue(is_canonical([self.doctor_1, self.doctor_3, self.doctor_2], ranks))
+        self.assertTrue(is_canonical([self.doctor_5, self.doctor_1], ranks))
+        self.assertTrue(is_canonical([self.doctor_3, self.doctor_4], ranks))
+        self.assertFalse(is_canonical([self.doctor_2, self.doctor_1], ranks))
+        self.assertFalse(is_canonical([self.doctor_1, self.doctor_6], ranks))
@@ -0,0 +1,65 @@
+import random
+from unittest import TestCase
+
+from algorithm.schedule import DutySchedule
+from algorithm.tests.utils import doctor_factory
+from algorithm.transposition import TranspositionTable, ZobristHasher
+
+
+class ZobristHasherTests(TestCase):
+    def setUp(self):
+        self.doctors = doctor_factory(4)
+        self.schedule = DutySchedule(2025, 1, 2)
+        self.hasher = ZobristHasher(self.doctors, self.schedule, random.Random(1))
+
+    def test_key_does_not_depend_on_order(self):
+        doctor_1, doctor_2, doctor_3, doctor_4 = self.doctors
+
+        day_1_key = self.hasher.get_key(1, [doctor_1, doctor_2])
+        day_3_key = self.hasher.get_key(3, [doctor_3, doctor_4])
+
+        self.assertEqual(day_1_key ^ day_3_key, day_3_key ^ day_1_key)
+        self.assertEqual(0, day_1_key ^ day_3_key ^ day_1_key ^ day_3_key)
+
+    def test_key_depends_on_day_position_and_doctor(self):
+        doctor_1, doctor_2, doctor_3, _ = self.doctors
+
+        keys = {
+            self.hasher.get_key(1, [doctor_1, doctor_2]),
+            self.hasher.get_key(1, [doctor_2, doctor_1]),
+            self.hasher.get_key(2, [doctor_1, doctor_2]),
+            self.hasher.get_key(1, [doctor_1, doctor_3]),
+        }
+
+        self.assertEqual(4, len(keys))
+
+    def test_keys_are_reproducible(self):
+        other_hasher = ZobristHasher(self.doctors, self.schedule, random.Random(1))
+
+        self.assertEqual(self.hasher.get_key(5, self.doctors[:2]), other_hasher.get_key(5, self.doctors[:2]))
+
+
+class TranspositionTableTests(TestCase):
+    def test_lower_strain_is_kept(self):
+        table = TranspositionTable(max_size=10)
+
+        self.assertTrue(table.add(1, 200))
+        self.assertFalse(table.add(1, 200))
+        self.assertFalse(table.add(1, 300))
+        self.assertTrue(table.add(1, 100))
+        self.assertFalse(table.add(1, 150))
+        self.assertEqual(1, len(table))
+
+    def test_least_recently_used_key_is_evicted(self):
+        table = TranspositionTable(max_size=2)
+
+        table.add(1, 100)
+        table.add(2, 100)
+        table.add(1, 200)  # Key 1 is used again
+        table.add(3, 100)
+
+        self.assertEqual(2, len(table))
+        self.assertIn(1, table)
+        self.assertNotIn(2, table)
+        self.assertIn(3, table)
+        self.assertTrue(table.add(2, 500))
@@ -1,9 +1,16 @@
+import random
 from unittest import TestCase
 
 from algorithm.duty_setter import DutySetter
 from algorithm.enums import Weekday
 from algorithm.tests.utils import doctor_factory
-from algorithm.utils import DoctorAvailabilityHelper, get_max_number_of_duties_for_month
+from algorithm.utils import (
+    DoctorAvailabilityHelper,
+    get_matching,
+    get_max_number_of_duties_for_month,
+    ordered_unique_combinations,
+    unique_product,
+)
 
 
 class UtilsTests(TestCase):
@@ -19,6 +26,65 @@ class UtilsTests(TestCase):
             result = get_max_number_of_duties_for_month(year, month)
             self.assertEqual(result, expected_number)
 
+    def test_ordered_unique_combinations(self):
+        iterables = [['c', 'a', 'b'], ['b', 'a'], ['d', 'a', 'c']]
+        keys = {'a': 1, 'b': 0, 'c': 3, 'd': 5}
+
+        result = list(ordered_unique_combinations(*iterables, key=keys.get))
+
+        # One tuple of the product for each set of elements
+        self.assertCountEqual({frozenset(elements) for elements in unique_product(*iterables)}, map(frozenset, result))
+        for elements in result:
+            self.assertTrue(all(element in iterable for element, iterable in zip(elements, iterables)))
+
+        sums = [sum(keys[element] for element in elements) for elements in result]
+        self.assertListEqual(sorted(sums), sums)
+        self.assertSetEqual({'a', 'b', 'c'}, set(result[0]))
+
+    def test_ordered_unique_combinations_prunes_invalid_sets(self):
+        iterables = [['a', 'b', 'c', 'd'], ['a', 'b', 'c', 'd']]
+        keys = {'a': 0, 'b': 1, 'c': 2, 'd': 3}
+        checked = []
+
+        def is_valid(elements):
+            checked.append(elements)
+            return elements[0] != 'b'
+
+        result = list(ordered_unique_combinations(*iterables, key=keys.get, is_valid=is_valid))
+
+        self.assertListEqual([{'a', 'b'}, {'a', 'c'}, {'a', 'd'}, {'c', 'd'}], list(map(set, result)))
+        self.assertNotIn(('b', 'c'), checked)
+
+    def test_ordered_unique_combinations_matches_elements(self):
+        # 'a' can only be taken from the last iterable, 'b' has to move to make room for it
+        iterables = [['b', 'c'], ['b'], ['b', 'a']]
+
+        result = list(ordered_unique_combinations(*iterables, key=lambda element: 1))
+
+        self.assertListEqual([('c', 'b', 'a')], result)
+
+    def test_ordered_unique_combinations_with_empty_iterable(self):
+        self.assertListEqual([], list(ordered_unique_combinations(['a'], [], key=lambda element: 1)))
+        self.assertListEqual([], list(ordered_unique_combinations(['a'], ['a'], key=lambda element: 1)))
+
+    def test_ordered_unique_combinations_random_ties(self):
+        iterables = [['a', 'b', 'c', 'd'], ['a', 'b', 'c', 'd']]
+        results = {
+            tuple(ordered_unique_combinations(*iterables, key=lambda element: 1, random=random.Random(seed)))
+            for seed in range(5)
+        }
+
+        self.assertGreater(len(results), 1)
+        self.assertEqual(1, len({frozenset(map(frozenset, result)) for result in results}))
+
+    def test_get_matching(self):
+        iterables = [['a', 'b'], ['a'], ['c']]
+
+        self.assertDictEqual({0: 'b', 1: 'a', 2: 'c'}, get_matching(['a', 'b', 'c'], iterables))
+        self.assertDictEqual({0: 'b'}, get_matching(['b'], iterables))
+        self.assertIsNone(get_matching(['a', 'b', 'd'], iterables))
+        self.assertIsNone(get_matching(['b', 'c', 'd'], iterables[:2]))
+
 
 class DoctorAvailabilityHelperTests(TestCase):
     def setUp(self):
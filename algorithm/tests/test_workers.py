@@ -0,0 +1,94 @@
+import multiprocessing
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from algorithm.duty_setter import Algorithm
+from algorithm.enums import StopReason
+from algorithm.tests.utils import InitDutySetterTestMixin
+from algorithm.workers import SearchOutcome, WorkerPool, run_algorithm
+
+
+class SearchOutcomeTests(InitDutySetterTestMixin, TestCase):
+    year = 2025
+    month = 1
+    duty_positions = 2
+    doctors_count = 8
+
+    def test_run_algorithm(self):
+        self.schedule[10, 1].update(self.doctor_1, set_by_user=True)
+
+        outcome = run_algorithm(Algorithm, None, self.doctors, self.schedule, seed=1)
+
+        self.assertEqual(StopReason.COMPLETED, outcome.stop_reason)
+        self.assertEqual(31, outcome.days_set)
+        self.assertEqual(61, len(outcome.assignments))
+        self.assertNotIn((10, 1, self.doctor_1.pk), outcome.assignments)
+        self.assertGreater(outcome.step_budget, 0)
+
+    def test_run_algorithm_with_deadline(self):
+        outcome = run_algorithm(Algorithm, time.time(), self.doctors, self.schedule, seed=1)
+
+        # Only the empty node was expanded
+        self.assertEqual(StopReason.DEADLINE, outcome.stop_reason)
+        self.assertEqual(0, outcome.days_set)
+        self.assertEqual(0, outcome.total_strain)
+        self.assertListEqual([], outcome.assignments)
+
+    def test_apply(self):
+        outcome = SearchOutcome(
+            days_set=1,
+            total_strain=100,
+            assignments=[(1, 1, self.doctor_1.pk), (1, 2, self.doctor_2.pk)],
+            stop_reason=StopReason.DEADLINE,
+            peak_frontier_size=1,
+            step_budget=0,
+        )
+
+        outcome.apply(self.doctors, self.schedule)
+
+        self.assertEqual(self.doctor_1, self.schedule[1, 1].doctor)
+        self.assertEqual(self.doctor_2, self.schedule[1, 2].doctor)
+        self.assertEqual(2, sum(1 for duty in self.schedule.cells() if duty.is_set))
+
+
+class WorkerPoolTests(TestCase):
+    def test_searches_deadline(self):
+        pool = WorkerPool(workers=2, time_limit_ms=2000)
+        self.assertEqual(99.8, pool._get_searches_deadline(100))
+
+        pool.time_limit_ms = 60_000
+        self.assertEqual(99, pool._get_searches_deadline(100))
+
+    def test_all_searches_are_waited_for_without_time_limit(self):
+        pool = WorkerPool(workers=2)
+
+        self.assertListEqual([(0, None), (100, None)], pool.run(run_late_search, [(0,), (100,)]))
+
+    @patch.object(WorkerPool, 'deadline_margin_share', 0.5)
+    def test_searches_returning_by_deadline_are_kept(self):
+        pool = WorkerPool(workers=4, time_limit_ms=1000)
+
+        outcomes = pool.run(run_late_search, [(0,), (100,), (200,), (2000,)])
+
+        # The last search overran the deadline of the pool
+        self.assertListEqual([0, 100, 200], [delay_ms for delay_ms, _ in outcomes])
+
+    @patch.object(WorkerPool, 'deadline_margin_share', 0.5)
+    def test_workers_are_terminated_when_searches_overrun_deadline(self):
+        pool = WorkerPool(workers=2, time_limit_ms=200)
+
+        outcomes = pool.run(run_late_search, [(0,), (10_000,)])
+
+        self.assertEqual(1, len(outcomes))
+        self.assertListEqual([], multiprocessing.active_children())
+
+
+def run_late_search(delay_ms, deadline=None):
+    # Returns the given number of milliseconds after the deadline of the searches, if there is one
+    if deadline is not None:
+        time.sleep(max(0.0, deadline - time.time()))
+
+    time.sleep(delay_ms / 1000)
+
+    return delay_ms, deadline
@@ -22,6 +22,7 @@ def input_factory(
     doctors_per_duty: int = 1,
     doctors_count: int = 10,
     duties_count: int = 0,
+    settings: dict | None = None,
 ):
     positions = range(1, doctors_per_duty + 1)
     accepted_duties = get_max_number_of_duties_for_month(year, month)
@@ -59,6 +60,7 @@ def input_factory(
                     "position": position,
                     "strain_points": day.strain_points,
                     "set_by_user": False,
+                    "soft": False,
                 }
             )
             duty_pk += 1
@@ -74,6 +76,25 @@ def input_factory(
         "doctors_per_duty": doctors_per_duty,
         "doctors": doctors,
         "duties": duties,
+        "settings": {
+            "engine": None,
+            "beam_width": None,
+            "portfolio_workers": None,
+            "decomposition_workers": None,
+            "time_limit_ms": None,
+            "lns_iterations": None,
+            "lns_window_days": None,
+            "annealing_iterations": None,
+            "annealing_initial_temperature": None,
+            "annealing_final_temperature": None,
+            "polish": None,
+            "polish_iterations": None,
+            "polish_time_limit_ms": None,
+            "frontier_max_size": None,
+            "frontier_eviction_policy": None,
+            "frontier_policy": None,
+            **(settings or {}),
+        },
     }
 
 
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from random import Random
+
+    from algorithm.doctor import Doctor
+    from algorithm.schedule import DutySchedule
+
+
+class ZobristHasher:
+    # Each doctor on each duty gets a random bit string. A partial schedule is hashed by XOR-ing bit strings
+    # of its duties, so the hash doesn't depend on the order in which the duties were set.
+
+    bits = 64
+
+    def __init__(self, doctors: list[Doctor], schedule: DutySchedule, random: Random) -> None:
+        self._keys = {
+            (day_number, position, doctor): random.getrandbits(self.bits)
+            for day_number in range(1, len(schedule) + 1)
+            for position in range(1, schedule.positions + 1)
+            for doctor in doctors
+        }
+
+    def get_key(self, day_number: int, doctors: Iterable[Doctor]) -> int:
+        key = 0
+        for position, doctor in enumerate(doctors, start=1):
+            key ^= self._keys[day_number, position, doctor]
+
+        return key
+
+
+class TranspositionTable:
+    # Keeps the lowest total strain of recently seen partial schedules, evicting the least recently used ones.
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._strains: OrderedDict[int, int] = OrderedDict()
+
+    def add(self, key: int, total_strain: int) -> bool:
+        # Returns False if the same partial schedule was already reached with no higher strain.
+        known_strain = self._strains.get(key)
+        if known_strain is not None:
+            self._strains.move_to_end(key)
+
+            if known_strain <= total_strain:
+                return False
+
+        self._strains[key] = total_strain
+
+        if len(self._strains) > self.max_size:
+            self._strains.popitem(last=False)
+
+        return True
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._strains
+
+    def __len__(self) -> int:
+        return len(self._strains)
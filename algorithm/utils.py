@@ -5,13 +5,18 @@ from collections import defaultdict
 from contextlib import suppress
 from datetime import date
 from functools import reduce
-from itertools import product
-from typing import TYPE_CHECKING, Any, Iterator, Sequence
+from heapq import heappop, heappush
+from itertools import accumulate, count, product
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Sequence, TypeVar
 
 if TYPE_CHECKING:
+    from random import Random
+
     from algorithm.doctor import Doctor
     from algorithm.schedule import DoctorAvailabilitySchedule, DutySchedule
 
+T = TypeVar('T')
+
 
 def get_week_number_in_month(date: date) -> int:
     week_of_year_number = date.isocalendar()[1]
@@ -46,6 +51,116 @@ def unique_product(*iterables: Sequence) -> Iterator[tuple]:
     return (elem for elem in product(*iterables) if len(elem) == len(set(elem)))
 
 
+def ordered_unique_combinations(
+    *iterables: Sequence[T],
+    key: Callable[[T], int],
+    is_valid: Callable[[tuple[T, ...]], bool] = lambda elements: True,
+    random: Random | None = None,
+) -> Iterator[tuple[T, ...]]:
+    # Yields one of the tuples of unique_product for each set of elements among them, in ascending order of summed
+    # keys, so permutations of the same elements are skipped. Which iterable each element is taken from is found
+    # by bipartite matching. Sets are built one element at a time, in ascending order of keys, and partial sets
+    # which can't be matched or are not valid are never extended, so is_valid must not accept a set if it rejected
+    # any set it was built from. Sets with equal keys come in the order of iterables, or in random order if random
+    # is given.
+    if not all(iterables):
+        return
+
+    elements = sorted(dict.fromkeys(element for iterable in iterables for element in iterable), key=key)
+    if len(elements) < len(iterables):
+        return
+
+    indices_per_element = get_indices_per_element(iterables)
+    keys = [key(element) for element in elements]
+
+    # Sums of keys of consecutive elements, the lowest for any number of elements following a given one.
+    keys_sums = [0, *accumulate(keys)]
+
+    tiebreakers = count() if random is None else iter(random.random, None)
+    queue = [(keys_sums[len(iterables)], next(tiebreakers), 0, 0, (), {})]
+
+    while queue:
+        _, _, keys_sum, next_element_index, chosen_elements, matching = heappop(queue)
+
+        if len(chosen_elements) == len(iterables):
+            yield tuple(matching[index] for index in range(len(iterables)))
+            continue
+
+        missing_count = len(iterables) - len(chosen_elements) - 1
+        for element_index in range(next_element_index, len(elements) - missing_count):
+            element = elements[element_index]
+
+            extended_matching = dict(matching)
+            if not augment_matching(extended_matching, element, indices_per_element):
+                continue
+
+            extended_elements = chosen_elements + (element,)
+            if not is_valid(extended_elements):
+                continue
+
+            extended_keys_sum = keys_sum + keys[element_index]
+            lower_bound = (
+                extended_keys_sum + keys_sums[element_index + 1 + missing_count] - keys_sums[element_index + 1]
+            )
+            heappush(
+                queue,
+                (
+                    lower_bound,
+                    next(tiebreakers),
+                    extended_keys_sum,
+                    element_index + 1,
+                    extended_elements,
+                    extended_matching,
+                ),
+            )
+
+
+def get_matching(elements: Sequence[T], iterables: Sequence[Sequence[T]]) -> dict[int, T] | None:
+    # Indices of iterables each taking a different one of the elements, if all elements can be taken.
+    indices_per_element = get_indices_per_element(iterables)
+
+    matching = {}
+    for element in elements:
+        if not augment_matching(matching, element, indices_per_element):
+            return None
+
+    return matching
+
+
+def get_indices_per_element(iterables: Sequence[Sequence[T]]) -> defaultdict[T, list[int]]:
+    indices_per_element = defaultdict(list)
+    for index, iterable in enumerate(iterables):
+        for element in iterable:
+            indices_per_element[element].append(index)
+
+    return indices_per_element
+
+
+def augment_matching(matching: dict[int, T], element: T, indices_per_element: dict[T, list[int]]) -> bool:
+    # Adds the element to the matching along an augmenting path: it takes a free index, or one the element of which
+    # can move to another index. The matching is left unchanged if there's no such path.
+    for index in indices_per_element.get(element, ()):
+        if index not in matching:
+            matching[index] = element
+            return True
+
+    visited_indices = set()
+
+    def augment(element: T) -> bool:
+        for index in indices_per_element.get(element, ()):
+            if index in visited_indices:
+                continue
+
+            visited_indices.add(index)
+            if index not in matching or augment(matching[index]):
+                matching[index] = element
+                return True
+
+        return False
+
+    return augment(element)
+
+
 def get_holidays() -> dict[int, dict[int, list[int]]]:
     """
     The return value is a dictionary of yearly holidays in Poland.
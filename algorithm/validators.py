@@ -6,6 +6,7 @@ from functools import cached_property
 from itertools import combinations
 from typing import TYPE_CHECKING
 
+from algorithm.availability import DoctorAvailabilityTracker
 from algorithm.exceptions import CantSetDutiesError
 from algorithm.translation import _
 from algorithm.utils import DoctorAvailabilityHelper, comma_join, is_superset_included
@@ -260,17 +261,21 @@ class BidailyDoctorAvailabilityValidator(BaseDoctorAvailabilityValidator):
         self.position_combinations = self._get_position_combinations()
 
     def perform_validation(self) -> None:
-        for day_number in range(1, self.availability_schedule.days):
+        for day_number in range(1, len(self.schedule)):
             self._validate_day(day_number)
 
+    def _get_availability_schedule(self) -> DoctorAvailabilityTracker:
+        return DoctorAvailabilityTracker(self.doctors, self.schedule)
+
     def _validate_day(self, day_number: int) -> None:
         errors: dict[tuple, str] = {}
 
         for positions_combination in self.position_combinations:
-            available_doctors = self._get_available_doctors(day_number, positions_combination)
-            missing_doctors = len(positions_combination) * 2 - len(available_doctors)
+            available_mask = self._get_available_mask(day_number, positions_combination)
+            missing_doctors = len(positions_combination) * 2 - available_mask.bit_count()
 
             if missing_doctors > 0 and not is_superset_included(set(positions_combination), errors.keys()):
+                available_doctors = self.availability_schedule.get_doctors(available_mask)
                 errors[positions_combination] = self._get_error_str(
                     day_number, positions_combination, missing_doctors, available_doctors
                 )
@@ -278,17 +283,17 @@ class BidailyDoctorAvailabilityValidator(BaseDoctorAvailabilityValidator):
         if errors:
             self.errors.extend(errors.values())
 
-    def _get_available_doctors(self, day_number: int, positions: tuple[int]) -> set[Doctor]:
+    def _get_available_mask(self, day_number: int, positions: tuple[int]) -> int:
         today = self.availability_schedule[day_number]
         tommorrow = self.availability_schedule[day_number + 1]
-        return today.doctors_for_positions(*positions) | tommorrow.doctors_for_positions(*positions)
+        return today.mask_for_positions(*positions) | tommorrow.mask_for_positions(*positions)
 
     def _get_error_str(
         self,
         day_number: int,
         positions_combination: tuple[int, ...],
         missing_count: int,
-        available_doctors: set[Doctor],
+        available_doctors: list[Doctor],
     ) -> str:
         missing_doctors_pluralized = (
             _('are {missing_count} doctors', missing_count=missing_count)
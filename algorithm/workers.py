@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from algorithm.enums import StopReason
+
+if TYPE_CHECKING:
+    from algorithm.doctor import Doctor
+    from algorithm.duty_setter import Algorithm
+    from algorithm.schedule import DutySchedule
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class SearchOutcome:
+    days_set: int
+    total_strain: int
+    assignments: list[tuple[int, int, int]]  # Day number, position and doctor pk of each duty set by the search
+    stop_reason: StopReason
+    peak_frontier_size: int
+    step_budget: int
+
+    @classmethod
+    def from_algorithm(cls, algorithm: Algorithm) -> SearchOutcome:
+        best_node = algorithm.best_node
+
+        return cls(
+            days_set=best_node.days_set if best_node is not None else 0,
+            total_strain=best_node.total_strain if best_node is not None else 0,
+            assignments=[
+                (duty.day.number, duty.position, duty.doctor.pk)
+                for _, filled_duties in algorithm.trail
+                for duty in filled_duties
+            ],
+            stop_reason=algorithm.stop_reason,
+            peak_frontier_size=algorithm.peak_frontier_size,
+            step_budget=algorithm.step_budget,
+        )
+
+    @property
+    def rank(self) -> tuple[int, int]:
+        return -self.days_set, self.total_strain
+
+    def apply(self, doctors: list[Doctor], schedule: DutySchedule) -> None:
+        doctors_by_pk = {doctor.pk: doctor for doctor in doctors}
+
+        for day_number, position, doctor_pk in self.assignments:
+            schedule[day_number, position].update(doctors_by_pk[doctor_pk])
+
+
+def run_algorithm(algorithm_class: type[Algorithm], deadline: float | None, *args: Any, **kwargs: Any) -> SearchOutcome:
+    # Runs in a worker process, so the schedule is a copy and only the outcome is sent back.
+    # The deadline is a wall-clock timestamp, as it is shared between processes.
+    time_limit_ms = None if deadline is None else max(0, int((deadline - time.time()) * 1000))
+
+    algorithm = algorithm_class(*args, time_limit_ms=time_limit_ms, **kwargs)
+    algorithm.set_duties()
+
+    return SearchOutcome.from_algorithm(algorithm)
+
+
+class WorkerPool:
+    # Runs searches in separate processes, passing each of them the deadline as the last argument. Searches stop
+    # a share of the time limit before the deadline, up to a fixed margin, so that they send back their outcomes
+    # by then. Outcomes of searches which didn't finish by the deadline are left out.
+
+    deadline_margin_share = 0.1
+    max_deadline_margin_ms = 1000
+
+    def __init__(self, workers: int, time_limit_ms: int | None = None) -> None:
+        self.workers = workers
+        self.time_limit_ms = time_limit_ms
+
+    def run(self, function: Callable[..., T], args_list: list[tuple[Any, ...]]) -> list[T]:
+        deadline = None if self.time_limit_ms is None else time.time() + self.time_limit_ms / 1000
+        searches_deadline = None if deadline is None else self._get_searches_deadline(deadline)
+
+        pool = multiprocessing.Pool(self.workers)
+        try:
+            results = [pool.apply_async(function, (*args, searches_deadline)) for args in args_list]
+
+            for result in results:
+                timeout = None if deadline is None else max(0.0, deadline - time.time())
+                result.wait(timeout)
+
+            return [result.get() for result in results if result.ready()]
+        finally:
+            # Workers are terminated, so that searches which didn't finish don't take CPU after the result is returned.
+            pool.terminate()
+            pool.join()
+
+    def _get_searches_deadline(self, deadline: float) -> float:
+        margin_ms = min(self.time_limit_ms * self.deadline_margin_share, self.max_deadline_margin_ms)
+        return deadline - margin_ms / 1000